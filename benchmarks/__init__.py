@@ -0,0 +1,4 @@
+"""
+Benchmarks for the L* learner. Run a benchmark as a module, e.g.
+python -m benchmarks.bench_parallel
+"""
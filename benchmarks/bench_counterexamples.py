@@ -0,0 +1,48 @@
+import time
+
+from lstar import CounterexampleStrategy, LStarLearner
+from benchmarks.random_dfa import DFAOracle, random_dfa
+
+
+ALPHABET = ['a', 'b', 'c']
+SIZES = (10, 25, 50)
+SEEDS = range(3)
+
+
+def run(strategy, n_states, seed):
+    target = random_dfa(n_states, ALPHABET, seed=seed)
+    oracle = DFAOracle(target, seed=seed)
+    learner = LStarLearner(strategy=strategy, max_iterations=10_000)
+    learner.initialize(set(ALPHABET), empty_word_example(target), oracle)
+    start = time.perf_counter()
+    dfa = learner.learn()
+    elapsed = time.perf_counter() - start
+    return {
+        'time': elapsed,
+        'queries': oracle.membership_calls,
+        'rows': len(learner._rows),
+        'cols': len(learner._cols),
+        'states': dfa['states'],
+    }
+
+
+def empty_word_example(target):
+    """The learner needs one example; classify the empty word."""
+    examples = {'positive': set(), 'negative': set()}
+    examples['positive' if target['initial'] in target['accepting'] else 'negative'].add('')
+    return examples
+
+
+def main():
+    print(f"|Σ| = {len(ALPHABET)}, averaged over {len(SEEDS)} random targets per size")
+    print(f"{'states':>6} {'strategy':>14} {'queries':>9} {'rows':>7} {'cols':>5} {'time':>8}")
+    for n_states in SIZES:
+        for strategy in CounterexampleStrategy:
+            runs = [run(strategy, n_states, seed) for seed in SEEDS]
+            mean = {k: sum(r[k] for r in runs) / len(runs) for k in runs[0]}
+            print(f"{n_states:>6} {strategy.name:>14} {mean['queries']:>9.0f} {mean['rows']:>7.0f} "
+                  f"{mean['cols']:>5.0f} {mean['time']:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
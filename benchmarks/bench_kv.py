@@ -0,0 +1,41 @@
+import time
+
+from lstar import CounterexampleStrategy, KVLearner, LStarLearner
+from benchmarks.bench_counterexamples import empty_word_example
+from benchmarks.random_dfa import DFAOracle, random_dfa
+
+
+ALPHABET = ['a', 'b', 'c', 'd']
+SIZES = (25, 100, 250)
+
+LEARNERS = {
+    'L* all-prefixes': lambda: LStarLearner(max_iterations=100_000),
+    'L* rivest-schapire': lambda: LStarLearner(strategy=CounterexampleStrategy.BINARY_SEARCH,
+                                               max_iterations=100_000),
+    'KV discrimination tree': lambda: KVLearner(max_iterations=100_000),
+}
+
+
+def run(make_learner, n_states, seed=0):
+    target = random_dfa(n_states, ALPHABET, seed=seed)
+    oracle = DFAOracle(target, seed=seed)
+    learner = make_learner()
+    learner.initialize(set(ALPHABET), empty_word_example(target), oracle)
+    start = time.perf_counter()
+    dfa = learner.learn()
+    return time.perf_counter() - start, oracle.membership_calls, dfa['states']
+
+
+def main():
+    print(f"|Σ| = {len(ALPHABET)}, identical random targets and equivalence oracles")
+    print(f"{'target':>6} {'learner':>24} {'states':>7} {'queries':>9} {'time':>8}")
+    for n_states in SIZES:
+        for name, make_learner in LEARNERS.items():
+            if name == 'L* all-prefixes' and n_states > 100:
+                continue        # too slow to be worth waiting for
+            elapsed, queries, states = run(make_learner, n_states)
+            print(f"{n_states:>6} {name:>24} {states:>7} {queries:>9} {elapsed:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
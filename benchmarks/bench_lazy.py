@@ -0,0 +1,102 @@
+"""
+Lazy vs eager observation table: membership queries saved per alphabet size.
+
+Learns random minimal targets with lazy=False and lazy=True and reports
+membership and equivalence queries of both, the saving in membership
+queries and the fraction of table cells the lazy learner left unresolved.
+
+Lazy mode pays for its saving in equivalence queries. With an exact
+DFATeacher ('exact') those are free; a real system answers them by testing,
+so the benchmark can also run with a Wp-method ('wp', k = 1) or random-walk
+('random', 2000 tests per query) equivalence oracle. For those it also
+reports the test words run for the equivalence queries, the saving in
+total queries (table plus tests), and how many eager/lazy runs stopped on
+a hypothesis that is not the target.
+
+    python -m benchmarks.bench_lazy
+    python -m benchmarks.bench_lazy --alphabet-sizes 2 16 --states 200
+    python -m benchmarks.bench_lazy --teachers exact wp random --states 50
+"""
+import argparse
+import time
+
+from lstar import (CounterexampleStrategy, DFATeacher, LearnerStats, LStarLearner,
+                   RandomWalkOracle, WpMethodOracle)
+from lstar.minimize import equivalent
+from benchmarks.bench_counterexamples import empty_word_example
+from benchmarks.random_dfa import random_minimal_dfa
+
+ALPHABET_SIZES = (2, 4, 8, 16)
+SEEDS = range(3)
+TEACHERS = {
+    'exact': DFATeacher,
+    'wp': lambda target: WpMethodOracle(DFATeacher(target), extra_states=1),
+    'random': lambda target: RandomWalkOracle(DFATeacher(target), max_tests=2000, seed=0),
+}
+
+
+def learn(target, alphabet, strategy, lazy, teacher='exact'):
+    stats = LearnerStats()
+    oracle = TEACHERS[teacher](target)
+    learner = LStarLearner(strategy=strategy, max_iterations=1_000_000, stats=stats, lazy=lazy)
+    learner.initialize(set(alphabet), empty_word_example(target), oracle)
+    start = time.perf_counter()
+    dfa = learner.learn()
+    elapsed = time.perf_counter() - start
+    if teacher == 'exact':
+        assert dfa['states'] == target.n_states
+    n_rows, n_cols = learner._table.shape
+    resolved = learner._known.unpack().sum() if lazy else n_rows * n_cols
+    tests = getattr(oracle, 'tests_run', 0)
+    return {
+        'time': elapsed,
+        'mq': stats.membership_queries,
+        'eq': stats.equivalence_queries,
+        'tests': tests,
+        'total': stats.membership_queries + tests,
+        'wrong': 0 if equivalent(dfa, target) else 1,
+        'unresolved': 1 - resolved / (n_rows * n_cols),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--alphabet-sizes', type=int, nargs='+', default=ALPHABET_SIZES)
+    parser.add_argument('--states', type=int, default=100)
+    parser.add_argument('--strategy', default='BINARY_SEARCH',
+                        choices=[s.name for s in CounterexampleStrategy])
+    parser.add_argument('--teachers', nargs='+', default=['exact'], choices=sorted(TEACHERS))
+    args = parser.parse_args(argv)
+    strategy = CounterexampleStrategy[args.strategy]
+
+    for teacher in args.teachers:
+        print(f"{args.states} states, strategy {args.strategy}, {teacher} equivalence queries, "
+              f"averaged over {len(SEEDS)} random targets per alphabet size")
+        print(f"{'|Σ|':>4} {'eager MQs':>10} {'lazy MQs':>10} {'saved':>6} "
+              f"{'eager EQs':>10} {'lazy EQs':>9} {'unresolved':>11} {'eager s':>8} {'lazy s':>7}"
+              + ('' if teacher == 'exact' else
+                 f" {'eager tests':>12} {'lazy tests':>11} {'total saved':>12} {'wrong':>6}"))
+        for n_symbols in args.alphabet_sizes:
+            alphabet = [f"s{i}" for i in range(n_symbols)]
+            totals = {lazy: dict.fromkeys(('time', 'mq', 'eq', 'tests', 'total', 'wrong', 'unresolved'), 0)
+                      for lazy in (False, True)}
+            for seed in SEEDS:
+                target = random_minimal_dfa(args.states, alphabet, seed=seed)
+                for lazy in (False, True):
+                    for key, value in learn(target, alphabet, strategy, lazy, teacher).items():
+                        totals[lazy][key] += value if key == 'wrong' else value / len(SEEDS)
+            eager, lazy = totals[False], totals[True]
+            saved = 1 - lazy['mq'] / eager['mq']
+            line = (f"{n_symbols:>4} {eager['mq']:>10.0f} {lazy['mq']:>10.0f} {saved:>6.0%} "
+                    f"{eager['eq']:>10.1f} {lazy['eq']:>9.1f} {lazy['unresolved']:>11.0%} "
+                    f"{eager['time']:>8.2f} {lazy['time']:>7.2f}")
+            if teacher != 'exact':
+                total_saved = 1 - lazy['total'] / eager['total']
+                line += (f" {eager['tests']:>12.0f} {lazy['tests']:>11.0f} {total_saved:>12.0%} "
+                         f"{eager['wrong']:>4}/{lazy['wrong']}")
+            print(line, flush=True)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import functools
+import time
+
+from examples.black_box_sim import ProtocolOracle
+from lstar import LStarLearner, ParallelExecutor, SerialExecutor
+from benchmarks.oracles import LatencyOracle
+
+
+ALPHABET = {'HELLO', 'AUTH', 'DATA', 'CLOSE'}
+EXAMPLES = {'positive': {'HELLO AUTH'}, 'negative': {'AUTH'}}
+LATENCY = 0.002
+
+
+def make_oracle():
+    return LatencyOracle(ProtocolOracle(test_mode=True), latency=LATENCY)
+
+
+def run(executor):
+    learner = LStarLearner(executor=executor)
+    learner.initialize(ALPHABET, EXAMPLES, make_oracle())
+    start = time.perf_counter()
+    dfa = learner.learn()
+    elapsed = time.perf_counter() - start
+    executor.close()
+    return elapsed, dfa
+
+
+def main():
+    print(f"Protocol oracle with {LATENCY * 1000:.1f} ms simulated latency per query")
+    baseline, expected = run(SerialExecutor())
+    print(f"  serial:     {baseline:.3f}s")
+    for workers in (2, 4, 8, 16):
+        elapsed, dfa = run(ParallelExecutor(max_workers=workers, oracle_factory=make_oracle))
+        assert dfa == expected, "parallel learning must give the same DFA"
+        print(f"  {workers:2d} threads: {elapsed:.3f}s  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
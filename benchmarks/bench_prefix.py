@@ -0,0 +1,71 @@
+"""
+Prefix queries and sessions on deep protocols: resets and steps.
+
+Learns random prefix-closed protocol DFAs (see protocol_dfa) through a
+simulated system where every query is one session (reset plus replay).
+With prefix_query the learner fills every cell whose word is a prefix of
+an asked word from that one session; with the reset()/step() session API
+the scheduler runs each batch in DFS order along the query prefix tree.
+Resets, steps and times are given as plain / prefix / session.
+--prefix-closed runs all three with the learner's prefix-closed mode, which
+answers everything below a rejected word without a session.
+
+    python -m benchmarks.bench_prefix
+    python -m benchmarks.bench_prefix --depths 50 200 --alphabet-size 6
+    python -m benchmarks.bench_prefix --prefix-closed
+"""
+import argparse
+import time
+
+from lstar import CounterexampleStrategy, LStarLearner
+from benchmarks.oracles import PrefixSessionOracle, SessionOracle, StepSessionOracle
+from benchmarks.random_dfa import protocol_dfa
+
+DEPTHS = (10, 25, 50, 100)
+
+
+def learn(target, alphabet, oracle_class, strategy, prefix_closed=False):
+    oracle = oracle_class(target)
+    learner = LStarLearner(strategy=strategy, max_iterations=1_000_000,
+                           prefix_closed=prefix_closed)
+    learner.initialize(set(alphabet), {'positive': {''}, 'negative': set()}, oracle)
+    start = time.perf_counter()
+    dfa = learner.learn()
+    elapsed = time.perf_counter() - start
+    assert dfa['states'] == target.n_states
+    return oracle, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--depths', type=int, nargs='+', default=DEPTHS)
+    parser.add_argument('--alphabet-size', type=int, default=4)
+    parser.add_argument('--stay-ratio', type=float, default=0.3,
+                        help="chance that an unexpected symbol falls back instead of erroring")
+    parser.add_argument('--strategy', default='BINARY_SEARCH',
+                        choices=[s.name for s in CounterexampleStrategy])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--prefix-closed', action='store_true',
+                        help="declare the targets prefix-closed to the learner")
+    args = parser.parse_args(argv)
+    alphabet = [f"s{i}" for i in range(args.alphabet_size)]
+    strategy = CounterexampleStrategy[args.strategy]
+
+    print(f"|Σ| = {args.alphabet_size}, stay ratio {args.stay_ratio}, "
+          f"strategy {args.strategy}, seed {args.seed}"
+          f"{', prefix-closed' if args.prefix_closed else ''}")
+    print(f"{'depth':>6} {'states':>6} {'resets':>26} {'factor':>7} {'steps':>32} {'time':>20}")
+    for depth in args.depths:
+        target = protocol_dfa(depth, alphabet, args.stay_ratio, seed=args.seed)
+        runs = [learn(target, alphabet, oracle_class, strategy, args.prefix_closed)
+                for oracle_class in (SessionOracle, PrefixSessionOracle, StepSessionOracle)]
+        resets = ' / '.join(f"{oracle.resets}" for oracle, _ in runs)
+        steps = ' / '.join(f"{oracle.steps}" for oracle, _ in runs)
+        times = ' / '.join(f"{elapsed:.2f}" for _, elapsed in runs)
+        factor = runs[0][0].resets / runs[2][0].resets
+        print(f"{depth:>6} {target.n_states:>6} {resets:>26} {factor:>6.1f}x {steps:>32} {times:>20}",
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
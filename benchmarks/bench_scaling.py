@@ -0,0 +1,177 @@
+"""
+Scaling benchmark: learn random minimal targets from 10 to thousands of states.
+
+Every run learns a random minimal DFA (see random_minimal_dfa) from an
+exact DFATeacher, optionally slowed down by a simulated per-query latency,
+and reports wall time, membership and equivalence queries, peak traced
+memory and the final table dimensions.
+
+Results are appended as JSON lines to benchmarks/results/scaling.jsonl
+together with the package version and git commit (marked -dirty when run
+from uncommitted changes), and each run is compared with the latest
+stored run of the same configuration from another commit, so
+regressions show up as a percentage change.
+
+    python -m benchmarks.bench_scaling
+    python -m benchmarks.bench_scaling --sizes 10 100 1000 --latency 0.0001
+"""
+import argparse
+import json
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import lstar
+from lstar import CounterexampleStrategy, DFATeacher, LearnerStats, LStarLearner
+from benchmarks.bench_counterexamples import empty_word_example
+from benchmarks.oracles import LatencyOracle
+from benchmarks.random_dfa import random_minimal_dfa
+
+SIZES = (10, 50, 100, 500, 1000, 2000, 5000)
+RESULTS = Path(__file__).parent / 'results' / 'scaling.jsonl'
+COMPARED = ('time', 'membership_queries', 'peak_memory')
+
+
+def git_commit():
+    """Short commit of the checkout, with a -dirty suffix when tracked files have uncommitted changes."""
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty', '--abbrev=7'],
+                              capture_output=True, text=True, check=True,
+                              cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def learn(target, alphabet, strategy, latency, stats=None):
+    teacher = DFATeacher(target)
+    if latency:
+        teacher = LatencyOracle(teacher, latency)
+    learner = LStarLearner(strategy=strategy, max_iterations=1_000_000, stats=stats)
+    learner.initialize(set(alphabet), empty_word_example(target), teacher)
+    dfa = learner.learn()
+    assert dfa['states'] == target.n_states
+    return learner
+
+
+def run(n_states, n_symbols, accepting_ratio, strategy, latency, seed, memory=True):
+    """One benchmark run; peak memory comes from a second, traced run."""
+    alphabet = [f"s{i}" for i in range(n_symbols)]
+    target = random_minimal_dfa(n_states, alphabet, accepting_ratio, seed=seed)
+
+    stats = LearnerStats()
+    start = time.perf_counter()
+    learner = learn(target, alphabet, strategy, latency, stats)
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        learn(target, alphabet, strategy, 0)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        'time': elapsed,
+        'membership_queries': stats.membership_queries,
+        'equivalence_queries': stats.equivalence_queries,
+        'peak_memory': peak,
+        'rows': len(learner._rows),
+        'cols': len(learner._cols),
+        's_size': len(learner.S),
+        'store_words': len(learner.store),
+        'phase_times': stats.phase_times,
+    }
+
+
+def config_key(record):
+    return tuple(record['config'][k] for k in sorted(record['config']))
+
+
+def load_results(path):
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_run(history, record):
+    """Latest stored run with the same configuration from a different commit."""
+    key = config_key(record)
+    for old in reversed(history):
+        if config_key(old) == key and old.get('commit') != record['commit']:
+            return old
+    return None
+
+
+def change(new, old):
+    if new is None or not old:
+        return ''
+    return f"{(new - old) / old * 100:+.0f}%"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--alphabet-size', type=int, default=4)
+    parser.add_argument('--accepting-ratio', type=float, default=0.5)
+    parser.add_argument('--strategy', default='BINARY_SEARCH',
+                        choices=[s.name for s in CounterexampleStrategy])
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="simulated seconds per membership query")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced memory run")
+    parser.add_argument('--results', type=Path, default=RESULTS)
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    history = load_results(args.results)
+    commit = git_commit()
+    print(f"lstar {lstar.__version__} ({commit}), |Σ| = {args.alphabet_size}, "
+          f"strategy {args.strategy}, latency {args.latency * 1000:g} ms/query")
+    print(f"{'states':>6} {'time':>9} {'Δ':>5} {'MQs':>9} {'Δ':>5} {'EQs':>5} "
+          f"{'peak MiB':>9} {'Δ':>5} {'rows':>7} {'cols':>5} {'words':>8}")
+
+    records = []
+    for n_states in args.sizes:
+        config = {
+            'n_states': n_states,
+            'alphabet_size': args.alphabet_size,
+            'accepting_ratio': args.accepting_ratio,
+            'strategy': args.strategy,
+            'latency': args.latency,
+            'seed': args.seed,
+        }
+        result = run(n_states, args.alphabet_size, args.accepting_ratio,
+                     CounterexampleStrategy[args.strategy], args.latency, args.seed,
+                     memory=not args.no_memory)
+        record = {
+            'benchmark': 'scaling',
+            'version': lstar.__version__,
+            'commit': commit,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'config': config,
+            'result': result,
+        }
+        records.append(record)
+
+        old = previous_run(history, record)
+        old_result = old['result'] if old else {}
+        deltas = {k: change(result[k], old_result.get(k)) for k in COMPARED}
+        peak = '' if result['peak_memory'] is None else f"{result['peak_memory'] / 2 ** 20:.1f}"
+        print(f"{n_states:>6} {result['time']:>8.3f}s {deltas['time']:>5} "
+              f"{result['membership_queries']:>9} {deltas['membership_queries']:>5} "
+              f"{result['equivalence_queries']:>5} {peak:>9} {deltas['peak_memory']:>5} "
+              f"{result['rows']:>7} {result['cols']:>5} {result['store_words']:>8}", flush=True)
+
+    if not args.no_save:
+        args.results.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.results, 'a') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+        print(f"Results appended to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import random
+import time
+
+from lstar import LStarLearner
+from benchmarks.random_dfa import DFAOracle, access_words, random_dfa
+
+
+ALPHABET = ['a', 'b', 'c', 'd']
+N_SUFFIXES = 16
+
+
+def build_table(n_states, seed=0):
+    """Learner whose S holds the access words of a random DFA and E random suffixes."""
+    rng = random.Random(seed)
+    dfa = random_dfa(n_states, ALPHABET, seed=seed)
+    learner = LStarLearner()
+    learner.initialize(set(ALPHABET), {'positive': set(), 'negative': {'a'}}, DFAOracle(dfa))
+    for word in access_words(dfa, ALPHABET).values():
+        learner.S.add(learner._encode(' '.join(word)))
+    for _ in range(N_SUFFIXES):
+        length = rng.randint(1, 8)
+        learner.E.add(learner._encode(' '.join(rng.choices(ALPHABET, k=length))))
+    learner._update_observation_table()
+    return learner
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"|Σ| = {len(ALPHABET)}, |E| = {N_SUFFIXES + 1}")
+    print(f"{'states':>7} {'rows':>7} {'closed':>10} {'consistent':>11} {'hypothesis':>11}")
+    for n_states in (200, 2000, 10000):
+        learner = build_table(n_states)
+        t_closed, _ = timed(learner._is_closed)
+        t_consistent, _ = timed(learner._is_consistent)
+        t_dfa, _ = timed(learner._construct_dfa)
+        print(f"{n_states:>7} {len(learner._rows):>7} {t_closed * 1000:>8.1f}ms "
+              f"{t_consistent * 1000:>9.1f}ms {t_dfa * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import time
+from lstar.minimize import distinguishing_string
+from lstar.oracle import Oracle
+
+
+class LatencyOracle(Oracle):
+    """Wraps an oracle and sleeps for `latency` seconds on every membership query."""
+    def __init__(self, oracle, latency=0.001):
+        self.oracle = oracle
+        self.latency = latency
+        self.calls = 0
+
+    def membership_query(self, string):
+        self.calls += 1
+        time.sleep(self.latency)
+        return self.oracle.membership_query(string)
+
+    def equivalence_query(self, dfa):
+        return self.oracle.equivalence_query(dfa)
+
+
+class SessionOracle(Oracle):
+    """
+    Simulated system under test around a DFA, counting sessions: every
+    query resets the system and replays the word symbol by symbol.
+    """
+    def __init__(self, dfa):
+        self.dfa = dfa
+        self.resets = 0
+        self.steps = 0
+
+    def _replay(self, string):
+        self.resets += 1
+        state = self.dfa.initial
+        answers = [bool(self.dfa.accepting_mask[state])]
+        for a in self.dfa.encode(string):
+            self.steps += 1
+            state = self.dfa.delta[state, a]
+            answers.append(bool(self.dfa.accepting_mask[state]))
+        return answers
+
+    def membership_query(self, string):
+        return self._replay(string)[-1]
+
+    def equivalence_query(self, dfa):
+        return distinguishing_string(self.dfa, dfa)
+
+
+class PrefixSessionOracle(SessionOracle):
+    """SessionOracle that reports the acceptance of every prefix of a session."""
+    def prefix_query(self, string):
+        return self._replay(string)
+
+
+class StepSessionOracle(SessionOracle):
+    """SessionOracle exposing the reset()/step() session API."""
+    def reset(self):
+        self.resets += 1
+        self._state = self.dfa.initial
+        return bool(self.dfa.accepting_mask[self._state])
+
+    def step(self, symbol):
+        self.steps += 1
+        self._state = self.dfa.delta[self._state, self.dfa.symbol_index[symbol]]
+        return bool(self.dfa.accepting_mask[self._state])
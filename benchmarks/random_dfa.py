@@ -0,0 +1,121 @@
+import random
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from lstar.dfa import CompiledDFA
+from lstar.minimize import minimize
+from lstar.oracle import Oracle
+from lstar.utils import run_dfa
+
+
+def random_dfa(n_states: int, alphabet: Sequence[str], accepting_ratio: float = 0.5,
+               seed: Optional[int] = None) -> dict:
+    """
+    Random complete DFA in the learner's dict format with every state reachable.
+
+    A random spanning tree from the initial state guarantees reachability;
+    the remaining transitions are drawn uniformly.
+    """
+    rng = random.Random(seed)
+    alphabet = sorted(alphabet)
+    transitions = {}
+    free = [(0, a) for a in alphabet]
+    for state in range(1, n_states):
+        edge = free.pop(rng.randrange(len(free)))
+        transitions[edge] = state
+        free.extend((state, a) for a in alphabet)
+    for edge in free:
+        transitions[edge] = rng.randrange(n_states)
+
+    accepting = {q for q in range(n_states) if rng.random() < accepting_ratio}
+    return {'states': n_states, 'initial': 0, 'accepting': accepting, 'transitions': transitions}
+
+
+def random_minimal_dfa(n_states: int, alphabet: Sequence[str], accepting_ratio: float = 0.5,
+                       seed: Optional[int] = None, max_tries: int = 100) -> CompiledDFA:
+    """
+    Random minimal DFA with exactly n_states states, canonically numbered.
+
+    Draws random_dfa() targets until one is already minimal; for random
+    transitions that is almost always the first or second draw unless the
+    accepting ratio is extreme.
+    """
+    rng = random.Random(seed)
+    for _ in range(max_tries):
+        dfa = minimize(random_dfa(n_states, alphabet, accepting_ratio, seed=rng.getrandbits(32)))
+        if dfa.n_states == n_states:
+            return dfa
+    raise ValueError(f"No minimal {n_states}-state DFA found in {max_tries} tries "
+                     f"with accepting ratio {accepting_ratio}")
+
+
+def protocol_dfa(depth: int, alphabet: Sequence[str], stay_ratio: float = 0.3,
+                 seed: Optional[int] = None) -> CompiledDFA:
+    """
+    Random prefix-closed "protocol" DFA with a happy path of depth states.
+
+    State i has one expected symbol that moves on to i + 1 (the last one
+    returns to the start); any other symbol falls back to a random state
+    at or before i with probability stay_ratio and otherwise errors into a
+    rejecting sink. Every state but the sink accepts, so a word is accepted
+    exactly when every prefix is, as with a system that aborts on error.
+    """
+    rng = random.Random(seed)
+    alphabet = sorted(alphabet)
+    sink = depth
+    transitions = {(sink, a): sink for a in alphabet}
+    for state in range(depth):
+        expected = rng.choice(alphabet)
+        for a in alphabet:
+            if a == expected:
+                transitions[(state, a)] = (state + 1) % depth
+            elif rng.random() < stay_ratio:
+                transitions[(state, a)] = rng.randrange(state + 1)
+            else:
+                transitions[(state, a)] = sink
+    dfa = {'states': depth + 1, 'initial': 0, 'accepting': set(range(depth)),
+           'transitions': transitions}
+    return minimize(dfa)
+
+
+def access_words(dfa: dict, alphabet: Sequence[str]) -> Dict[int, List[str]]:
+    """Shortest access word (as a token list) of every reachable state, by BFS."""
+    access = {dfa['initial']: []}
+    queue = deque([dfa['initial']])
+    while queue:
+        state = queue.popleft()
+        for a in sorted(alphabet):
+            target = dfa['transitions'][(state, a)]
+            if target not in access:
+                access[target] = access[state] + [a]
+                queue.append(target)
+    return access
+
+
+class DFAOracle(Oracle):
+    """
+    Oracle for a known DFA.
+
+    Equivalence is approximated black-box style: up to `n_tests` random words
+    of length up to `max_length` are compared, so counterexamples are long
+    and random, as they would be against a real system.
+    """
+    def __init__(self, dfa, n_tests=2000, max_length=None, seed=0):
+        self.dfa = dfa
+        self.alphabet = sorted({a for _, a in dfa['transitions']})
+        self.n_tests = n_tests
+        self.max_length = max_length or 2 * dfa['states']
+        self.rng = random.Random(seed)
+        self.membership_calls = 0
+
+    def membership_query(self, string):
+        self.membership_calls += 1
+        return run_dfa(self.dfa, string)
+
+    def equivalence_query(self, dfa):
+        for _ in range(self.n_tests):
+            length = self.rng.randint(0, self.max_length)
+            word = ' '.join(self.rng.choices(self.alphabet, k=length))
+            if run_dfa(dfa, word) != run_dfa(self.dfa, word):
+                return word
+        return None
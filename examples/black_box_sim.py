@@ -1,6 +1,8 @@
-from lstar.oracle import Oracle
+from lstar.oracle import MealyOracle, Oracle
 from lstar.lstar_learner import LStarLearner
-from lstar.utils import run_dfa
+from lstar.mealy_learner import MealyLearner
+from lstar.noisy import NoisyOracle
+from lstar.utils import run_dfa, run_mealy
 import random
 
 class ProtocolOracle(Oracle):
@@ -9,6 +11,7 @@ class ProtocolOracle(Oracle):
         self._retries = 0
         self._authenticated = False
         self._sequence = []
+        self._failed = False
         self._test_mode = test_mode
 
     def membership_query(self, sequence):
@@ -29,6 +32,31 @@ class ProtocolOracle(Oracle):
                 return False
         return True
         
+    def prefix_query(self, sequence):
+        """
+        Acceptance of every prefix of sequence, from one protocol run: a
+        prefix is accepted while every action so far has succeeded.
+        """
+        answers = [self.reset()]
+        for action in sequence.split():
+            answers.append(self.step(action))
+        return answers
+
+    def reset(self):
+        """Start a new session; the empty sequence is accepted unless the system is locked."""
+        self._failed = self._state == 'LOCKED'
+        if not self._failed:
+            self._state = 'INIT'
+            self._authenticated = False
+            self._sequence = []
+        return not self._failed
+
+    def step(self, action):
+        """Run one action of the session; accepted while every action so far succeeded."""
+        if not self._failed and not self._handle_action(action):
+            self._failed = True
+        return not self._failed
+
     def _handle_action(self, action):
         """
         logic:
@@ -122,6 +150,64 @@ class ProtocolOracle(Oracle):
         return {'positive': positive, 'negative': negative}
     
 
+class ProtocolMealyOracle(ProtocolOracle, MealyOracle):
+    """
+    The protocol as an I/O system: every action is answered with 'OK' or
+    'ERROR' and the session carries on after an error, as a real server
+    would, instead of the whole sequence being rejected.
+    """
+
+    def output_query(self, sequence):
+        if self._state != 'LOCKED':
+            self._state = 'INIT'
+            self._authenticated = False
+            self._sequence = []
+        return tuple('OK' if self._handle_action(action) else 'ERROR'
+                     for action in sequence.split())
+
+    def equivalence_query(self, mealy):
+        """Test the learned Mealy machine on the protocol's test sequences."""
+        test_sequences = [
+            'HELLO AUTH DATA CLOSE',
+            'HELLO HELLO AUTH DATA',
+            'AUTH HELLO AUTH CLOSE DATA',
+            'HELLO AUTH CLOSE CLOSE HELLO AUTH DATA',
+            'DATA CLOSE HELLO DATA AUTH DATA',
+        ]
+        for test in test_sequences:
+            if run_mealy(mealy, test) != self.output_query(test):
+                return test
+        return None
+
+
+class FlakyProtocolOracle(ProtocolOracle):
+    """
+    The protocol behind a flaky link: a success is reported as a failure
+    with probability glitch_rate, but a reported success is always real.
+    Sessions glitch too: a glitched reset or step fails the rest of the
+    session, and prefix queries run through them.
+    """
+
+    def __init__(self, glitch_rate=0.2, seed=None):
+        super().__init__(test_mode=True)
+        self.glitch_rate = glitch_rate
+        self._random = random.Random(seed)
+
+    def _glitch(self, accepted):
+        return accepted and self._random.random() >= self.glitch_rate
+
+    def membership_query(self, sequence):
+        return self._glitch(super().membership_query(sequence))
+
+    def reset(self):
+        self._failed = not self._glitch(super().reset())
+        return not self._failed
+
+    def step(self, action):
+        self._failed = not self._glitch(super().step(action))
+        return not self._failed
+
+
 def learn_protocol():
     oracle = ProtocolOracle(test_mode=True)
     learner = LStarLearner()
@@ -133,6 +219,27 @@ def learn_protocol():
     return learner.learn()
 
 
+def learn_protocol_mealy():
+    """Learn the protocol's responses as a Mealy machine."""
+    learner = MealyLearner()
+    learner.initialize({'HELLO', 'AUTH', 'DATA', 'CLOSE'}, None, ProtocolMealyOracle(test_mode=True))
+    return learner.learn()
+
+
+def learn_protocol_noisy(glitch_rate=0.2, seed=None):
+    """
+    Learn the protocol through a flaky link, repeating queries adaptively.
+
+    Glitches only turn successes into failures, so one success settles a
+    word and only failures are asked again.
+    """
+    oracle = NoisyOracle(FlakyProtocolOracle(glitch_rate, seed),
+                         false_accept_rate=0, false_reject_rate=glitch_rate)
+    learner = LStarLearner()
+    learner.initialize({'HELLO', 'AUTH', 'DATA', 'CLOSE'}, {'positive': {''}, 'negative': set()}, oracle)
+    return learner.learn()
+
+
 if __name__ == "__main__":
     ora = ProtocolOracle(test_mode=True)
     print(ora.membership_query("HELLO AUTH"))
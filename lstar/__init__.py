@@ -5,7 +5,28 @@ L* Algorithm Implementation for learning DFAs.
 __version__ = "0.1.0"
 
 from .lstar_learner import LStarLearner
-from .oracle import Oracle
-from .utils import run_dfa
+from .async_learner import AsyncLStarLearner
+from .kv_learner import KVLearner
+from .mealy_learner import MealyLearner
+from .oracle import Oracle, AsyncOracle, MealyOracle
+from .cache import CachedOracle, CacheStats
+from .noisy import NoisyOracle, NoisyStats
+from .executor import SerialExecutor, ParallelExecutor
+from .metrics import LearnerStats, LatencyHistogram
+from .equivalence import ConformanceOracle, WMethodOracle, WpMethodOracle, RandomWalkOracle
+from .teacher import DFATeacher, MealyTeacher
+from .dfa import CompiledDFA
+from .mealy import MealyMachine
+from .regex import compile_regex
+from .minimize import minimize, canonicalize, canonical_key, equivalent, distinguishing_string
+from .counterexample import CounterexampleStrategy
+from .utils import run_dfa, run_mealy
 
-__all__ = ['LStarLearner', 'Oracle', 'run_dfa']
\ No newline at end of file
+__all__ = ['LStarLearner', 'AsyncLStarLearner', 'KVLearner', 'MealyLearner', 'Oracle',
+           'AsyncOracle', 'MealyOracle', 'CachedOracle', 'CacheStats', 'NoisyOracle',
+           'NoisyStats', 'SerialExecutor', 'ParallelExecutor', 'LearnerStats',
+           'LatencyHistogram', 'ConformanceOracle', 'WMethodOracle', 'WpMethodOracle',
+           'RandomWalkOracle', 'DFATeacher', 'MealyTeacher', 'CompiledDFA',
+           'MealyMachine', 'compile_regex', 'minimize', 'canonicalize', 'canonical_key',
+           'equivalent', 'distinguishing_string', 'CounterexampleStrategy', 'run_dfa',
+           'run_mealy']
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from time import perf_counter
+from typing import List, Optional, Sequence
+
+from .counterexample import CounterexampleStrategy, alpha_words, breakpoint_search, maler_pnueli
+from .lstar_learner import LStarLearner
+from .metrics import LearnerStats
+from .utils import Word
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLStarLearner(LStarLearner):
+    """
+    L* learner driven by an AsyncOracle.
+
+    Table updates only record the cells they need; the learning loop then
+    sends all outstanding membership queries concurrently, keeping at most
+    `max_concurrency` of them in flight.
+
+    Only the built-in counterexample strategies are supported; the ones
+    that query the teacher (BINARY_SEARCH, SUFFIX1BY1) have async
+    versions here. The synchronous query paths of LStarLearner raise
+    TypeError instead of handing coroutines to the table.
+    """
+
+    def __init__(self, max_concurrency: int = 64, max_iterations: int = 100,
+                 stats: Optional[LearnerStats] = None,
+                 strategy: CounterexampleStrategy = CounterexampleStrategy.ALL_PREFIXES):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if not isinstance(strategy, CounterexampleStrategy):
+            raise ValueError("AsyncLStarLearner needs a built-in CounterexampleStrategy; "
+                             "a custom strategy cannot await membership queries")
+        super().__init__(strategy=strategy, max_iterations=max_iterations, stats=stats)
+        self.max_concurrency = max_concurrency
+        self._pending: List[tuple] = []
+
+    def initialize(self, alphabet, examples, teacher) -> None:
+        self._pending = []
+        super().initialize(alphabet, examples, teacher)
+
+    def _update_observation_table(self):
+        """Extend the table and queue its unknown cells for the next flush."""
+        self._pending.extend(self._extend_table())
+
+    def _query_nodes(self, nodes: list) -> None:
+        """Synchronous queries would get coroutines back from an AsyncOracle."""
+        raise TypeError("AsyncLStarLearner only queries its AsyncOracle from its async paths")
+
+    async def _membership_async(self, word: Word) -> bool:
+        """Membership of an encoded word, answered from the query store when known."""
+        node = self.store.node(word)
+        if self.store.answer(node) is None:
+            start = perf_counter()
+            accepted = await self.teacher.membership_query(self._decode(word))
+            if self.stats is not None:
+                self.stats.record_membership_batch(1, perf_counter() - start)
+            self.store.set_answer(node, accepted)
+        elif self.stats is not None:
+            self.stats.store_hits += 1
+        return self.store.answer(node)
+
+    async def _find_breakpoint(self, word: Word) -> int:
+        """Async driver of breakpoint_search()."""
+        query = alpha_words(self._hypothesis, self._access_words, word)
+        search = breakpoint_search(len(word))
+        try:
+            i = next(search)
+            while True:
+                i = search.send(await self._membership_async(query(i)))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _suffix1by1(self, word: Word) -> None:
+        """SUFFIX1BY1 with the table flushed before each closedness and consistency check."""
+        for i in reversed(range(len(word))):
+            suffix = word[i:]
+            if suffix in self.E:
+                continue
+            self.E.add(suffix)
+            self._update_observation_table()
+            await self._flush_pending()
+            if not self._is_closed()[0] or self._is_consistent():
+                return
+
+    async def _process_counterexample(self, counterexample: str) -> None:
+        """Add a counterexample with the learner's strategy, awaiting its queries."""
+        if not counterexample:
+            return
+        word = self._encode(counterexample)
+        with self._phase('counterexample'):
+            if self.strategy is CounterexampleStrategy.BINARY_SEARCH:
+                suffix = word[await self._find_breakpoint(word):]
+                if suffix in self.E:
+                    maler_pnueli(self, word)
+                else:
+                    self.E.add(suffix)
+                    self._update_observation_table()
+            elif self.strategy is CounterexampleStrategy.SUFFIX1BY1:
+                await self._suffix1by1(word)
+            else:
+                # The other strategies only add rows and columns
+                self.strategy(self, word)
+
+    async def _membership_queries(self, words: Sequence[str]) -> List[bool]:
+        """Answer words concurrently, at most max_concurrency at a time."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def ask(word):
+            async with semaphore:
+                return await self.teacher.membership_query(word)
+
+        return await asyncio.gather(*(ask(word) for word in words))
+
+    async def _flush_pending(self) -> None:
+        """Query every queued cell and record the answers."""
+        cells, self._pending = self._pending, []
+        if not cells:
+            return
+        with self._phase('table_fill'):
+            nodes, missing = self._plan_cells(cells)
+            if missing:
+                words = [self._decode(w) for w in self.store.words(missing)]
+                start = perf_counter()
+                answers = await self._membership_queries(words)
+                if self.stats is not None:
+                    self.stats.record_membership_batch(len(words), perf_counter() - start)
+                self.store.set_answers(missing, answers)
+            if self.stats is not None:
+                self.stats.store_hits += len(cells) - len(missing)
+            self._record_cells(cells, nodes)
+
+    async def _verify_hypothesis(self, dfa: dict) -> Optional[str]:
+        """Verify DFA hypothesis against examples and teacher."""
+        with self._phase('verification'):
+            example = self._check_examples(dfa)
+            if example is not None:
+                return example
+
+            start = perf_counter()
+            counterexample = await self.teacher.equivalence_query(dfa)
+            if self.stats is not None:
+                self.stats.record_equivalence_query(perf_counter() - start)
+            if counterexample is not None:
+                oracle_result = await self._membership_async(self._encode(counterexample))
+                if oracle_result == dfa.run(counterexample):
+                    raise Exception(f"Invalid counterexample {counterexample}: DFA and oracle agree")
+                self._record_counterexample(counterexample, oracle_result)
+            return counterexample
+
+    async def learn(self):
+        """Main learning loop."""
+        max_iterations = self.max_iterations
+        await self._flush_pending()
+
+        for iteration in range(1, max_iterations + 1):
+            if self.stats is not None:
+                self.stats.start_iteration(iteration)
+            self.debug_step(iteration)
+
+            table_counterexample = self._check_table_properties()
+            await self._flush_pending()
+            if table_counterexample is not None:
+                logger.info(f"Table property violation found: {table_counterexample}")
+                continue
+
+            with self._phase('hypothesis'):
+                dfa = self._construct_dfa()
+            counterexample = await self._verify_hypothesis(dfa)
+            if counterexample is None:
+                logger.info("Learning completed successfully!")
+                self._finish_stats()
+                return dfa
+
+            logger.info(f"Counterexample found: {counterexample}")
+            await self._process_counterexample(counterexample)
+            await self._flush_pending()
+
+        self._finish_stats()
+        raise Exception(f"Learning did not converge after {max_iterations} iterations")
@@ -0,0 +1,338 @@
+from typing import Dict, List, Optional, Set
+import logging
+import warnings
+from dataclasses import asdict
+from time import perf_counter
+
+from .cache import CacheStats
+from .dfa import CompiledDFA
+from .examples import ExampleStore
+from .executor import SerialExecutor
+from .metrics import NO_PHASE, LearnerStats
+from .noisy import NoisyStats
+from .oracle import supports_prefix_queries, supports_sessions
+from .query_store import QueryStore
+from .scheduler import prefix_tree_leaves, run_sessions
+from .utils import SymbolTable, Word
+
+logger = logging.getLogger(__name__)
+
+
+class BaseLearner:
+    """
+    State and query plumbing shared by the learner engines.
+
+    Holds the alphabet's SymbolTable, the teacher, the known examples and
+    past counterexamples (an ExampleStore) and the prefix-tree QueryStore
+    through which every membership query goes, and implements hypothesis
+    verification against examples and teacher.
+
+    With prefix_closed=True the target is declared prefix-closed (a safety
+    language: once a word is rejected so is every extension, as with
+    protocols that fail for good on an illegal step). Answers implied by
+    the query store are then filled in instead of asked, so the rows of
+    the sink state cost no queries.
+
+    Teachers with the reset()/step() session API are driven as sessions
+    in the learner's thread, which bypasses the executor; by default that
+    only happens with a serial executor (see the `sessions` argument).
+    """
+    def __init__(self, executor=None, max_iterations: int = 100,
+                 stats: Optional[LearnerStats] = None, prefix_closed: bool = False,
+                 sessions: Optional[bool] = None):
+        """
+        Args:
+            executor: Runs membership query batches, e.g. a ParallelExecutor.
+                Defaults to a SerialExecutor.
+            max_iterations: Give up after this many learning iterations.
+            stats: Collects query counts, phase timings and latencies when
+                given; instrumentation is skipped when None.
+            prefix_closed: Declare the target prefix-closed and infer
+                answers below rejected and above accepted words. Wrong
+                (and silently so) if the target is not prefix-closed.
+            sessions: Use the teacher's reset()/step() sessions: None (the
+                default) only with a serial executor, True always (a
+                concurrent executor is then bypassed, with a warning),
+                False never.
+        """
+        self.executor = executor if executor is not None else SerialExecutor()
+        self.max_iterations = max_iterations
+        self.stats = stats
+        self.prefix_closed = prefix_closed
+        self.sessions = sessions
+        self._bypass_warned = False
+        self.alphabet: Set[str] = set()
+        self.symbols = SymbolTable(())
+        self.store = QueryStore(0)
+        self.teacher = None
+        self.positive_examples: Set[str] = set()
+        self.negative_examples: Set[str] = set()
+        self.examples = ExampleStore({})
+
+
+    def _encode(self, string: str) -> Word:
+        return self.symbols.encode(string)
+
+
+    def _decode(self, word: Word) -> str:
+        return self.symbols.decode(word)
+
+
+    def _phase(self, name: str):
+        """Context manager timing a learner phase; a shared no-op without stats."""
+        return NO_PHASE if self.stats is None else self.stats.phase(name)
+
+
+    def _finish_stats(self) -> None:
+        """Close the stats of a run, adding the teacher's cache or repeat counters if it has them."""
+        if self.stats is None:
+            return
+        oracle_stats = getattr(self.teacher, 'stats', None)
+        if isinstance(oracle_stats, CacheStats):
+            self.stats.extra['oracle_cache'] = {**asdict(oracle_stats), 'hit_rate': oracle_stats.hit_rate}
+        elif isinstance(oracle_stats, NoisyStats):
+            self.stats.extra['noisy_oracle'] = {**asdict(oracle_stats),
+                                                'queries_per_word': oracle_stats.queries_per_word}
+        self.stats.finish()
+
+
+    def _use_sessions(self) -> bool:
+        """Whether batches go to the teacher as sessions rather than through the executor."""
+        if self.sessions is False or not supports_sessions(self.teacher):
+            return False
+        concurrent = getattr(self.executor, 'concurrent', False)
+        if not concurrent:
+            return True
+        if self.sessions and not self._bypass_warned:
+            self._bypass_warned = True
+            warnings.warn(f"sessions=True runs queries in the learner's thread; "
+                          f"{type(self.executor).__name__} is not used for them", stacklevel=3)
+        return bool(self.sessions)
+
+
+    def _query_nodes(self, nodes: list) -> None:
+        """Answer the words of query store nodes, asking the teacher for them as one batch."""
+        if not nodes:
+            return
+        if self.prefix_closed:
+            self._query_prefix_closed(nodes)
+        else:
+            self._ask_nodes(nodes)
+
+
+    def _ask_nodes(self, nodes: list) -> None:
+        """Ask the teacher for the words of query store nodes, as one batch."""
+        if not nodes:
+            return
+        if self._use_sessions():
+            self._query_session_nodes(nodes)
+            return
+        if supports_prefix_queries(self.teacher):
+            self._query_prefix_nodes(nodes)
+            return
+        words = [self._decode(w) for w in self.store.words(nodes)]
+        if self.stats is None:
+            answers = self.executor.membership_queries(self.teacher, words)
+        else:
+            start = perf_counter()
+            answers = self.executor.membership_queries(self.teacher, words)
+            self.stats.record_membership_batch(len(words), perf_counter() - start)
+        self.store.set_answers(nodes, answers)
+
+
+    def _query_prefix_closed(self, nodes: list) -> None:
+        """
+        Prefix-closed mode: a word with a rejected prefix is rejected without
+        a query, and every prefix of an accepted word is marked accepted.
+
+        With plain membership queries the batch is asked in rounds, a word
+        waiting while one of its prefixes is pending, so nothing below a
+        prefix rejected in an earlier round is asked. Prefix and session
+        oracles answer every prefix of a word with it anyway, so they get a
+        single round of the words not already implied.
+        """
+        store = self.store
+        rounds = not (self._use_sessions() or supports_prefix_queries(self.teacher))
+        inferred = 0
+        pending = list(dict.fromkeys(nodes))
+        while pending:
+            waiting = set(pending)
+            ask, deferred = [], []
+            for node in pending:
+                blocked = False
+                ancestor = store.parent(node)
+                while ancestor >= 0:
+                    if store.answer(ancestor) is False:
+                        store.set_answer(node, False)
+                        inferred += 1
+                        break
+                    blocked = blocked or (rounds and ancestor in waiting)
+                    ancestor = store.parent(ancestor)
+                else:
+                    (deferred if blocked else ask).append(node)
+
+            self._ask_nodes(ask)
+            for node in ask:
+                if store.answer(node):
+                    parent = store.parent(node)
+                    while parent >= 0 and store.answer(parent) is None:
+                        store.set_answer(parent, True)
+                        inferred += 1
+                        parent = store.parent(parent)
+            pending = deferred
+        if self.stats is not None:
+            self.stats.inferred_answers += inferred
+
+
+    def _query_prefix_nodes(self, nodes: list) -> None:
+        """
+        Prefix query mode: only ask for nodes that are not a proper prefix of
+        another node in the batch; the answer for every prefix of an asked
+        word comes back with it and is stored, wanted or not.
+        """
+        store = self.store
+        leaves = prefix_tree_leaves(store, nodes)
+        words = store.words(leaves)
+
+        strings = [self._decode(w) for w in words]
+        if self.stats is None:
+            vectors = self.executor.prefix_queries(self.teacher, strings)
+        else:
+            start = perf_counter()
+            vectors = self.executor.prefix_queries(self.teacher, strings)
+            self.stats.record_membership_batch(len(set(nodes)), perf_counter() - start, len(strings))
+
+        harvested = 0
+        for node, word, answers in zip(leaves, words, vectors):
+            if len(answers) != len(word) + 1:
+                raise ValueError(f"prefix_query({self._decode(word)!r}) returned {len(answers)} "
+                                 f"answers, expected {len(word) + 1}")
+            for accepted in reversed(answers):
+                if store.answer(node) is None:
+                    store.set_answer(node, accepted)
+                    harvested += 1
+                node = store.parent(node)
+        if self.stats is not None:
+            self.stats.prefix_answers += harvested - len(set(nodes))
+
+
+    def _query_session_nodes(self, nodes: list) -> None:
+        """
+        Session mode: run the batch as reset()/step() sessions along the
+        query store's prefix tree, one reset per leaf (see run_sessions).
+        Sessions are stateful, so they run in this thread, not the executor
+        (see _use_sessions).
+        """
+        if self.stats is None:
+            run_sessions(self.teacher, self.store, nodes, self.symbols.symbols)
+        else:
+            start = perf_counter()
+            run = run_sessions(self.teacher, self.store, nodes, self.symbols.symbols)
+            self.stats.record_membership_batch(run.words, perf_counter() - start, run.resets)
+            self.stats.record_sessions(run)
+
+
+    def _memberships(self, words: List[Word]) -> List[bool]:
+        """Membership of encoded words; unknown ones are asked as one batch."""
+        nodes = [self.store.node(word) for word in words]
+        missing = [n for n in dict.fromkeys(nodes) if self.store.answer(n) is None]
+        if self.stats is not None:
+            self.stats.store_hits += len(nodes) - len(missing)
+        self._query_nodes(missing)
+        return [self.store.answer(n) for n in nodes]
+
+
+    def _membership(self, word: Word) -> bool:
+        """Membership of an encoded word, answered from the query store when known."""
+        node = self.store.node(word)
+        if self.store.answer(node) is None:
+            self._query_nodes([node])
+        elif self.stats is not None:
+            self.stats.store_hits += 1
+        return self.store.answer(node)
+
+
+    def _init_examples(self, counterexamples=()) -> None:
+        """Encode the examples (positives first) and any (word, label) counterexamples."""
+        self.examples = ExampleStore(self.symbols.index)
+        self.examples.add_all(sorted(self.positive_examples), True)
+        self.examples.add_all(sorted(self.negative_examples), False)
+        for word, label in counterexamples:
+            self.examples.add(word, label)
+
+
+    def _state_keys(self) -> Optional[List[int]]:
+        """
+        A stable key per state of the last hypothesis, letting the example
+        store reuse verdicts across hypotheses; None re-runs every example.
+        """
+        return None
+
+
+    def _check_examples(self, dfa: CompiledDFA) -> Optional[str]:
+        """Return the first known example or past counterexample the DFA misclassifies, if any."""
+        dfa = CompiledDFA.from_dict(dfa, self.symbols.symbols)
+        return self.examples.check(dfa, self._state_keys())
+
+
+    def _record_counterexample(self, counterexample: str, accepted: bool) -> None:
+        """Keep a counterexample so every later hypothesis is checked against it."""
+        self.examples.add(counterexample, accepted)
+
+
+    def _verify_hypothesis(self, dfa: CompiledDFA) -> Optional[str]:
+        """
+        Verify DFA hypothesis against examples and teacher.
+
+        Stored examples and counterexamples are replayed first, in one
+        batch, so the equivalence query is only made for hypotheses that
+        already agree with all of them.
+        """
+        with self._phase('verification'):
+            # First check examples
+            example = self._check_examples(dfa)
+            if example is not None:
+                return example
+
+            # Then do equivalence query
+            if self.stats is None:
+                counterexample = self.teacher.equivalence_query(dfa)
+            else:
+                start = perf_counter()
+                counterexample = self.teacher.equivalence_query(dfa)
+                self.stats.record_equivalence_query(perf_counter() - start)
+            if counterexample is not None:
+                # Verify counterexample is actually distinguishing
+                oracle_result = self._membership(self._encode(counterexample))
+                dfa_result = dfa.run(counterexample)
+                if oracle_result == dfa_result:
+                    raise Exception(f"Invalid counterexample {counterexample}: DFA and oracle agree "
+                                    f"(wrap a nondeterministic system in a NoisyOracle)")
+                self._record_counterexample(counterexample, oracle_result)
+
+            return counterexample
+
+
+    def initialize(self, alphabet: Set[str], examples: Dict[str, Set[str]], teacher) -> None:
+        """
+        Initialize the learner.
+        
+        Args:
+            alphabet: Set of symbols in the language
+            examples: Dictionary with 'positive' and 'negative' example sets
+            teacher: Oracle that can answer membership queries
+        """
+        if not alphabet:
+            raise ValueError("Alphabet cannot be empty")
+        if not examples['positive'] and not examples['negative']:
+            raise ValueError("Must provide at least one example")
+            
+        self.alphabet = set(alphabet)
+        self.symbols = SymbolTable(self.alphabet)
+        self.teacher = teacher
+        self.positive_examples = set(examples['positive'])
+        self.negative_examples = set(examples['negative'])
+        self._init_examples()
+        self.store = QueryStore(len(self.symbols))
+        if self.stats is not None:
+            self.stats.start()
@@ -0,0 +1,238 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .oracle import Oracle
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a CachedOracle."""
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.lookups:
+            return 0.0
+        return (self.hits + self.disk_hits) / self.lookups
+
+
+class CachedOracle(Oracle):
+    """
+    Membership query cache wrapping any Oracle.
+
+    Answers are kept in an in-memory LRU of at most `maxsize` words
+    (unbounded if None). If `path` is given, every answer is also written
+    to an SQLite database keyed by the token sequence, so a warm cache can
+    be reused by later learning runs against the same system.
+
+    Writes to disk are committed every `commit_every` new answers and on
+    flush()/close(). Equivalence queries are always forwarded to the
+    wrapped oracle.
+
+    Prefix queries and reset()/step() sessions are forwarded when the
+    wrapped oracle has them (see supports_prefix_queries/supports_sessions),
+    and every answer they return is cached. A session is answered from the
+    cache until its first miss; the wrapped oracle is then reset and
+    replayed up to that point, and every later step of the session goes to it.
+
+    The cache may be shared by the threads of a ParallelExecutor: its LRU
+    and database are guarded by a lock, which is not held while the wrapped
+    oracle is asked, so the wrapped oracle must be thread-safe itself (or
+    built per worker with the executor's oracle_factory). Sessions are
+    stateful and belong to a single thread.
+    """
+
+    # Optional query methods are forwarded to self.oracle
+    forwards_optional_queries = True
+
+    def __init__(self, oracle: Oracle, maxsize: Optional[int] = 100_000,
+                 path: Optional[str] = None, commit_every: int = 256):
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("maxsize must be positive or None")
+        self.oracle = oracle
+        self.maxsize = maxsize
+        self.path = path
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, bool]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._session: List[str] = []
+        self._live = False
+        self._db = None
+        if path is not None:
+            # Any thread may use the connection; self._lock serializes it
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS queries (word TEXT PRIMARY KEY, result INTEGER NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _key(string: str) -> str:
+        """Normalize a word to its token sequence."""
+        return ' '.join(string.split())
+
+    def _remember(self, key: str, result: bool) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        if self.maxsize is not None and len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _find(self, key: str) -> Optional[bool]:
+        """Cached answer from memory or disk, without counting a lookup; None if unknown."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if self._db is not None:
+            row = self._db.execute("SELECT result FROM queries WHERE word = ?", (key,)).fetchone()
+            if row is not None:
+                result = bool(row[0])
+                self._remember(key, result)
+                return result
+        return None
+
+    def _lookup(self, key: str) -> Optional[bool]:
+        """Return a cached answer from memory or disk, or None on a miss."""
+        with self._lock:
+            in_memory = key in self._memory
+            result = self._find(key)
+            if result is None:
+                self.stats.misses += 1
+            elif in_memory:
+                self.stats.hits += 1
+            else:
+                self.stats.disk_hits += 1
+            return result
+
+    def _store(self, key: str, result: bool) -> None:
+        with self._lock:
+            self._remember(key, result)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO queries VALUES (?, ?)", (key, int(result)))
+                self._uncommitted += 1
+                if self._uncommitted >= self.commit_every:
+                    self.flush()
+
+    def membership_query(self, string):
+        key = self._key(string)
+        result = self._lookup(key)
+        if result is None:
+            result = bool(self.oracle.membership_query(string))
+            self._store(key, result)
+        return result
+
+    def membership_queries(self, strings):
+        """Answer a batch, forwarding only the distinct misses as one batch."""
+        keys = [self._key(string) for string in strings]
+        answers = {}
+        missing = []
+        for key in keys:
+            if key in answers:
+                continue
+            answers[key] = self._lookup(key)
+            if answers[key] is None:
+                missing.append(key)
+
+        if missing:
+            for key, result in zip(missing, self.oracle.membership_queries(missing)):
+                answers[key] = bool(result)
+                self._store(key, answers[key])
+        return [answers[key] for key in keys]
+
+    def prefix_query(self, string):
+        return self.prefix_queries([string])[0]
+
+    def prefix_queries(self, strings):
+        """
+        Answer a batch of prefix queries, forwarding only the distinct words
+        with an uncached prefix as one batch. A lookup is counted per word.
+        """
+        tokens = {self._key(string): string.split() for string in strings}
+        answers = {}
+        missing = []
+        with self._lock:
+            for key, symbols in tokens.items():
+                vector = [self._find(' '.join(symbols[:i])) for i in range(len(symbols) + 1)]
+                if None in vector:
+                    self.stats.misses += 1
+                    missing.append(key)
+                else:
+                    self.stats.hits += 1
+                    answers[key] = vector
+
+        if missing:
+            for key, vector in zip(missing, self.oracle.prefix_queries(missing)):
+                answers[key] = [bool(accepted) for accepted in vector]
+                symbols = tokens[key]
+                with self._lock:
+                    for i, accepted in enumerate(answers[key]):
+                        self._store(' '.join(symbols[:i]), accepted)
+        return [answers[self._key(string)] for string in strings]
+
+    def reset(self):
+        self._session = []
+        self._live = False
+        return self._session_answer()
+
+    def step(self, symbol):
+        self._session.append(symbol)
+        if self._live:
+            result = bool(self.oracle.step(symbol))
+            self._store(' '.join(self._session), result)
+            return result
+        return self._session_answer()
+
+    def _session_answer(self) -> bool:
+        """Answer the session's word from the cache, or start the wrapped oracle's session on a miss."""
+        key = ' '.join(self._session)
+        result = self._lookup(key)
+        if result is None:
+            self._live = True
+            result = bool(self.oracle.reset())
+            self._store('', result)
+            for i, symbol in enumerate(self._session):
+                result = bool(self.oracle.step(symbol))
+                self._store(' '.join(self._session[:i + 1]), result)
+        return result
+
+    def equivalence_query(self, dfa):
+        return self.oracle.equivalence_query(dfa)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def clear(self) -> None:
+        """Drop the in-memory cache; the on-disk store is left untouched."""
+        with self._lock:
+            self._memory.clear()
+
+    def flush(self) -> None:
+        """Commit pending answers to the on-disk store, if any."""
+        with self._lock:
+            if self._db is not None and self._uncommitted:
+                self._db.commit()
+                self._uncommitted = 0
+
+    def close(self) -> None:
+        """Flush and close the on-disk store, if any."""
+        with self._lock:
+            if self._db is not None:
+                self.flush()
+                self._db.close()
+                self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,135 @@
+"""
+Binary checkpoints of an LStarLearner.
+
+File layout: an 8-byte magic, the offset and length of a JSON header
+(two little-endian uint64), then raw array sections, each aligned to 64
+bytes so load_checkpoint() can memory-map it, then the JSON header,
+which records the alphabet, examples, past counterexamples, settings and
+the offset, dtype and shape of every section.
+
+Words are not stored as strings: every word of the table is a node of the
+QueryStore prefix tree, saved as parent pointer and edge symbol arrays
+next to its answers, and rows and columns are saved as node ids. The
+table is saved as its packed uint64 rows (see PackedTable), followed in
+lazy mode by the mask of resolved cells.
+
+A write is a handful of sequential array dumps of the whole store and
+table (not just what changed since the last checkpoint) to a temporary
+file, so it costs I/O linear in their size. The file is fsynced, renamed
+over the old checkpoint and its directory fsynced, so neither a crash
+nor a power loss mid-write leaves a torn checkpoint behind. By default
+LStarLearner therefore spaces its checkpoints out so they take a small,
+fixed share of the run (see its checkpoint_every argument) rather than
+writing one every iteration.
+
+LStarLearner.resume() copies every section into the learner's own
+lists and tables; nothing stays mapped. Mapping only saves reading for
+tools that inspect a checkpoint without resuming it.
+"""
+import json
+import os
+import struct
+from typing import Dict, Tuple
+
+import numpy as np
+
+MAGIC = b'LSTARCK1'
+FORMAT_VERSION = 2
+_HEADER = struct.Struct('<8sQQ')
+_ALIGN = 64
+
+
+def save_checkpoint(learner, path) -> None:
+    """Write the learner's table and query store to path, atomically."""
+    n_rows, n_cols = len(learner._rows), len(learner._cols)
+    n_examples = len(learner.positive_examples | learner.negative_examples)
+    col_nodes = [learner.store.node(e) for e in learner._cols]
+    parent, symbol, answers = learner.store.to_arrays()
+    index_type = parent.dtype
+    sections = {
+        'parent': parent,
+        'symbol': symbol,
+        'answers': answers,
+        'rows': np.fromiter((learner._row_nodes[row] for row in learner._rows),
+                            dtype=index_type, count=n_rows),
+        'cols': np.array(col_nodes, dtype=index_type),
+        's_rows': np.fromiter(learner._s_rows.values(), dtype=index_type,
+                              count=len(learner._s_rows)),
+        'matrix': learner._table.packed_rows(),
+    }
+    if learner.lazy:
+        sections['known'] = learner._known.packed_rows()
+    strategy = getattr(learner.strategy, 'name', None)
+    header = {
+        'version': FORMAT_VERSION,
+        'symbols': learner.symbols.symbols,
+        'positive': sorted(learner.positive_examples),
+        'negative': sorted(learner.negative_examples),
+        'counterexamples': [[word, learner.examples.label(word)]
+                            for word in learner.examples.strings[n_examples:]],
+        'max_iterations': learner.max_iterations,
+        'strategy': strategy,
+        'lazy': learner.lazy,
+        'prefix_closed': learner.prefix_closed,
+        'shape': [n_rows, n_cols],
+        'sections': {},
+    }
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0))
+        for name, array in sections.items():
+            offset = -f.tell() % _ALIGN
+            f.write(b'\0' * offset)
+            header['sections'][name] = [f.tell(), array.dtype.str, list(array.shape)]
+            f.write(np.ascontiguousarray(array).data)
+        header_offset = f.tell()
+        encoded = json.dumps(header).encode()
+        f.write(encoded)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, header_offset, len(encoded)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def _fsync_directory(directory) -> None:
+    """Make a rename in directory durable; a no-op where directories cannot be opened (Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def load_checkpoint(path, mmap: bool = True) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """
+    Read a checkpoint's header and sections.
+
+    With mmap the sections are read-only memory maps of the file, so
+    nothing is read until it is touched; otherwise they are loaded.
+    """
+    with open(path, 'rb') as f:
+        magic, header_offset, header_length = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an L* checkpoint")
+        f.seek(header_offset)
+        header = json.loads(f.read(header_length))
+    if header['version'] != FORMAT_VERSION:
+        raise ValueError(f"{path} has checkpoint format {header['version']}, "
+                         f"expected {FORMAT_VERSION}")
+
+    sections = {}
+    for name, (offset, dtype, shape) in header['sections'].items():
+        if mmap and np.prod(shape) > 0:
+            sections[name] = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=tuple(shape))
+        else:
+            count = int(np.prod(shape))
+            sections[name] = np.fromfile(path, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return header, sections
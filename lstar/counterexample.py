@@ -0,0 +1,131 @@
+"""
+Counterexample processing strategies.
+
+A strategy takes the learner and an encoded counterexample for the last
+hypothesis and adds prefixes to S and/or suffixes to E so the next
+hypothesis differs. Strategies are picked per learner with
+CounterexampleStrategy, or passed directly as a callable(learner, word).
+"""
+from enum import Enum
+from typing import Callable, List, Optional
+
+from .utils import Word
+
+
+def all_prefixes(learner, word: Word) -> None:
+    """Classic L*: add every prefix of the counterexample to S and every suffix to E."""
+    learner._add_all_prefixes(word)
+    for i in range(len(word)):
+        learner.E.add(word[i:])
+    learner._update_observation_table()
+
+
+def maler_pnueli(learner, word: Word) -> None:
+    """Maler–Pnueli: add every suffix of the counterexample to E, leaving S alone."""
+    for i in range(len(word)):
+        learner.E.add(word[i:])
+    learner._update_observation_table()
+
+
+def suffix1by1(learner, word: Word) -> None:
+    """
+    Add suffixes to E one at a time, shortest first, until the table is no
+    longer closed or consistent, i.e. until the hypothesis would change.
+    """
+    for i in reversed(range(len(word))):
+        suffix = word[i:]
+        if suffix in learner.E:
+            continue
+        learner.E.add(suffix)
+        learner._update_observation_table()
+        if not learner._is_closed()[0] or learner._is_consistent():
+            return
+
+
+def breakpoint_search(length: int):
+    """
+    Binary search for the index where the hypothesis goes wrong on a
+    counterexample u of the given length.
+
+    With u[:i] mapped to the access word of the hypothesis state it reaches,
+    alpha(i) = MQ(access(u[:i]) · u[i:]). alpha(0) is the true answer for the
+    counterexample and alpha(m) the hypothesis' answer, so they differ and
+    some i has alpha(i) != alpha(i + 1). Returns i + 1: u[i + 1:] then
+    separates the states reached by access(u[:i]) · u[i] and
+    access(u[:i + 1]). This costs O(log m) membership queries.
+
+    A generator, so every learner can share it however it answers queries:
+    it yields the indices i it needs alpha(i) for, is sent each answer, and
+    returns the breakpoint (see find_breakpoint).
+    """
+    low, high = 0, length
+    low_value = yield low
+    while high - low > 1:
+        mid = (low + high) // 2
+        if (yield mid) == low_value:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+def alpha_words(hypothesis, access: List[Word], word: Word) -> Callable[[int], Word]:
+    """The word access(u[:i]) · u[i:] whose membership is alpha(i), for each i."""
+    # Hypothesis state after every prefix of the counterexample
+    states = [hypothesis.initial]
+    for a in word:
+        states.append(int(hypothesis.delta[states[-1], a]))
+    return lambda i: access[states[i]] + word[i:]
+
+
+def find_breakpoint(learner, word: Word, alpha: Optional[Callable[[int], bool]] = None) -> int:
+    """
+    Run breakpoint_search() on word. alpha(i) defaults to the learner's
+    membership query of alpha_words() for its hypothesis and access words.
+    """
+    if alpha is None:
+        query = alpha_words(learner._hypothesis, learner._access_words, word)
+
+        def alpha(i):
+            return learner._membership(query(i))
+
+    search = breakpoint_search(len(word))
+    try:
+        i = next(search)
+        while True:
+            i = search.send(alpha(i))
+    except StopIteration as stop:
+        return stop.value
+
+
+def rivest_schapire(learner, word: Word) -> None:
+    """
+    Rivest–Schapire: add the single distinguishing suffix found by
+    find_breakpoint(), at the cost of O(log m) membership queries and one column.
+    """
+    suffix = word[find_breakpoint(learner, word):]
+    if suffix in learner.E:
+        # Only possible if answers changed under us; fall back to all suffixes
+        maler_pnueli(learner, word)
+        return
+    learner.E.add(suffix)
+    learner._update_observation_table()
+
+
+class CounterexampleStrategy(Enum):
+    """Built-in counterexample processing strategies."""
+    ALL_PREFIXES = 'all_prefixes'
+    BINARY_SEARCH = 'rivest_schapire'
+    SUFFIXES = 'maler_pnueli'
+    SUFFIX1BY1 = 'suffix1by1'
+
+    def __call__(self, learner, word: Word) -> None:
+        _STRATEGIES[self](learner, word)
+
+
+_STRATEGIES = {
+    CounterexampleStrategy.ALL_PREFIXES: all_prefixes,
+    CounterexampleStrategy.BINARY_SEARCH: rivest_schapire,
+    CounterexampleStrategy.SUFFIXES: maler_pnueli,
+    CounterexampleStrategy.SUFFIX1BY1: suffix1by1,
+}
@@ -0,0 +1,141 @@
+from collections.abc import Mapping
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class CompiledDFA(Mapping):
+    """
+    DFA with a dense transition table.
+
+    `delta` is a states x symbols int array and `accepting` a boolean array
+    over states. If the DFA has missing transitions an extra rejecting sink
+    state is appended after the real ones, so delta is always complete.
+
+    The object is also a read-only mapping with the learner's classic dict
+    keys ('states', 'initial', 'accepting', 'transitions'), so code written
+    against the dict format keeps working; the dict view is built lazily.
+    """
+
+    _KEYS = ('states', 'initial', 'accepting', 'transitions')
+
+    def __init__(self, symbols: Sequence[str], delta: np.ndarray, accepting: np.ndarray,
+                 initial: int, n_states: Optional[int] = None):
+        self.symbols: List[str] = list(symbols)
+        self.symbol_index = {a: i for i, a in enumerate(self.symbols)}
+        self.delta = np.asarray(delta, dtype=np.int64)
+        self.accepting_mask = np.asarray(accepting, dtype=bool)
+        self.initial = int(initial)
+        self.n_states = len(self.delta) if n_states is None else n_states
+        self._view = None
+        self._table = None
+
+    @classmethod
+    def from_dict(cls, dfa: dict, symbols: Optional[Iterable[str]] = None) -> "CompiledDFA":
+        """Compile a DFA in the dict format; missing transitions go to a rejecting sink."""
+        if isinstance(dfa, CompiledDFA):
+            return dfa
+        if symbols is None:
+            symbols = {a for _, a in dfa['transitions']}
+        symbols = sorted(symbols)
+        index = {a: i for i, a in enumerate(symbols)}
+        n = dfa['states']
+
+        delta = np.full((n + 1, len(symbols)), n, dtype=np.int64)
+        for (q, a), target in dfa['transitions'].items():
+            if a in index:
+                delta[q, index[a]] = target
+        accepting = np.zeros(n + 1, dtype=bool)
+        accepting[list(dfa['accepting'])] = True
+        if (delta[:n] != n).all():
+            delta, accepting = delta[:n], accepting[:n]
+        return cls(symbols, delta, accepting, dfa['initial'], n_states=n)
+
+    # Dict view
+
+    def _dict_view(self) -> dict:
+        if self._view is None:
+            n = self.n_states
+            transitions = {
+                (q, self.symbols[a]): target
+                for q, row in enumerate(self.delta[:n].tolist())
+                for a, target in enumerate(row)
+                if target < n
+            }
+            self._view = {
+                'states': n,
+                'initial': self.initial,
+                'accepting': set(np.flatnonzero(self.accepting_mask[:n]).tolist()),
+                'transitions': transitions,
+            }
+        return self._view
+
+    def to_dict(self) -> dict:
+        return dict(self._dict_view())
+
+    def __getitem__(self, key):
+        return self._dict_view()[key]
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"CompiledDFA(states={self.n_states}, symbols={self.symbols})"
+
+    # Running words
+
+    def encode(self, word) -> List[int]:
+        """Encode a space-separated string or token sequence; unknown symbols become -1."""
+        tokens = word.split() if isinstance(word, str) else word
+        return [self.symbol_index.get(token, -1) for token in tokens]
+
+    def encode_batch(self, words: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+        """Encode words into a -1 padded (words x max length) array plus their lengths."""
+        encoded = [self.encode(word) for word in words]
+        lengths = np.fromiter((len(w) for w in encoded), dtype=np.int64, count=len(encoded))
+        padded = np.full((len(encoded), int(lengths.max(initial=0))), -1, dtype=np.int64)
+        for i, w in enumerate(encoded):
+            padded[i, :len(w)] = w
+        return padded, lengths
+
+    def run_encoded(self, word: Sequence[int]) -> bool:
+        """Run an encoded word; a -1 symbol rejects."""
+        if self._table is None:
+            self._table = self.delta.tolist()
+        state = self.initial
+        table = self._table
+        for a in word:
+            if a < 0:
+                return False
+            state = table[state][a]
+        return bool(self.accepting_mask[state])
+
+    def run(self, word) -> bool:
+        """Run a space-separated string or token sequence."""
+        return self.run_encoded(self.encode(word))
+
+    def run_padded(self, padded: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Run a padded batch of encoded words, stepping all of them in lockstep.
+
+        Returns a boolean array of verdicts. Words containing a -1 symbol
+        are rejected.
+        """
+        states = np.full(len(lengths), self.initial, dtype=np.int64)
+        alive = np.ones(len(lengths), dtype=bool)
+        for t in range(padded.shape[1]):
+            active = np.flatnonzero(lengths > t)
+            symbols = padded[active, t]
+            unknown = symbols < 0
+            alive[active[unknown]] = False
+            states[active] = self.delta[states[active], np.where(unknown, 0, symbols)]
+        return self.accepting_mask[states] & alive
+
+    def run_batch(self, words: Sequence) -> np.ndarray:
+        """Run many strings or token sequences at once; returns a boolean array."""
+        if not len(words):
+            return np.zeros(0, dtype=bool)
+        return self.run_padded(*self.encode_batch(words))
@@ -0,0 +1,285 @@
+"""
+Conformance-testing equivalence oracles.
+
+Each oracle wraps a membership oracle for the system under learning,
+derives a test suite from the hypothesis and asks the system in batches,
+stopping at the first batch that contains a disagreement.
+"""
+import random
+from collections import deque
+from itertools import islice, product
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .dfa import CompiledDFA
+from .oracle import Oracle
+from .utils import Word
+
+
+def _access_words(dfa: CompiledDFA) -> Dict[int, Word]:
+    """Shortest access word of every reachable state, by BFS in symbol order."""
+    access: Dict[int, Word] = {dfa.initial: ()}
+    queue = deque([dfa.initial])
+    while queue:
+        state = queue.popleft()
+        for a, target in enumerate(dfa.delta[state].tolist()):
+            if target not in access:
+                access[target] = access[state] + (a,)
+                queue.append(target)
+    return access
+
+
+def state_cover(dfa: CompiledDFA) -> List[Word]:
+    """Shortest access word of every reachable state, by BFS in symbol order."""
+    access = _access_words(dfa)
+    return [access[q] for q in sorted(access)]
+
+
+def _transition_cover_states(dfa: CompiledDFA) -> List[Tuple[Word, int]]:
+    """transition_cover() with the state each word reaches."""
+    access = _access_words(dfa)
+    cover = [(access[q], q) for q in sorted(access)]
+    delta = dfa.delta.tolist()
+    return cover + [(w + (a,), delta[q][a]) for w, q in cover for a in range(len(dfa.symbols))]
+
+
+def transition_cover(dfa: CompiledDFA) -> List[Word]:
+    """The state cover plus every access word extended by every symbol."""
+    return [w for w, _ in _transition_cover_states(dfa)]
+
+
+def separating_words(dfa: CompiledDFA) -> Dict[Tuple[int, int], Word]:
+    """
+    Shortest word separating each pair of inequivalent states (p < q).
+
+    Backward BFS over the pair graph, starting from the pairs that ε
+    separates. Pairs of equivalent states are absent.
+    """
+    n_states, n_symbols = dfa.delta.shape
+    predecessors = [[[] for _ in range(n_symbols)] for _ in range(n_states)]
+    for q, row in enumerate(dfa.delta.tolist()):
+        for a, target in enumerate(row):
+            predecessors[target][a].append(q)
+
+    accepting = dfa.accepting_mask.tolist()
+    separated: Dict[Tuple[int, int], Word] = {}
+    queue = deque()
+    for p in range(n_states):
+        for q in range(p + 1, n_states):
+            if accepting[p] != accepting[q]:
+                separated[(p, q)] = ()
+                queue.append((p, q))
+
+    while queue:
+        p, q = queue.popleft()
+        word = separated[(p, q)]
+        for a in range(n_symbols):
+            for p2 in predecessors[p][a]:
+                for q2 in predecessors[q][a]:
+                    pair = (p2, q2) if p2 < q2 else (q2, p2)
+                    if p2 != q2 and pair not in separated:
+                        separated[pair] = (a,) + word
+                        queue.append(pair)
+    return separated
+
+
+def characterizing_set(dfa: CompiledDFA) -> List[Word]:
+    """W: a set of suffixes that separates every pair of inequivalent states."""
+    return sorted(set(separating_words(dfa).values()) | {()}, key=lambda w: (len(w), w))
+
+
+def _middles(n_symbols: int, extra_states: int) -> List[Word]:
+    """Σ^{≤k}: every word up to length extra_states, shortest first."""
+    return [w for k in range(extra_states + 1) for w in product(range(n_symbols), repeat=k)]
+
+
+def _middle_targets(dfa: CompiledDFA, middles: List[Word]) -> List[List[int]]:
+    """
+    targets[i][q]: the state middles[i] leads to from q. Middles come
+    shortest first (as from _middles()), so each extends an earlier one by
+    one symbol and costs one step per state.
+    """
+    index = {(): 0}
+    targets = np.empty((len(middles), len(dfa.delta)), dtype=np.int64)
+    targets[0] = np.arange(len(dfa.delta))
+    for i, middle in enumerate(middles[1:], 1):
+        index[middle] = i
+        targets[i] = dfa.delta[targets[index[middle[:-1]]], middle[-1]]
+    return targets.tolist()
+
+
+def _suffix_answers(dfa: CompiledDFA, suffixes) -> Dict[Word, List[bool]]:
+    """answers[suffix][q]: whether the hypothesis accepts suffix from state q."""
+    answers = {}
+    for suffix in suffixes:
+        states = np.arange(len(dfa.delta))
+        for a in suffix:
+            states = dfa.delta[states, a]
+        answers[suffix] = dfa.accepting_mask[states].tolist()
+    return answers
+
+
+class ConformanceOracle(Oracle):
+    """
+    Base for equivalence oracles that test a hypothesis against a system.
+
+    Membership queries are forwarded to the wrapped oracle. An equivalence
+    query runs the words of test_words() through both the hypothesis and
+    the system, `batch_size` at a time, and returns the first word they
+    disagree on. At most `max_tests` words are asked per equivalence query.
+    Repeated test words are skipped unless `deduplicate` is False.
+    """
+
+    deduplicate = True
+
+    def __init__(self, oracle: Oracle, batch_size: int = 64, max_tests: Optional[int] = None):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.oracle = oracle
+        self.batch_size = batch_size
+        self.max_tests = max_tests
+        self.tests_run = 0
+
+    def membership_query(self, string):
+        return self.oracle.membership_query(string)
+
+    def membership_queries(self, strings):
+        return self.oracle.membership_queries(strings)
+
+    def test_words(self, hypothesis: CompiledDFA) -> Iterator[Word]:
+        raise NotImplementedError("ConformanceOracle must implement test_words()")
+
+    def test_cases(self, hypothesis: CompiledDFA) -> Iterator[Tuple[Word, bool]]:
+        """
+        The test words with the hypothesis' answer for each. Runs every word
+        through the hypothesis; subclasses that know the state a word's
+        prefix reaches override it to skip the walk.
+        """
+        for word in self.test_words(hypothesis):
+            yield word, hypothesis.run_encoded(word)
+
+    def _unique_tests(self, hypothesis: CompiledDFA) -> Iterator[Tuple[Word, bool]]:
+        if not self.deduplicate:
+            yield from self.test_cases(hypothesis)
+            return
+        seen = set()
+        for word, predicted in self.test_cases(hypothesis):
+            if word not in seen:
+                seen.add(word)
+                yield word, predicted
+
+    def equivalence_query(self, dfa):
+        hypothesis = CompiledDFA.from_dict(dfa)
+        symbols = hypothesis.symbols
+        tests = islice(self._unique_tests(hypothesis), self.max_tests)
+        while True:
+            batch = list(islice(tests, self.batch_size))
+            if not batch:
+                return None
+            strings = [' '.join(symbols[a] for a in word) for word, _ in batch]
+            self.tests_run += len(batch)
+            expected = self.oracle.membership_queries(strings)
+            for string, want, (_, got) in zip(strings, expected, batch):
+                if bool(want) != got:
+                    return string
+
+
+class WMethodOracle(ConformanceOracle):
+    """
+    W-method: P · Σ^{≤k} · W with P the transition cover, W a characterizing
+    set of the hypothesis and k the number of extra states the system may
+    have beyond the hypothesis. Complete for systems with at most
+    |hypothesis| + k states.
+
+    The hypothesis is never run on a test word: the cover gives the state
+    each prefix reaches, the middles are stepped once per state, and each
+    suffix's answer is tabulated per state.
+    """
+
+    def __init__(self, oracle: Oracle, extra_states: int = 1, batch_size: int = 64,
+                 max_tests: Optional[int] = None):
+        super().__init__(oracle, batch_size, max_tests)
+        self.extra_states = extra_states
+
+    def test_words(self, hypothesis):
+        for word, _ in self.test_cases(hypothesis):
+            yield word
+
+    def test_cases(self, hypothesis):
+        w_set = characterizing_set(hypothesis)
+        answers = [_suffix_answers(hypothesis, w_set)[suffix] for suffix in w_set]
+        middles = _middles(len(hypothesis.symbols), self.extra_states)
+        targets = _middle_targets(hypothesis, middles)
+        cover = _transition_cover_states(hypothesis)
+        for middle, reach in zip(middles, targets):
+            for prefix, state in cover:
+                head, reached = prefix + middle, reach[state]
+                for suffix, accepts in zip(w_set, answers):
+                    yield head + suffix, accepts[reached]
+
+
+class WpMethodOracle(WMethodOracle):
+    """
+    Wp-method: Q · Σ^{≤k} · W for the state cover Q, then
+    (P \\ Q) · Σ^{≤k} · W_q where W_q only separates the reached state q from
+    the others. Same guarantees as the W-method with a smaller suite.
+    """
+
+    def test_cases(self, hypothesis):
+        w_set = characterizing_set(hypothesis)
+        identification = [{()} for _ in range(len(hypothesis.delta))]
+        for (p, q), word in separating_words(hypothesis).items():
+            identification[p].add(word)
+            identification[q].add(word)
+        identification = [sorted(words) for words in identification]
+        answers = _suffix_answers(hypothesis, w_set)
+
+        covered = _transition_cover_states(hypothesis)
+        n_states = len(_access_words(hypothesis))
+        states = covered[:n_states]
+        cover = {word for word, _ in states}
+        transitions = [(w, q) for w, q in covered[n_states:] if w not in cover]
+        middles = _middles(len(hypothesis.symbols), self.extra_states)
+        targets = _middle_targets(hypothesis, middles)
+
+        for middle, reach in zip(middles, targets):
+            for prefix, state in states:
+                head, reached = prefix + middle, reach[state]
+                for suffix in w_set:
+                    yield head + suffix, answers[suffix][reached]
+        for middle, reach in zip(middles, targets):
+            for prefix, state in transitions:
+                head, reached = prefix + middle, reach[state]
+                for suffix in identification[reached]:
+                    yield head + suffix, answers[suffix][reached]
+
+
+class RandomWalkOracle(ConformanceOracle):
+    """
+    Random testing: each word is the access word of a random hypothesis
+    state followed by a random walk that stops with probability
+    `stop_probability` after each step (at most `max_length` steps).
+    `max_tests` is the budget per equivalence query.
+    """
+
+    deduplicate = False
+
+    def __init__(self, oracle: Oracle, max_tests: int = 1000, stop_probability: float = 0.1,
+                 max_length: int = 50, batch_size: int = 64, seed: Optional[int] = None):
+        super().__init__(oracle, batch_size, max_tests)
+        self.stop_probability = stop_probability
+        self.max_length = max_length
+        self.rng = random.Random(seed)
+
+    def test_words(self, hypothesis):
+        states = state_cover(hypothesis)
+        n_symbols = len(hypothesis.symbols)
+        rng = self.rng
+        while True:
+            walk = []
+            while len(walk) < self.max_length:
+                walk.append(rng.randrange(n_symbols))
+                if rng.random() < self.stop_probability:
+                    break
+            yield rng.choice(states) + tuple(walk)
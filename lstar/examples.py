@@ -0,0 +1,148 @@
+"""
+Labelled words replayed against every hypothesis before an equivalence query.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .dfa import CompiledDFA
+
+
+class ExampleStore:
+    """
+    The user's examples and every counterexample seen so far, kept encoded.
+
+    Words live in one -1 padded int array (unknown symbols are -1 and
+    reject) with their labels, so check() runs all of them against a
+    hypothesis in lockstep, one numpy step per symbol position.
+
+    Verdicts are cached between hypotheses. When check() is given a stable
+    key per hypothesis state (the learners pass the query store node of
+    the state's access word), the path of every word is remembered as
+    state keys; a state whose key, acceptance and successor keys are all
+    unchanged behaves the same in the new hypothesis, so only words whose
+    path touches another state, and words added since, are run again.
+    """
+
+    def __init__(self, index: Dict[str, int]):
+        """
+        Args:
+            index: Symbol to symbol index map of the hypotheses' alphabet.
+        """
+        self._index = index
+        self.strings: List[str] = []
+        self._position: Dict[str, int] = {}
+        self._words = np.full((0, 0), -1, dtype=np.int64)
+        self._lengths = np.zeros(0, dtype=np.int64)
+        self._labels = np.zeros(0, dtype=bool)
+        self._verdicts = np.zeros(0, dtype=bool)
+        self._paths = np.full((0, 1), -1, dtype=np.int64)
+        self._fresh = np.zeros(0, dtype=bool)
+        self._states: Optional[tuple] = None
+        self.runs = 0
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __contains__(self, string: str):
+        return string in self._position
+
+    def add(self, string: str, label: bool) -> bool:
+        """Add a labelled word; returns False if it is already stored."""
+        if string in self._position:
+            return False
+        word = [self._index.get(token, -1) for token in string.split()]
+        n = len(self.strings)
+        self._grow(n + 1, len(word))
+        self._words[n, :len(word)] = word
+        self._lengths[n] = len(word)
+        self._labels[n] = label
+        self._fresh[n] = True
+        self._position[string] = n
+        self.strings.append(string)
+        return True
+
+    def add_all(self, strings: Sequence[str], label: bool) -> None:
+        for string in strings:
+            self.add(string, label)
+
+    def label(self, string: str) -> bool:
+        return bool(self._labels[self._position[string]])
+
+    def _grow(self, n_words: int, length: int) -> None:
+        """Make room for n_words words of up to length symbols, doubling capacity."""
+        capacity, width = self._words.shape
+        if n_words <= capacity and length <= width:
+            return
+        capacity = max(n_words, 2 * capacity, 16) if n_words > capacity else capacity
+        width = max(length, 2 * width) if length > width else width
+        words = np.full((capacity, width), -1, dtype=np.int64)
+        words[:len(self._words), :self._words.shape[1]] = self._words
+        paths = np.full((capacity, width + 1), -1, dtype=np.int64)
+        paths[:len(self._paths), :self._paths.shape[1]] = self._paths
+        self._words, self._paths = words, paths
+        for name in ('_lengths', '_labels', '_verdicts', '_fresh'):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def check(self, dfa: CompiledDFA, state_keys: Optional[Sequence[int]] = None) -> Optional[str]:
+        """
+        First stored word (in insertion order) the DFA misclassifies, or None.
+
+        state_keys gives a stable key per DFA state; without them every
+        word is run again.
+        """
+        n = len(self.strings)
+        keys = None if state_keys is None else np.asarray(state_keys, dtype=np.int64)
+        if keys is not None and len(keys) != len(dfa.delta):
+            keys = None
+
+        stale = self._fresh[:n].copy()
+        if keys is None or self._states is None:
+            stale[:] = True
+        else:
+            unchanged = self._unchanged_keys(dfa, keys)
+            paths = self._paths[:n]
+            stale |= ~(np.isin(paths, unchanged) | (paths < 0)).all(axis=1)
+        self._run(dfa, keys, np.flatnonzero(stale))
+        self._fresh[:n] = False
+        self._states = None if keys is None else (
+            keys, keys[dfa.delta], dfa.accepting_mask.copy())
+
+        wrong = np.flatnonzero(self._verdicts[:n] != self._labels[:n])
+        return self.strings[wrong[0]] if len(wrong) else None
+
+    def _unchanged_keys(self, dfa: CompiledDFA, keys: np.ndarray) -> np.ndarray:
+        """Keys of states with the same acceptance and successor keys as last time."""
+        old_keys, old_successors, old_accepting = self._states
+        order = np.argsort(old_keys)
+        at = np.minimum(np.searchsorted(old_keys, keys, sorter=order), len(old_keys) - 1)
+        old = order[at]
+        same = old_keys[old] == keys
+        same &= old_accepting[old] == dfa.accepting_mask
+        same &= (old_successors[old] == keys[dfa.delta]).all(axis=1)
+        return keys[same]
+
+    def _run(self, dfa: CompiledDFA, keys: Optional[np.ndarray], idx: np.ndarray) -> None:
+        """Run the words at idx in lockstep, recording verdicts and state-key paths."""
+        if not len(idx):
+            return
+        self.runs += len(idx)
+        words, lengths = self._words[idx], self._lengths[idx]
+        states = np.full(len(idx), dfa.initial, dtype=np.int64)
+        alive = np.ones(len(idx), dtype=bool)
+        paths = np.full((len(idx), self._paths.shape[1]), -1, dtype=np.int64)
+        if keys is not None:
+            paths[:, 0] = keys[dfa.initial]
+        for t in range(int(lengths.max())):
+            active = np.flatnonzero((lengths > t) & alive)
+            symbols = words[active, t]
+            alive[active[symbols < 0]] = False
+            active, symbols = active[symbols >= 0], symbols[symbols >= 0]
+            states[active] = dfa.delta[states[active], symbols]
+            if keys is not None:
+                paths[active, t + 1] = keys[states[active]]
+        self._verdicts[idx] = dfa.accepting_mask[states] & alive
+        self._paths[idx] = paths
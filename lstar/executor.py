@@ -0,0 +1,136 @@
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+
+from .oracle import Oracle
+
+
+class SerialExecutor:
+    """Answers a batch of membership queries in the calling thread."""
+
+    # Batches run in the caller's thread, so stateful session oracles are safe
+    concurrent = False
+
+    def membership_queries(self, teacher: Oracle, words: Sequence[str]) -> List[bool]:
+        return list(teacher.membership_queries(words))
+
+    def prefix_queries(self, teacher: Oracle, words: Sequence[str]) -> List[List[bool]]:
+        return list(teacher.prefix_queries(words))
+
+    def output_queries(self, teacher, words: Sequence[str]) -> List[Sequence]:
+        return list(teacher.output_queries(words))
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-process oracle for ProcessPoolExecutor workers
+_worker_oracle: Optional[Oracle] = None
+
+
+def _init_process_worker(oracle_factory: Callable[[], Oracle]) -> None:
+    global _worker_oracle
+    _worker_oracle = oracle_factory()
+
+
+def _run_process_chunk(words: Sequence[str], method: str = 'membership_queries') -> list:
+    return list(getattr(_worker_oracle, method)(words))
+
+
+class ParallelExecutor(SerialExecutor):
+    """
+    Answers a batch of membership queries on a concurrent.futures pool.
+
+    The batch is split into contiguous chunks and the answers are
+    reassembled in order, so results do not depend on the worker count.
+
+    Args:
+        max_workers: Number of worker threads or processes
+        oracle_factory: Builds one oracle per worker. Needed for oracles that
+            keep mutable session state (e.g. ProtocolOracle); without it the
+            learner's teacher is shared by all threads and must be thread-safe.
+        use_processes: Use a process pool for CPU-bound oracles. Requires a
+            picklable oracle_factory.
+        chunk_size: Words per task; defaults to spreading each batch over
+            roughly four tasks per worker
+    """
+
+    concurrent = True
+
+    def __init__(self, max_workers: int = 4, oracle_factory: Optional[Callable[[], Oracle]] = None,
+                 use_processes: bool = False, chunk_size: Optional[int] = None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if use_processes and oracle_factory is None:
+            raise ValueError("A process pool needs an oracle_factory to build worker oracles")
+        self.max_workers = max_workers
+        self.oracle_factory = oracle_factory
+        self.use_processes = use_processes
+        self.chunk_size = chunk_size
+        self._pool: Optional[Executor] = None
+        self._local = threading.local()
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.use_processes:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_process_worker,
+                    initargs=(self.oracle_factory,),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _thread_oracle(self, teacher: Oracle) -> Oracle:
+        if self.oracle_factory is None:
+            return teacher
+        if not hasattr(self._local, 'oracle'):
+            self._local.oracle = self.oracle_factory()
+        return self._local.oracle
+
+    def _run_thread_chunk(self, teacher: Oracle, words: Sequence[str],
+                          method: str = 'membership_queries') -> list:
+        return list(getattr(self._thread_oracle(teacher), method)(words))
+
+    def _chunks(self, words: Sequence[str]) -> List[Sequence[str]]:
+        size = self.chunk_size or max(1, -(-len(words) // (self.max_workers * 4)))
+        return [words[i:i + size] for i in range(0, len(words), size)]
+
+    def _map(self, teacher: Oracle, words: Sequence[str], method: str) -> list:
+        """Run an oracle batch method over chunks of words on the pool, in order."""
+        words = list(words)
+        if not words:
+            return []
+        pool = self._get_pool()
+        if self.use_processes:
+            futures = [pool.submit(_run_process_chunk, chunk, method) for chunk in self._chunks(words)]
+        else:
+            futures = [pool.submit(self._run_thread_chunk, teacher, chunk, method)
+                       for chunk in self._chunks(words)]
+
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def membership_queries(self, teacher: Oracle, words: Sequence[str]) -> List[bool]:
+        return self._map(teacher, words, 'membership_queries')
+
+    def prefix_queries(self, teacher: Oracle, words: Sequence[str]) -> List[List[bool]]:
+        return self._map(teacher, words, 'prefix_queries')
+
+    def output_queries(self, teacher, words: Sequence[str]) -> List[Sequence]:
+        return self._map(teacher, words, 'output_queries')
+
+    def close(self) -> None:
+        """Shut down the worker pool; it is recreated on next use."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,197 @@
+from typing import List, Optional
+import logging
+
+import numpy as np
+
+from .base import BaseLearner
+from .counterexample import find_breakpoint
+from .dfa import CompiledDFA
+from .metrics import LearnerStats
+from .utils import Word
+
+logger = logging.getLogger(__name__)
+
+
+class KVLearner(BaseLearner):
+    """
+    Discrimination-tree learner in the style of Kearns–Vazirani.
+
+    Instead of an observation table, states are the leaves of a binary
+    discrimination tree whose inner nodes hold distinguishing suffixes. A
+    word is classified by sifting it down the tree, one membership query
+    per level. Counterexamples are decomposed Rivest–Schapire style into a
+    single new state and a single new discriminator, so only the transitions
+    that pointed at the split leaf are re-sifted and membership queries
+    grow roughly with states x alphabet x tree depth.
+
+    Offers the same initialize()/learn() interface and Oracle contract as
+    LStarLearner. TTT's discriminator finalization is not implemented.
+    """
+    def __init__(self, executor=None, max_iterations: int = 100,
+                 stats: Optional[LearnerStats] = None, prefix_closed: bool = False,
+                 sessions: Optional[bool] = None):
+        super().__init__(executor, max_iterations, stats, prefix_closed, sessions)
+        self.access: List[Word] = []
+        self._disc: List[Optional[Word]] = []
+        self._children: List[List[Optional[int]]] = []
+        self._leaf_state: List[int] = []
+        self._state_leaf: List[int] = []
+        self._delta: List[List[int]] = []
+        self._unsifted: List[int] = []
+        self._hypothesis: Optional[CompiledDFA] = None
+
+
+    def _new_node(self, disc: Optional[Word], state: int = -1) -> int:
+        self._disc.append(disc)
+        self._children.append([None, None])
+        self._leaf_state.append(state)
+        return len(self._disc) - 1
+
+
+    def _new_state(self, word: Word, parent: int, side: bool) -> int:
+        """Create a state with access word `word` as a leaf under parent."""
+        state = len(self.access)
+        self.access.append(word)
+        leaf = self._new_node(None, state)
+        self._children[parent][side] = leaf
+        self._state_leaf.append(leaf)
+        self._delta.append([-1] * len(self.symbols))
+        self._unsifted.append(state)
+        return leaf
+
+
+    def _sift(self, words: List[Word], nodes: List[int]) -> List[int]:
+        """
+        Sift words down the tree from the given nodes, level by level.
+
+        The membership queries of each level are asked as one batch. A word
+        falling into an empty slot becomes a new state there.
+        """
+        nodes = list(nodes)
+        pending = [i for i, n in enumerate(nodes) if self._disc[n] is not None]
+        while pending:
+            answers = self._memberships([words[i] + self._disc[nodes[i]] for i in pending])
+            still_inner = []
+            for i, answer in zip(pending, answers):
+                child = self._children[nodes[i]][answer]
+                if child is None:
+                    child = self._new_state(words[i], nodes[i], answer)
+                nodes[i] = child
+                if self._disc[child] is not None:
+                    still_inner.append(i)
+            pending = still_inner
+        return nodes
+
+
+    def _close(self) -> None:
+        """Sift the transitions of new states until every transition ends in a leaf."""
+        while self._unsifted:
+            states, self._unsifted = self._unsifted, []
+            edges = [(q, a) for q in states for a in range(len(self.symbols))]
+            leaves = self._sift([self.access[q] + (a,) for q, a in edges], [0] * len(edges))
+            for (q, a), leaf in zip(edges, leaves):
+                self._delta[q][a] = leaf
+
+
+    def _construct_dfa(self) -> CompiledDFA:
+        """Build the hypothesis from the sifted transitions."""
+        leaf_state = np.asarray(self._leaf_state, dtype=np.int64)
+        delta = leaf_state[np.asarray(self._delta, dtype=np.int64)]
+        accepting = self._memberships(self.access)
+        self._hypothesis = CompiledDFA(self.symbols.symbols, delta, accepting, 0)
+        return self._hypothesis
+
+
+    def _state_keys(self) -> List[int]:
+        """Query store nodes of the states' access words."""
+        return [self.store.node(word) for word in self.access]
+
+
+    def _split(self, word: Word) -> None:
+        """
+        Refine the tree with a counterexample.
+
+        find_breakpoint() finds i where alpha(i) = MQ(access(u[:i]) · u[i:])
+        changes; then access(u[:i]) · u[i] is a new state, separated from the
+        state reached by u[:i + 1] by the suffix u[i + 1:].
+        """
+        hypothesis = self._hypothesis
+        states = [hypothesis.initial]
+        for a in word:
+            states.append(int(hypothesis.delta[states[-1], a]))
+
+        def alpha(i):
+            return self._membership(self.access[states[i]] + word[i:])
+
+        high = find_breakpoint(self, word, alpha)
+        low = high - 1
+        old_state = states[high]
+        new_word = self.access[states[low]] + (word[low],)
+        suffix = word[high:]
+        old_answer = self._membership(self.access[old_state] + suffix)
+
+        # The old leaf becomes an inner node separating old and new state
+        leaf = self._state_leaf[old_state]
+        self._disc[leaf] = suffix
+        self._leaf_state[leaf] = -1
+        old_leaf = self._new_node(None, old_state)
+        self._children[leaf][old_answer] = old_leaf
+        self._state_leaf[old_state] = old_leaf
+        self._new_state(new_word, leaf, not old_answer)
+
+        # Transitions that ended in the split leaf sift one level further
+        edges = [(q, a) for q, row in enumerate(self._delta) for a, n in enumerate(row) if n == leaf]
+        leaves = self._sift([self.access[q] + (a,) for q, a in edges], [leaf] * len(edges))
+        for (q, a), target in zip(edges, leaves):
+            self._delta[q][a] = target
+
+
+    def _add_counterexample_info(self, counterexample: str) -> None:
+        """Refine the tree until the hypothesis classifies the counterexample correctly."""
+        word = self._encode(counterexample)
+        expected = self._membership(word)
+        while self._hypothesis.run_encoded(word) != expected:
+            self._split(word)
+            self._close()
+            self._construct_dfa()
+
+
+    def learn(self) -> CompiledDFA:
+        """Main learning loop."""
+        for iteration in range(1, self.max_iterations + 1):
+            if self.stats is not None:
+                self.stats.start_iteration(iteration)
+            with self._phase('closedness'):
+                self._close()
+            with self._phase('hypothesis'):
+                dfa = self._construct_dfa()
+            logger.debug(f"Iteration {iteration}: {len(self.access)} states")
+
+            counterexample = self._verify_hypothesis(dfa)
+            if counterexample is None:
+                logger.info("Learning completed successfully!")
+                self._finish_stats()
+                return dfa
+
+            logger.info(f"Counterexample found: {counterexample}")
+            with self._phase('counterexample'):
+                self._add_counterexample_info(counterexample)
+
+        self._finish_stats()
+        raise Exception(f"Learning did not converge after {self.max_iterations} iterations")
+
+
+    def initialize(self, alphabet, examples, teacher) -> None:
+        super().initialize(alphabet, examples, teacher)
+        self.access = []
+        self._disc = []
+        self._children = []
+        self._leaf_state = []
+        self._state_leaf = []
+        self._delta = []
+        self._unsifted = []
+        self._hypothesis = None
+
+        # The root separates accepted from rejected words; ε is the first state
+        root = self._new_node(())
+        self._sift([()], [root])
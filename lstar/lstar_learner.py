@@ -1,34 +1,119 @@
-from typing import Optional, Tuple, Set, Dict
+from typing import Optional, Tuple, Set, Dict, List
 import logging
-from .utils import run_dfa
+from time import perf_counter
+from .base import BaseLearner
+from .utils import SymbolTable, Word
+from .query_store import ACCEPTED, UNKNOWN, QueryStore, TableView
+from .dfa import CompiledDFA
+from .counterexample import CounterexampleStrategy, find_breakpoint
+from .checkpoint import save_checkpoint, load_checkpoint
+from .packed_table import PackedTable
+from .metrics import LearnerStats
 import numpy as np
-from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
 
 MAX_ITERATIONS = 5
-class LStarLearner:
-    def __init__(self):
-        self._matrix = None
-        self._s_to_idx = {}
-        self._e_to_idx = {}
-        self.S: Set[str] = set()
-        self.E: Set[str] = set()
-        self.T: Dict[Tuple[str, str], bool] = {}
-        self.alphabet: Set[str] = set()
-        self.teacher = None
-        self.positive_examples: Set[str] = set()
-        self.negative_examples: Set[str] = set()
-        self._signature_cache: Dict[str, tuple] = {}
+# Share of learning time that checkpoints written by default may take
+CHECKPOINT_SHARE = 0.05
+class LStarLearner(BaseLearner):
+    """
+    Angluin's L* learner.
+
+    Internally every word is a tuple of interned symbol indices (see
+    SymbolTable): S and E are sets of encoded words and T is keyed by
+    (row, suffix) word pairs. Strings only appear at the edges, i.e. in
+    initialize(), oracle queries, counterexamples and the returned DFA.
+
+    Membership answers live once per word in a prefix-tree QueryStore; T is
+    a view into it. A bit-packed PackedTable holds the table cells, one row
+    per word of S ∪ S·Σ, and _succ[i, a] is the row index of row i extended
+    by a, so closedness, consistency and hypothesis construction run as
+    array operations over packed row signatures.
+
+    With lazy=True cells are not filled when rows and columns are added.
+    S rows are resolved in full, but S·Σ rows only on the columns that
+    separate the S rows they could still match; a resolved cell is
+    remembered in a bit-packed mask and never asked again. Cells left
+    unresolved are assumed, which saves membership queries (most with large
+    alphabets) at the price of extra equivalence queries whose
+    counterexamples point back at a wrong assumption; see the `lazy`
+    argument for what that costs.
+    """
+    def __init__(self, executor=None, strategy=CounterexampleStrategy.ALL_PREFIXES,
+                 max_iterations: int = 100, checkpoint_path=None,
+                 checkpoint_every: Optional[int] = None,
+                 stats: Optional[LearnerStats] = None, lazy: bool = False,
+                 prefix_closed: bool = False, sessions: Optional[bool] = None):
+        """
+        Args:
+            executor: Runs the membership query batches that fill the table,
+                e.g. a ParallelExecutor. Defaults to a SerialExecutor.
+            strategy: How counterexamples are added to the table; a
+                CounterexampleStrategy or a callable(learner, encoded_word).
+            max_iterations: Give up after this many learning iterations.
+            checkpoint_path: If set, learn() writes checkpoints there; see
+                resume(). Each write rewrites the whole table and query
+                store and fsyncs it, so it costs time linear in their size.
+            checkpoint_every: Write a checkpoint every this many iterations.
+                None (the default) writes one in the first iteration and
+                then whenever the time since the last write is large
+                enough that writes take at most CHECKPOINT_SHARE (5%) of
+                the run, so large tables are saved less often.
+            stats: A LearnerStats collecting query counts, per-phase
+                timings and per-batch oracle latencies. Off (None) by default.
+            lazy: Resolve table cells on demand while classifying rows
+                instead of filling every cell eagerly. Trades membership
+                queries for equivalence queries: on random 50-state targets
+                it saves 30-40% of membership queries but needs about five
+                times as many equivalence queries (47 instead of 10), and
+                22-38% of the final table is never resolved. With an
+                equivalence oracle that tests (W-method, random walks) those
+                extra equivalence queries cost test words: in
+                benchmarks/bench_lazy.py the total was higher than with
+                eager filling for the Wp-method, and higher or about even
+                for random walks. A test suite that misses a wrong assumption
+                also lets learning stop on a hypothesis built from
+                unresolved cells. Best with an exact or cheap equivalence
+                oracle.
+            prefix_closed: Declare the target prefix-closed: cells below a
+                rejected word are rejected without a query, so the sink
+                state's rows come for free. Table batches are then asked in
+                rounds, shorter words first.
+            sessions: Drive a teacher with reset()/step() as sessions:
+                None (default) only with a serial executor, True always,
+                False never.
+        """
+        super().__init__(executor, max_iterations, stats, prefix_closed, sessions)
+        self.strategy = strategy
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._last_checkpoint: Optional[Tuple[float, float]] = None
+        self.lazy = lazy
+        self._known = PackedTable()
+        self._hypothesis: Optional[CompiledDFA] = None
+        self._access_words: List[Word] = []
+        self._table = PackedTable()
+        self._succ = np.zeros((0, 0), dtype=np.int64)
+        self._rows: List[Word] = []
+        self._cols: List[Word] = []
+        self._row_to_idx: Dict[Word, int] = {}
+        self._e_to_idx: Dict[Word, int] = {}
+        self._s_rows: Dict[Word, int] = {}
+        self._row_nodes: Dict[Word, int] = {}
+        self.S: Set[Word] = set()
+        self.E: Set[Word] = set()
+        self.T: TableView = TableView(self.store, self._row_to_idx, self._e_to_idx)
+
 
-        
     def _get_sa_rows(self):
         """Get all rows that are in S·Σ but not in S."""
         sa_rows = set()
-        for s in sorted(self.S):
-            for a in sorted(self.alphabet):
-                sa = f"{s} {a}".strip()
+        n_symbols = len(self.symbols)
+        for s in self.S:
+            for a in range(n_symbols):
+                sa = s + (a,)
                 if sa not in self.S:
                     sa_rows.add(sa)
         return sorted(sa_rows)
@@ -36,146 +121,276 @@ class LStarLearner:
 
     def debug_step(self, iteration):
         """Log debug information for current learning step."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         logger.debug(f"Iteration {iteration}:")
-        logger.debug(f"S = {sorted(self.S)}")
-        logger.debug(f"E = {sorted(self.E)}")
+        logger.debug(f"S = {sorted(self._decode(s) for s in self.S)}")
+        logger.debug(f"E = {sorted(self._decode(e) for e in self.E)}")
         logger.debug(f"Alphabet = {sorted(self.alphabet)}")
         self.print_observation_table()
 
 
-    def _construct_dfa(self) -> dict:
+    def _s_indices(self) -> np.ndarray:
+        """Row indices of S, in the order words entered S."""
+        return np.fromiter(self._s_rows.values(), dtype=np.int64, count=len(self._s_rows))
+
+
+    def _row_classes(self) -> np.ndarray:
+        """
+        Class id of every table row; rows with equal cells share an id.
+
+        Packed rows are compared as raw bytes with np.unique, so the cost
+        is one sort over n_rows x ceil(n_cols / 64) words.
+        """
+        if self.lazy:
+            return self._refine_row_classes()
+        keys = self._table.signatures(len(self._rows))
+        _, classes = np.unique(keys, return_inverse=True)
+        return classes.ravel()
+
+
+    def _resolve_cells(self, cells: list) -> None:
+        """Query and record (row, suffix) cells as one batch, unless there are none."""
+        if cells:
+            with self._phase('table_fill'):
+                self._fill_cells(cells)
+
+
+    def _resolve_rows(self, rows) -> None:
+        """Resolve every unknown cell of the given rows, as one batch."""
+        rows = np.asarray(list(dict.fromkeys(rows)), dtype=np.int64)
+        if not len(rows):
+            return
+        unknown_rows, unknown_cols = np.nonzero(~self._known.unpack(rows))
+        self._resolve_cells([(self._rows[r], self._cols[c])
+                             for r, c in zip(rows[unknown_rows].tolist(), unknown_cols.tolist())])
+
+
+    def _refine_row_classes(self) -> np.ndarray:
+        """
+        Lazy row classes: S rows are compared in full, other rows are sifted.
+
+        Every cell of S rows is resolved, so S rows are classed exactly.
+        The other rows are placed by refining the partition column by
+        column: a row only needs a column resolved while the S rows it can
+        still be equal to disagree on it; otherwise it is assumed to agree
+        with them (cells already known are always used). A row left without
+        any S row in its class is unclosed.
+
+        The assumption can make an S·Σ row look equal to an S row it is
+        not; the counterexample that follows is then traced back to the
+        assumed cell by _repair_assumption().
+        """
+        n_rows = len(self._rows)
+        s_idx = self._s_indices()
+        self._resolve_rows(s_idx)
+        is_s = np.zeros(n_rows, dtype=bool)
+        is_s[s_idx] = True
+
+        classes = np.zeros(n_rows, dtype=np.int64)
+        for col in range(len(self._cols)):
+            values = self._table.column(np.arange(n_rows), col)
+            n_classes = int(classes.max()) + 1
+            s_total = np.bincount(classes[s_idx], minlength=n_classes)
+            s_ones = np.bincount(classes[s_idx], weights=values[s_idx], minlength=n_classes)
+            split = (s_ones > 0) & (s_ones < s_total)
+
+            # Resolve the column where the candidate S rows disagree
+            known = self._known.column(np.arange(n_rows), col)
+            needed = np.flatnonzero(split[classes] & ~known & ~is_s)
+            if len(needed):
+                e = self._cols[col]
+                self._resolve_cells([(self._rows[r], e) for r in needed.tolist()])
+                values[needed] = self._table.column(needed, col)
+                known[needed] = True
+
+            # Unresolved cells take the value their candidate S rows share
+            assumed = ~known & (s_total[classes] > 0)
+            values[assumed] = s_ones[classes[assumed]] > 0
+            _, classes = np.unique(classes * 2 + values, return_inverse=True)
+            classes = classes.ravel()
+        return classes
+
+
+    def _construct_dfa(self) -> CompiledDFA:
         """Construct DFA from observation table."""
-        # Get unique states from row signatures
-        state_sigs = {self._get_row_signature(s) for s in self.S}
-        initial_sig = self._get_row_signature('')
-        state_map = {sig: i for i, sig in enumerate(state_sigs)}
-        
-        # Build transitions
-        transitions = {}
-        for s in self.S:
-            current_sig = self._get_row_signature(s)
-            for a in self.alphabet:
-                sa = f"{s} {a}".strip()
-                next_sig = self._get_row_signature(sa)
-                transitions[(state_map[current_sig], a)] = state_map[next_sig]
-
-        # Determine accepting states
-        accepting = {state_map[sig] for sig in state_sigs if sig[0]}  # Use empty string result
-        
-        return {
-            'states': len(state_sigs),
-            'initial': state_map[initial_sig],
-            'accepting': accepting,
-            'transitions': transitions
-        }
+        classes = self._row_classes()
+        s_idx = self._s_indices()
+
+        # One state per distinct S row; the first S row of a class represents it
+        state_classes, first = np.unique(classes[s_idx], return_index=True)
+        class_to_state = np.full(classes.max() + 1, -1, dtype=np.int64)
+        class_to_state[state_classes] = np.arange(len(state_classes))
+        representatives = s_idx[first]
+
+        # Build transitions from the successor index arrays
+        delta = class_to_state[classes[self._succ[representatives]]]
+
+        # Determine accepting states from the empty-suffix column
+        accepting = self._table.column(representatives, self._e_to_idx[()])
+        initial = class_to_state[classes[self._row_to_idx[()]]]
+
+        self._access_words = [self._rows[i] for i in representatives.tolist()]
+        self._hypothesis = CompiledDFA(self.symbols.symbols, delta, accepting, initial)
+        return self._hypothesis
     
 
+    def _state_keys(self) -> List[int]:
+        """Query store nodes of the hypothesis' access words."""
+        return [self._row_nodes[row] for row in self._access_words]
+
+
     def _is_consistent(self) -> tuple:
-        """Check consistency using vectorized operations, checking both S and S·Σ rows."""
-        # First collect all unique row signatures in S
-        signatures_to_strings = defaultdict(list)
-        for s in self.S:
-            sig = self._get_row_signature(s)  # Use existing method which includes S·Σ info
-            signatures_to_strings[sig].append(s)
+        """
+        Check consistency over the matrix.
 
-        # Check each group with same signature
-        for strings_with_same_sig in signatures_to_strings.values():
-            if len(strings_with_same_sig) < 2:
-                continue
+        Returns None if consistent, otherwise (s1, s2, a, e) where s1 and s2
+        have equal rows but s1·a and s2·a differ in column e.
+        """
+        classes = self._row_classes()
+        s_idx = self._s_indices()
+        s_classes = classes[s_idx]
+        if len(np.unique(s_classes)) == len(s_idx):
+            return None
 
-            # For same signatures, check their S·Σ extensions using matrix
-            for a in sorted(self.alphabet):
-                extended_sigs = {}
-                for s in strings_with_same_sig:
-                    sa = f"{s} {a}".strip()
-                    sa_sig = self._get_row_signature(sa)
-                    
-                    if sa_sig in extended_sigs:
-                        s_prev = extended_sigs[sa_sig]
-                        # Found potential inconsistency, verify with different suffix
-                        for e in sorted(self.E):
-                            if self.T[(sa, e)] != self.T[f"{s_prev} {a}".strip(), e]:
-                                return s_prev, s, a, e
-                    else:
-                        extended_sigs[sa_sig] = s
+        # Sort S rows by class; an inconsistency shows up as two neighbours
+        # of the same class whose successors are in different classes
+        order = np.argsort(s_classes, kind='stable')
+        s_idx = s_idx[order]
+        same_class = s_classes[order][1:] == s_classes[order][:-1]
+        for a in range(len(self.symbols)):
+            succ_classes = classes[self._succ[s_idx, a]]
+            clash = same_class & (succ_classes[1:] != succ_classes[:-1])
+            if clash.any():
+                i = int(np.argmax(clash))
+                r1, r2 = self._succ[s_idx[i], a], self._succ[s_idx[i + 1], a]
+                col = self._table.first_difference(r1, r2, self._known if self.lazy else None)
+                return self._rows[s_idx[i]], self._rows[s_idx[i + 1]], a, self._cols[col]
 
         return None
 
-    def _get_row_signature(self, s: str) -> tuple:
-        """Get signature for a row, using cache."""
-        if s not in self._signature_cache:
-            sig = tuple(self.T[(s, e)] for e in sorted(self.E))
-            self._signature_cache[s] = sig
-        return self._signature_cache[s]
+    def _get_row_signature(self, s: Word) -> bytes:
+        """Packed-bytes signature of a row; equal for rows with equal cells."""
+        return self._table.signature(self._row_to_idx[s])
     
 
-    def _verify_hypothesis(self, dfa: dict) -> Optional[str]:
-        """Verify DFA hypothesis against examples and teacher."""
-        # First check examples
-        for pos in self.positive_examples:
-            if not run_dfa(dfa, pos):
-                return pos
-        
-        for neg in self.negative_examples:
-            if run_dfa(dfa, neg):
-                return neg
-                
-        # Then do equivalence query
-        counterexample = self.teacher.equivalence_query(dfa)
-        if counterexample is not None:
-            # Verify counterexample is actually distinguishing
-            oracle_result = self.teacher.membership_query(counterexample)
-            dfa_result = run_dfa(dfa, counterexample)
-            if oracle_result == dfa_result:
-                raise Exception(f"Invalid counterexample {counterexample}: DFA and oracle agree")
-        
-        return counterexample
-    
+    def _add_all_prefixes(self, word: Word) -> None:
+        """Add all non-empty prefixes of an encoded word to S."""
+        for i in range(1, len(word) + 1):
+            self.S.add(word[:i])
+
+
+    def _grow_table(self, n_rows: int, n_cols: int) -> None:
+        """Make room for n_rows x n_cols cells and n_rows successor rows, with amortized doubling."""
+        self._table.grow(n_rows, n_cols)
+        if self.lazy:
+            self._known.grow(n_rows, n_cols)
+        capacity = len(self._succ)
+        if n_rows > capacity:
+            succ = np.full((max(n_rows, 2 * capacity), len(self.symbols)), -1, dtype=np.int64)
+            succ[:capacity] = self._succ
+            self._succ = succ
+
+
+    def _plan_cells(self, cells: list) -> Tuple[list, list]:
+        """
+        Map (row, suffix) cells to their query store nodes.
+
+        Returns the node of every cell and the distinct nodes that still
+        need an answer, so a word shared by several cells is asked once.
+        """
+        if not cells:
+            return [], []
+        # One vectorized walk per suffix, from the nodes of all its rows
+        row_nodes = np.fromiter((self._row_nodes[row] for row, _ in cells),
+                                dtype=np.int64, count=len(cells))
+        by_suffix: Dict[Word, list] = {}
+        for i, (_, e) in enumerate(cells):
+            by_suffix.setdefault(e, []).append(i)
+        nodes = np.empty(len(cells), dtype=np.int64)
+        for e, idx in by_suffix.items():
+            nodes[idx] = self.store.walk_many(row_nodes[idx], e)
+
+        unknown = nodes[self.store.answer_codes(nodes) == UNKNOWN]
+        _, first = np.unique(unknown, return_index=True)
+        return nodes.tolist(), unknown[np.sort(first)].tolist()
+
 
-    def _add_all_prefixes(self, tokens: list) -> None:
-        """Add all prefixes from a list of tokens to S."""
-        prefix = ""
-        for token in tokens:
-            prefix = f"{prefix} {token}".strip()
-            if prefix:  # Don't add empty string
-                self.S.add(prefix)
+    def _record_cells(self, cells: list, nodes: list) -> None:
+        """Copy the answers of cells from the query store into the packed table."""
+        rows = [self._row_to_idx[row] for row, _ in cells]
+        cols = [self._e_to_idx[e] for _, e in cells]
+        self._table.set_cells(rows, cols, self.store.answer_codes(nodes) == ACCEPTED)
+        if self.lazy:
+            self._known.set_cells(rows, cols, np.ones(len(rows), dtype=bool))
+
+
+    def _fill_cells(self, cells: list) -> None:
+        """Query the unknown words behind a batch of cells and record the answers."""
+        if not cells:
+            return
+        nodes, missing = self._plan_cells(cells)
+        if self.stats is not None:
+            self.stats.store_hits += len(cells) - len(missing)
+        self._query_nodes(missing)
+        self._record_cells(cells, nodes)
+
+
+    def _extend_table(self) -> list:
+        """
+        Append rows and columns for anything new in S, E or S·Σ.
+
+        Returns the (row, suffix) cells that are not yet known: the new
+        columns of existing rows and every column of the new rows.
+        """
+        old_cols = list(self._cols)
+        new_cols = [e for e in sorted(self.E) if e not in self._e_to_idx]
+        for e in new_cols:
+            self._e_to_idx[e] = len(self._cols)
+            self._cols.append(e)
+
+        old_rows = list(self._rows)
+        new_rows = []
+
+        def add_row(row):
+            if row not in self._row_to_idx:
+                self._row_to_idx[row] = len(self._rows)
+                self._row_nodes[row] = self.store.node(row)
+                self._rows.append(row)
+                new_rows.append(row)
+
+        # Only words that just entered S bring new S·Σ rows
+        new_s = sorted(s for s in self.S if s not in self._s_rows)
+        for s in new_s:
+            add_row(s)
+        for s in new_s:
+            for a in range(len(self.symbols)):
+                add_row(s + (a,))
+
+        self._grow_table(len(self._rows), len(self._cols))
+        for s in new_s:
+            idx = self._row_to_idx[s]
+            self._s_rows[s] = idx
+            self._succ[idx] = [self._row_to_idx[s + (a,)] for a in range(len(self.symbols))]
+
+        pending = [(row, e) for row in old_rows for e in new_cols]
+        pending += [(row, e) for row in new_rows for e in old_cols + new_cols]
+        return pending
 
 
     def _update_observation_table(self):
-        """Update observation table using numpy array for efficient operations"""
-        self._signature_cache.clear()
-        self.T = {}
-        
-        # Create mappings
-        self._s_to_idx = {s: i for i, s in enumerate(sorted(self.S))}
-        self._e_to_idx = {e: i for i, e in enumerate(sorted(self.E))}
-        
-        # Initialize matrix
-        total_rows = len(self.S) + len(self.S) * len(self.alphabet)
-        self._matrix = np.zeros((total_rows, len(self.E)), dtype=bool)
-        
-        # Fill matrix for S rows
-        for s in self.S:
-            s_idx = self._s_to_idx[s]
-            for e in self.E:
-                e_idx = self._e_to_idx[e]
-                seq = f"{s} {e}".strip()
-                result = self.teacher.membership_query(seq)
-                self._matrix[s_idx, e_idx] = result
-                self.T[(s, e)] = result  # Keep original T dict for compatibility
-                
-        # Fill matrix for S·Σ rows
-        sa_idx = len(self.S)
-        for s in self.S:
-            for a in self.alphabet:
-                sa = f"{s} {a}".strip()
-                for e in self.E:
-                    e_idx = self._e_to_idx[e]
-                    seq = f"{sa} {e}".strip()
-                    result = self.teacher.membership_query(seq)
-                    self._matrix[sa_idx, e_idx] = result
-                    self.T[(sa, e)] = result  # Keep original T dict for compatibility
-                sa_idx += 1
+        """
+        Bring the observation table up to date with S, E and the alphabet.
+
+        The table is maintained incrementally: rows and columns are appended
+        and only cells that are not already known are queried, as a single
+        batch. In lazy mode the new cells are left for _row_classes().
+        """
+        with self._phase('table_fill'):
+            pending = self._extend_table()
+            if not self.lazy:
+                self._fill_cells(pending)
+
 
     def _check_table_properties(self) -> Optional[str]:
         """
@@ -183,97 +398,132 @@ class LStarLearner:
         Returns None if table is good, otherwise returns the counterexample.
         """
         # Check if table is closed
-        closed, unclosed_row = self._is_closed()
+        # Check if table is closed; every missing class gets a row in S at once
+        with self._phase('closedness'):
+            closed, unclosed_rows = self._is_closed()
         if not closed:
-            if isinstance(unclosed_row, str):  # Make sure we only add strings to S
-                self.S.add(unclosed_row)
-                self._update_observation_table()
-                logger.info(f"Table not closed, adding {unclosed_row}")
-                return unclosed_row
+            self.S.update(unclosed_rows)
+            self._update_observation_table()
+            logger.info(f"Table not closed, adding {len(unclosed_rows)} rows to S, "
+                        f"first {self._decode(unclosed_rows[0])}")
+            return self._decode(unclosed_rows[0])
         
         # Check if table is consistent
-        inconsistency = self._is_consistent()
+        with self._phase('consistency'):
+            inconsistency = self._is_consistent()
         if inconsistency:
             s1, s2, a, e = inconsistency
-            new_suffix = f"{a} {e}".strip()
+            new_suffix = (a,) + e
             self.E.add(new_suffix)
             self._update_observation_table()
-            logger.info(f"Table not consistent, adding {new_suffix} to E")
-            return new_suffix
+            logger.info(f"Table not consistent, adding {self._decode(new_suffix)} to E")
+            return self._decode(new_suffix)
             
         return None
 
 
     def _is_closed(self) -> tuple:
         """Check if table is closed.
-        Returns (True, None) if closed, (False, sa) if sa is in S·Σ but its signature doesn't appear in S"""
-        # Get signatures of S rows
-        s_signatures = {self._get_row_signature(s) for s in self.S}
-        
-        # Check each row in S·Σ
-        for s in self.S:
-            for a in sorted(self.alphabet):
-                sa = f"{s} {a}".strip()
-                if sa in self.S:
-                    continue
-                sa_sig = self._get_row_signature(sa)
-                if sa_sig not in s_signatures:
-                    return False, sa
-        return True, None
+        Returns (True, None) if closed, otherwise (False, rows) with the first
+        S·Σ row of every class that no S row has, so one call closes them all"""
+        classes = self._row_classes()
+        s_idx = self._s_indices()
+
+        # Every S·Σ row must fall in a class that some S row has
+        sa_idx = self._succ[s_idx].ravel()
+        unclosed = ~np.isin(classes[sa_idx], classes[s_idx])
+        if not unclosed.any():
+            return True, None
+        sa_idx = sa_idx[unclosed]
+        _, first = np.unique(classes[sa_idx], return_index=True)
+        return False, [self._rows[i] for i in sa_idx[np.sort(first)].tolist()]
 
 
     def _add_counterexample_info(self, counterexample: str) -> None:
-        """Process counterexample by adding all prefixes to S and all suffixes to E."""
+        """Process counterexample with the learner's strategy (all prefixes and suffixes by default)."""
         if not counterexample:
             return
-            
-        tokens = counterexample.split()
-        
-        # Add all prefixes to S
-        prefix = ""
-        for token in tokens:
-            prefix = f"{prefix} {token}".strip()
-            self.S.add(prefix)
-            
-        # Add all suffixes to E
-        for i in range(len(tokens)):
-            suffix = ' '.join(tokens[i:])
-            if suffix:
-                self.E.add(suffix)
-        
-        self._update_observation_table()
-        self._signature_cache.clear()
+        word = self._encode(counterexample)
+        with self._phase('counterexample'):
+            if self.lazy and self._repair_assumption(word):
+                return
+            self.strategy(self, word)
+
+
+    def _repair_assumption(self, word: Word) -> bool:
+        """
+        Lazy mode: check whether the counterexample only exposes a cell that
+        was assumed rather than resolved, and if so resolve it.
+
+        The breakpoint search finds a row access·a and suffix v on which
+        the row differs from the S row it was classed with. If v is already
+        a column, that cell can only have been assumed, and resolving it
+        (its word was just asked by the search) splits the row off. Returns
+        False if v is a new suffix, left to the counterexample strategy.
+        """
+        i = find_breakpoint(self, word)
+        state = self._hypothesis.initial
+        for a in word[:i - 1]:
+            state = int(self._hypothesis.delta[state, a])
+        row, suffix = self._access_words[state] + word[i - 1:i], word[i:]
+        if suffix not in self._e_to_idx:
+            return False
+        self._resolve_cells([(row, suffix)])
+        return True
+
 
+    def _checkpoint_due(self, iteration: int) -> bool:
+        """Whether learn() writes a checkpoint in this iteration (see checkpoint_every)."""
+        if self.checkpoint_every is not None:
+            return iteration % self.checkpoint_every == 0
+        if self._last_checkpoint is None:
+            return True
+        written, seconds = self._last_checkpoint
+        return perf_counter() - written >= seconds * (1 - CHECKPOINT_SHARE) / CHECKPOINT_SHARE
 
-    def learn(self) -> dict:
-        """Main learning loop."""
-        max_iterations = 100
+
+    def learn(self) -> CompiledDFA:
+        """Main learning loop. The returned CompiledDFA also reads like the classic DFA dict."""
+        max_iterations = self.max_iterations
         iteration = 0
+        self._last_checkpoint = None
         
         while iteration < max_iterations:
             iteration += 1
-            
+            if self.stats is not None:
+                self.stats.start_iteration(iteration)
+
             # Debug output
             self.debug_step(iteration)
+
+            if self.checkpoint_path is not None and self._checkpoint_due(iteration):
+                with self._phase('checkpoint'):
+                    start = perf_counter()
+                    self.checkpoint(self.checkpoint_path)
+                    end = perf_counter()
+                    self._last_checkpoint = (end, end - start)
             
             # Update table properties if needed
             table_counterexample = self._check_table_properties()
-            if table_counterexample:
+            if table_counterexample is not None:
                 logger.info(f"Table property violation found: {table_counterexample}")
                 continue
             
             # Construct and verify hypothesis
-            dfa = self._construct_dfa()
+            with self._phase('hypothesis'):
+                dfa = self._construct_dfa()
             counterexample = self._verify_hypothesis(dfa)
             
             if counterexample is None:
                 logger.info("Learning completed successfully!")
                 self.debug_step(iteration)
+                self._finish_stats()
                 return dfa
                 
             logger.info(f"Counterexample found: {counterexample}")
             self._add_counterexample_info(counterexample)
-            
+
+        self._finish_stats()
         raise Exception(f"Learning did not converge after {max_iterations} iterations")
             
     
@@ -285,42 +535,100 @@ class LStarLearner:
             alphabet: Set of symbols in the language
             examples: Dictionary with 'positive' and 'negative' example sets
             teacher: Oracle that can answer membership queries
-            strategy: Optional counterexample processing strategy
         """
-
-   
-        if not alphabet:
-            raise ValueError("Alphabet cannot be empty")
-        if not examples['positive'] and not examples['negative']:
-            raise ValueError("Must provide at least one example")
-            
-        self.alphabet = set(alphabet)
-        self.S = {''}
-        self.E = {''}
-        self.T = {}
-        self.teacher = teacher
-        self.positive_examples = set(examples['positive'])
-        self.negative_examples = set(examples['negative'])
-        self._signature_cache = {}
+        super().initialize(alphabet, examples, teacher)
+        self.S = {()}
+        self.E = {()}
+        self._table = PackedTable()
+        self._known = PackedTable()
+        self._succ = np.zeros((0, len(self.symbols)), dtype=np.int64)
+        self._rows = []
+        self._cols = []
+        self._row_to_idx = {}
+        self._e_to_idx = {}
+        self._s_rows = {}
+        self._row_nodes = {}
+        self.T = TableView(self.store, self._row_to_idx, self._e_to_idx)
         self._update_observation_table()
 
     
+    def checkpoint(self, path) -> None:
+        """Save the table, query store, examples and settings to a binary checkpoint."""
+        save_checkpoint(self, path)
+
+
+    @classmethod
+    def resume(cls, path, teacher, **kwargs) -> "LStarLearner":
+        """
+        Rebuild a learner from a checkpoint written by checkpoint().
+
+        Every membership answer in the checkpoint is reused, so learn()
+        carries on where the saved run stopped. The sections are copied
+        into the learner, so the file is not kept mapped. Keyword arguments go to the
+        constructor; the strategy and max_iterations default to the saved
+        ones when they were not a custom callable.
+        """
+        header, sections = load_checkpoint(path)
+        if header['strategy'] is not None:
+            kwargs.setdefault('strategy', CounterexampleStrategy[header['strategy']])
+        kwargs.setdefault('max_iterations', header['max_iterations'])
+        kwargs.setdefault('lazy', header['lazy'])
+        kwargs.setdefault('prefix_closed', header.get('prefix_closed', False))
+        learner = cls(**kwargs)
+
+        learner.alphabet = set(header['symbols'])
+        learner.symbols = SymbolTable(learner.alphabet)
+        learner.teacher = teacher
+        learner.positive_examples = set(header['positive'])
+        learner.negative_examples = set(header['negative'])
+        learner._init_examples(header.get('counterexamples', ()))
+        store = QueryStore.from_arrays(len(learner.symbols), sections['parent'],
+                                       sections['symbol'], sections['answers'])
+        learner.store = store
+
+        row_nodes = sections['rows'].tolist()
+        learner._rows = [store.word(node) for node in row_nodes]
+        learner._row_nodes = dict(zip(learner._rows, row_nodes))
+        learner._row_to_idx = {row: i for i, row in enumerate(learner._rows)}
+        learner._cols = [store.word(node) for node in sections['cols'].tolist()]
+        learner._e_to_idx = {e: i for i, e in enumerate(learner._cols)}
+        learner._s_rows = {learner._rows[i]: i for i in sections['s_rows'].tolist()}
+        learner.S = set(learner._s_rows)
+        learner.E = set(learner._cols)
+        learner.T = TableView(store, learner._row_to_idx, learner._e_to_idx)
+
+        n_rows, n_cols = header['shape']
+        learner._table = PackedTable.from_packed(sections['matrix'], n_cols)
+        if 'known' in sections:
+            learner._known = PackedTable.from_packed(sections['known'], n_cols)
+        elif learner.lazy:
+            # Saved by an eager learner: every cell is filled
+            learner._known = PackedTable.full(n_rows, n_cols)
+        learner._succ = np.zeros((0, len(learner.symbols)), dtype=np.int64)
+        learner._grow_table(n_rows, n_cols)
+        n_symbols = len(learner.symbols)
+        for s, idx in learner._s_rows.items():
+            learner._succ[idx] = [learner._row_to_idx[s + (a,)] for a in range(n_symbols)]
+        return learner
+
+
     def print_observation_table(self):
         """Log observation table with perfect box alignment and right padding."""
         # Get all prefixes and experiments
         s_rows = sorted(self.S)
         sa_rows = self._get_sa_rows()
         sorted_experiments = sorted(self.E)
+        labels = {w: self._decode(w) for w in s_rows + sa_rows + sorted_experiments}
         
         # Calculate column widths with padding
         prefix_width = max(
-            max((len(s) for s in s_rows + sa_rows), default=2),
+            max((len(labels[s]) for s in s_rows + sa_rows), default=2),
             len("Prefix")
         ) + 1  # Add 1 for right padding
         
         col_widths = {}
         for e in sorted_experiments:
-            e_display = e if e else "ε"
+            e_display = labels[e] if e else "ε"
             col_widths[e] = max(len(str(e_display)), len("False"), 5) + 1  # Add 1 for right padding
 
         # Build table
@@ -336,7 +644,7 @@ class LStarLearner:
         # Header
         header = "│" + "Prefix".ljust(prefix_width)
         for e in sorted_experiments:
-            e_display = e if e else "ε"
+            e_display = labels[e] if e else "ε"
             header += "│" + e_display.ljust(col_widths[e])
         header += "│"
         lines.append(header)
@@ -350,7 +658,7 @@ class LStarLearner:
         
         # S rows
         for s in s_rows:
-            row = "│" + (s if s else "ε").ljust(prefix_width)
+            row = "│" + (labels[s] if s else "ε").ljust(prefix_width)
             for e in sorted_experiments:
                 value = str(self.T.get((s, e), "?"))
                 row += "│" + value.ljust(col_widths[e])
@@ -363,7 +671,7 @@ class LStarLearner:
             
         # S·Σ rows
         for sa in sa_rows:
-            row = "│" + sa.ljust(prefix_width)
+            row = "│" + labels[sa].ljust(prefix_width)
             for e in sorted_experiments:
                 value = str(self.T.get((sa, e), "?"))
                 row += "│" + value.ljust(col_widths[e])
@@ -380,7 +688,7 @@ class LStarLearner:
         print("\nObservation Table:")
         print("\n".join(lines))
 
-        if self._matrix is not None:
-            print("\nMatrix shape:", self._matrix.shape)
+        if self._table.n_rows:
+            print("\nTable shape:", self._table.shape)
             print("S size:", len(self.S))
             print("E size:", len(self.E))
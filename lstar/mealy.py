@@ -0,0 +1,133 @@
+from collections.abc import Mapping
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class MealyMachine(Mapping):
+    """
+    Mealy machine with dense transition and output tables.
+
+    `delta` is a states x inputs int array; `outputs[q][a]` is the output
+    emitted when input a is read in state q. Outputs may be any hashable
+    values; they are interned so the output table is an int array as well
+    (`output_ids`, indexing `output_values`).
+
+    Like CompiledDFA the object is a read-only mapping in a dict format
+    with keys 'states', 'initial', 'transitions' ({(q, a): target}) and
+    'outputs' ({(q, a): output}).
+    """
+
+    _KEYS = ('states', 'initial', 'transitions', 'outputs')
+
+    def __init__(self, inputs: Sequence[str], delta, outputs, initial: int = 0):
+        self.inputs: List[str] = list(inputs)
+        self.symbol_index = {a: i for i, a in enumerate(self.inputs)}
+        self.delta = np.asarray(delta, dtype=np.int64).reshape(-1, len(self.inputs))
+        self.initial = int(initial)
+        self.n_states = len(self.delta)
+        self.output_values: List[Hashable] = []
+        index = {}
+        ids = np.zeros(self.delta.shape, dtype=np.int64)
+        for q, row in enumerate(outputs):
+            for a, value in enumerate(row):
+                if value not in index:
+                    index[value] = len(self.output_values)
+                    self.output_values.append(value)
+                ids[q, a] = index[value]
+        self.output_ids = ids
+        self._view = None
+
+    @classmethod
+    def from_dict(cls, mealy: dict, inputs: Optional[Sequence[str]] = None) -> "MealyMachine":
+        """Compile a complete Mealy machine given in the dict format."""
+        if isinstance(mealy, MealyMachine):
+            return mealy
+        if inputs is None:
+            inputs = {a for _, a in mealy['transitions']}
+        inputs = sorted(inputs)
+        n = mealy['states']
+        delta = [[mealy['transitions'][(q, a)] for a in inputs] for q in range(n)]
+        outputs = [[mealy['outputs'][(q, a)] for a in inputs] for q in range(n)]
+        return cls(inputs, delta, outputs, mealy['initial'])
+
+    # Dict view
+
+    def _dict_view(self) -> dict:
+        if self._view is None:
+            transitions, outputs = {}, {}
+            for q in range(self.n_states):
+                for a, symbol in enumerate(self.inputs):
+                    transitions[(q, symbol)] = int(self.delta[q, a])
+                    outputs[(q, symbol)] = self.output_values[self.output_ids[q, a]]
+            self._view = {'states': self.n_states, 'initial': self.initial,
+                          'transitions': transitions, 'outputs': outputs}
+        return self._view
+
+    def to_dict(self) -> dict:
+        return dict(self._dict_view())
+
+    def __getitem__(self, key):
+        return self._dict_view()[key]
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"MealyMachine(states={self.n_states}, inputs={self.inputs})"
+
+    # Running words
+
+    def encode(self, word) -> List[int]:
+        """Encode a space-separated string or token sequence; unknown inputs raise ValueError."""
+        tokens = word.split() if isinstance(word, str) else word
+        try:
+            return [self.symbol_index[token] for token in tokens]
+        except KeyError as err:
+            raise ValueError(f"Input {err.args[0]!r} is not in the alphabet") from None
+
+    def run_encoded(self, word: Sequence[int]) -> Tuple:
+        """Outputs for an encoded word, one per input."""
+        state = self.initial
+        outputs = []
+        for a in word:
+            outputs.append(self.output_values[self.output_ids[state, a]])
+            state = self.delta[state, a]
+        return tuple(outputs)
+
+    def run(self, word) -> Tuple:
+        """Outputs for a space-separated string or token sequence, one per input."""
+        return self.run_encoded(self.encode(word))
+
+
+def distinguishing_inputs(a: MealyMachine, b: MealyMachine) -> Optional[str]:
+    """
+    Shortest input word on which two Mealy machines produce different
+    outputs, by breadth-first search over the product; None if they are
+    equivalent. Both must have the same inputs.
+    """
+    if a.inputs != b.inputs:
+        raise ValueError(f"Different inputs: {a.inputs} and {b.inputs}")
+    start = (a.initial, b.initial)
+    back = {start: None}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for p, q in frontier:
+            for x, symbol in enumerate(a.inputs):
+                if a.output_values[a.output_ids[p, x]] != b.output_values[b.output_ids[q, x]]:
+                    word = [symbol]
+                    pair = (p, q)
+                    while back[pair] is not None:
+                        pair, previous = back[pair]
+                        word.append(previous)
+                    return ' '.join(reversed(word))
+                pair = (int(a.delta[p, x]), int(b.delta[q, x]))
+                if pair not in back:
+                    back[pair] = ((p, q), symbol)
+                    next_frontier.append(pair)
+        frontier = next_frontier
+    return None
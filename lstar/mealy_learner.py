@@ -0,0 +1,335 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Set, Tuple
+import logging
+from time import perf_counter
+
+import numpy as np
+
+from .base import BaseLearner
+from .mealy import MealyMachine
+from .query_store import QueryStore
+from .scheduler import prefix_tree_leaves
+from .utils import SymbolTable, Word
+
+logger = logging.getLogger(__name__)
+
+
+class MealyLearner(BaseLearner):
+    """
+    L* for Mealy machines (systems that emit one output per input).
+
+    An output query returns the outputs for a whole word, so one query
+    answers every prefix of it at once. Outputs are stored per query store
+    node (the output of the word's last input), so a table cell (s, e), the
+    outputs of suffix e after prefix s, is read off the last |e| nodes of
+    the path s·e, and only the words of a batch that are not a prefix of
+    another are asked.
+
+    The table is over S ∪ S·Σ rows and non-empty suffix columns, starting
+    with every single input, so the output of each transition is in the
+    table. Rows are stored as interned cell ids in an int matrix and
+    compared with np.unique. S rows are kept pairwise distinct, which makes
+    consistency hold by construction; counterexamples are processed
+    Shahbaz-Groz style by adding the suffixes of the part of the
+    counterexample after its longest prefix that is a table row.
+    """
+
+    def __init__(self, executor=None, max_iterations: int = 100, stats=None):
+        """
+        Args:
+            executor: Runs the output query batches, e.g. a ParallelExecutor.
+            max_iterations: Give up after this many learning iterations.
+            stats: A LearnerStats; output queries are counted as
+                membership queries.
+        """
+        super().__init__(executor, max_iterations, stats)
+        self.io_examples: Dict[str, Tuple] = {}
+        self._outputs: Dict[int, Hashable] = {}
+        self._cell_ids: Dict[Tuple, int] = {}
+        self._cell_values: List[Tuple] = []
+        self._cells = np.zeros((0, 0), dtype=np.int64)
+        self._succ = np.zeros((0, 0), dtype=np.int64)
+        self._rows: List[Word] = []
+        self._cols: List[Word] = []
+        self._row_to_idx: Dict[Word, int] = {}
+        self._e_to_idx: Dict[Word, int] = {}
+        self._s_rows: Dict[Word, int] = {}
+        self._hypothesis: Optional[MealyMachine] = None
+        self.S: Set[Word] = set()
+        self.E: Set[Word] = set()
+
+
+    # Output queries
+
+    def _query_outputs(self, nodes: list) -> None:
+        """
+        Ask for the outputs of the words of query store nodes. Only nodes
+        that are not a proper prefix of another are asked; every node on
+        the path of an asked word gets its output.
+        """
+        leaves = [n for n in prefix_tree_leaves(self.store, nodes) if n not in self._outputs]
+        if not leaves:
+            return
+        wanted = sum(1 for n in dict.fromkeys(nodes) if n and n not in self._outputs)
+        words = self.store.words(leaves)
+        strings = [self._decode(w) for w in words]
+        if self.stats is None:
+            answers = self.executor.output_queries(self.teacher, strings)
+        else:
+            start = perf_counter()
+            answers = self.executor.output_queries(self.teacher, strings)
+            self.stats.record_membership_batch(wanted, perf_counter() - start, len(strings))
+
+        for node, word, outputs in zip(leaves, words, answers):
+            if len(outputs) != len(word):
+                raise ValueError(f"output_query({self._decode(word)!r}) returned {len(outputs)} "
+                                 f"outputs, expected {len(word)}")
+            for output in reversed(outputs):
+                self._outputs[node] = output
+                node = self.store.parent(node)
+
+
+    def _outputs_of(self, word: Word) -> Tuple:
+        """Outputs for a word, asking the teacher if they are not known."""
+        node = self.store.node(word)
+        if node not in self._outputs and word:
+            self._query_outputs([node])
+        outputs = []
+        for _ in word:
+            outputs.append(self._outputs[node])
+            node = self.store.parent(node)
+        return tuple(reversed(outputs))
+
+
+    # Observation table
+
+    def _cell_id(self, outputs: Tuple) -> int:
+        cell = self._cell_ids.get(outputs)
+        if cell is None:
+            cell = self._cell_ids[outputs] = len(self._cell_values)
+            self._cell_values.append(outputs)
+        return cell
+
+
+    def _grow_table(self, n_rows: int, n_cols: int) -> None:
+        """Make room for n_rows x n_cols cells and successor rows, with amortized doubling."""
+        capacity, width = self._cells.shape
+        if n_rows > capacity or n_cols > width:
+            capacity = max(n_rows, 2 * capacity, 16) if n_rows > capacity else capacity
+            width = max(n_cols, 2 * width, 1) if n_cols > width else width
+            cells = np.zeros((capacity, width), dtype=np.int64)
+            cells[:len(self._cells), :self._cells.shape[1]] = self._cells
+            self._cells = cells
+            succ = np.full((capacity, len(self.symbols)), -1, dtype=np.int64)
+            succ[:len(self._succ)] = self._succ
+            self._succ = succ
+
+
+    def _update_observation_table(self) -> None:
+        """Append rows and columns for anything new in S, E or S·Σ and fill the new cells."""
+        with self._phase('table_fill'):
+            old_cols = list(self._cols)
+            new_cols = [e for e in sorted(self.E) if e not in self._e_to_idx]
+            for e in new_cols:
+                self._e_to_idx[e] = len(self._cols)
+                self._cols.append(e)
+
+            old_rows = list(self._rows)
+            new_rows = []
+
+            def add_row(row):
+                if row not in self._row_to_idx:
+                    self._row_to_idx[row] = len(self._rows)
+                    self._rows.append(row)
+                    new_rows.append(row)
+
+            new_s = sorted(s for s in self.S if s not in self._s_rows)
+            for s in new_s:
+                add_row(s)
+            for s in new_s:
+                for a in range(len(self.symbols)):
+                    add_row(s + (a,))
+
+            self._grow_table(len(self._rows), len(self._cols))
+            for s in new_s:
+                idx = self._row_to_idx[s]
+                self._s_rows[s] = idx
+                self._succ[idx] = [self._row_to_idx[s + (a,)] for a in range(len(self.symbols))]
+
+            cells = [(row, e) for row in old_rows for e in new_cols]
+            cells += [(row, e) for row in new_rows for e in old_cols + new_cols]
+            if not cells:
+                return
+            nodes = [self.store.node(row + e) for row, e in cells]
+            missing = [n for n in dict.fromkeys(nodes) if n not in self._outputs]
+            if self.stats is not None:
+                self.stats.store_hits += len(cells) - len(missing)
+            self._query_outputs(missing)
+
+            rows = [self._row_to_idx[row] for row, _ in cells]
+            cols = [self._e_to_idx[e] for _, e in cells]
+            ids = []
+            for (_, e), node in zip(cells, nodes):
+                outputs = []
+                for _ in e:
+                    outputs.append(self._outputs[node])
+                    node = self.store.parent(node)
+                ids.append(self._cell_id(tuple(reversed(outputs))))
+            self._cells[rows, cols] = ids
+
+
+    def _row_classes(self) -> np.ndarray:
+        """Class id of every table row; rows with equal cells share an id."""
+        cells = self._cells[:len(self._rows), :len(self._cols)]
+        _, classes = np.unique(cells, axis=0, return_inverse=True)
+        return classes.ravel()
+
+
+    def _s_indices(self) -> np.ndarray:
+        return np.fromiter(self._s_rows.values(), dtype=np.int64, count=len(self._s_rows))
+
+
+    def _close(self) -> bool:
+        """
+        Move one row of every S·Σ class missing from S into S.
+        Returns True if the table was already closed.
+        """
+        with self._phase('closedness'):
+            classes = self._row_classes()
+            s_classes = set(classes[self._s_indices()].tolist())
+            unclosed = {}
+            for idx, cls in enumerate(classes.tolist()):
+                if cls not in s_classes and cls not in unclosed:
+                    unclosed[cls] = self._rows[idx]
+            self.S.update(unclosed.values())
+        if unclosed:
+            self._update_observation_table()
+        return not unclosed
+
+
+    def _construct_hypothesis(self) -> MealyMachine:
+        """One state per S row (they are pairwise distinct); outputs from the single-input columns."""
+        classes = self._row_classes()
+        s_idx = self._s_indices()
+        class_to_state = np.full(classes.max() + 1, -1, dtype=np.int64)
+        class_to_state[classes[s_idx]] = np.arange(len(s_idx))
+        delta = class_to_state[classes[self._succ[s_idx]]]
+        single = [self._e_to_idx[(a,)] for a in range(len(self.symbols))]
+        outputs = [[self._cell_values[cell][0] for cell in row]
+                   for row in self._cells[np.ix_(s_idx, single)].tolist()]
+        initial = class_to_state[classes[self._row_to_idx[()]]]
+        self._hypothesis = MealyMachine(self.symbols.symbols, delta, outputs, initial)
+        return self._hypothesis
+
+
+    def _add_counterexample_info(self, counterexample: str) -> None:
+        """
+        Shahbaz-Groz: strip the longest prefix of the counterexample that is
+        a table row and add every suffix of the rest to E.
+        """
+        word = self._encode(counterexample)
+        with self._phase('counterexample'):
+            split = max(i for i in range(len(word) + 1) if word[:i] in self._row_to_idx)
+            suffixes = {word[i:] for i in range(split, len(word))}
+            if suffixes <= self.E:
+                suffixes = {word[i:] for i in range(len(word))}
+            self.E.update(suffixes)
+            self._update_observation_table()
+
+
+    # Verification
+
+    def _check_examples(self, mealy: MealyMachine) -> Optional[str]:
+        """Return the first known input/output example the hypothesis gets wrong, if any."""
+        for string in sorted(self.io_examples):
+            if mealy.run(string) != self.io_examples[string]:
+                return string
+        return None
+
+
+    def _verify_hypothesis(self, mealy: MealyMachine) -> Optional[str]:
+        """Check the hypothesis against examples and past counterexamples, then ask the teacher."""
+        with self._phase('verification'):
+            example = self._check_examples(mealy)
+            if example is not None:
+                return example
+            if self.stats is None:
+                counterexample = self.teacher.equivalence_query(mealy)
+            else:
+                start = perf_counter()
+                counterexample = self.teacher.equivalence_query(mealy)
+                self.stats.record_equivalence_query(perf_counter() - start)
+            if counterexample is not None:
+                outputs = self._outputs_of(self._encode(counterexample))
+                if outputs == mealy.run(counterexample):
+                    raise Exception(f"Invalid counterexample {counterexample}: "
+                                    f"hypothesis and oracle agree")
+                self.io_examples[counterexample] = outputs
+            return counterexample
+
+
+    def learn(self) -> MealyMachine:
+        """Main learning loop."""
+        for iteration in range(1, self.max_iterations + 1):
+            if self.stats is not None:
+                self.stats.start_iteration(iteration)
+            if not self._close():
+                continue
+            with self._phase('hypothesis'):
+                mealy = self._construct_hypothesis()
+            logger.debug(f"Iteration {iteration}: {mealy.n_states} states")
+            counterexample = self._verify_hypothesis(mealy)
+            if counterexample is None:
+                self._finish_stats()
+                return mealy
+            logger.info(f"Counterexample found: {counterexample}")
+            self._add_counterexample_info(counterexample)
+
+        self._finish_stats()
+        raise Exception(f"Learning did not converge after {self.max_iterations} iterations")
+
+
+    def initialize(self, alphabet: Set[str], examples: Optional[Dict[str, Sequence]],
+                   teacher) -> None:
+        """
+        Initialize the learner.
+
+        Args:
+            alphabet: Set of input symbols
+            examples: {input word: expected outputs} pairs every hypothesis
+                is checked against before an equivalence query, or None
+            teacher: MealyOracle answering output and equivalence queries
+        """
+        if not alphabet:
+            raise ValueError("Alphabet cannot be empty")
+        self.alphabet = set(alphabet)
+        self.symbols = SymbolTable(self.alphabet)
+        self.teacher = teacher
+        self.io_examples = {string: tuple(outputs) for string, outputs in (examples or {}).items()}
+        self.store = QueryStore(len(self.symbols))
+        if self.stats is not None:
+            self.stats.start()
+        self._outputs = {}
+        self._cell_ids = {}
+        self._cell_values = []
+        self._cells = np.zeros((0, 0), dtype=np.int64)
+        self._succ = np.zeros((0, len(self.symbols)), dtype=np.int64)
+        self._rows = []
+        self._cols = []
+        self._row_to_idx = {}
+        self._e_to_idx = {}
+        self._s_rows = {}
+        self._hypothesis = None
+        self.S = {()}
+        self.E = {(a,) for a in range(len(self.symbols))}
+        self._update_observation_table()
+
+
+    def print_observation_table(self):
+        """Print the observation table, cells as output tuples."""
+        print("\nObservation Table:")
+        print(f"S = {sorted(self._decode(s) for s in self.S)}")
+        print(f"E = {[self._decode(e) for e in self._cols]}")
+        for row in self._rows:
+            marker = '*' if row in self._s_rows else ' '
+            cells = [self._cell_values[c] for c in self._cells[self._row_to_idx[row], :len(self._cols)]]
+            print(f"{marker} {self._decode(row) or 'ε':<20} {cells}")
@@ -0,0 +1,230 @@
+"""
+Learner instrumentation: query counters, phase timers and latency histograms.
+
+Pass a LearnerStats to a learner to collect them. Without one the learner
+only pays a None check per batch and a no-op context manager per phase.
+"""
+import json
+import math
+from contextlib import nullcontext
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+NO_PHASE = nullcontext()
+
+PHASES = ('table_fill', 'closedness', 'consistency', 'hypothesis', 'verification',
+          'counterexample', 'checkpoint')
+
+
+class LatencyHistogram:
+    """
+    Latency distribution in power-of-two buckets from 1 microsecond up.
+
+    Bucket i counts samples in [2**(i-1), 2**i) microseconds (bucket 0 is
+    everything below 1 microsecond), so percentiles are exact to a factor
+    of two while recording stays O(1).
+    """
+
+    N_BUCKETS = 40
+
+    def __init__(self):
+        self.buckets = [0] * self.N_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        micros = seconds * 1e6
+        bucket = 0 if micros < 1 else min(int(math.log2(micros)) + 1, self.N_BUCKETS - 1)
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """Upper bound (seconds) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(2.0 ** i / 1e6, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        last = max((i for i, n in enumerate(self.buckets) if n), default=-1)
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'bucket_upper_us': [2 ** i for i in range(last + 1)],
+            'buckets': self.buckets[:last + 1],
+        }
+
+
+class _PhaseTimer:
+    """Times one phase; time spent in nested phases is charged to them only."""
+    __slots__ = ('stats', 'name', 'start', 'nested')
+
+    def __init__(self, stats: "LearnerStats", name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.nested = 0.0
+        self.stats._stack.append(self)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = perf_counter() - self.start
+        stack = self.stats._stack
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+        self.stats._add_phase_time(self.name, elapsed - self.nested)
+
+
+class LearnerStats:
+    """
+    Counters and timers for one learning run.
+
+    Counts the words whose membership the teacher was asked for (the same
+    in every query mode) and the batches, the calls that took to the
+    oracle (one per word, per prefix or output query, or per session
+    reset), lookups answered from the query store instead, extra answers
+    harvested from prefix queries or inferred from prefix closure, resets
+    and steps of session oracles (and the resets saved over one session
+    per word), and equivalence queries;
+    keeps exclusive wall time per phase, overall and per iteration, and
+    latency histograms with one sample per membership batch (not per
+    word) and per equivalence query.
+
+    Callbacks registered with on_iteration() are called with each finished
+    iteration's record. to_dict()/dump() give the whole profile as JSON.
+    """
+
+    def __init__(self):
+        self.membership_queries = 0
+        self.membership_batches = 0
+        self.oracle_calls = 0
+        self.store_hits = 0
+        self.prefix_answers = 0
+        self.inferred_answers = 0
+        self.resets = 0
+        self.resets_saved = 0
+        self.session_steps = 0
+        self.equivalence_queries = 0
+        self.phase_times: Dict[str, float] = {name: 0.0 for name in PHASES}
+        # One sample per batch, however many words it holds
+        self.membership_latency = LatencyHistogram()
+        self.equivalence_latency = LatencyHistogram()
+        self.iterations: List[dict] = []
+        self.extra: Dict[str, object] = {}
+        self._callbacks: List[Callable[[dict], None]] = []
+        self._stack: List[_PhaseTimer] = []
+        self._current: Optional[dict] = None
+        self._started: Optional[float] = None
+        self.wall_time = 0.0
+
+    def on_iteration(self, callback: Callable[[dict], None]) -> None:
+        """Call callback(record) whenever an iteration finishes."""
+        self._callbacks.append(callback)
+
+    def phase(self, name: str) -> _PhaseTimer:
+        return _PhaseTimer(self, name)
+
+    def _add_phase_time(self, name: str, seconds: float) -> None:
+        self.phase_times[name] = self.phase_times.get(name, 0.0) + seconds
+        if self._current is not None:
+            phases = self._current['phases']
+            phases[name] = phases.get(name, 0.0) + seconds
+
+    def record_membership_batch(self, n_words: int, seconds: float,
+                                n_calls: Optional[int] = None) -> None:
+        """Add a batch of n_words words answered in n_calls oracle calls (default n_words)."""
+        self.membership_queries += n_words
+        self.oracle_calls += n_words if n_calls is None else n_calls
+        self.membership_batches += 1
+        self.membership_latency.record(seconds)
+        if self._current is not None:
+            self._current['membership_queries'] += n_words
+
+    def record_sessions(self, run) -> None:
+        """Add the cost of a batch run as oracle sessions (a scheduler.SessionRun)."""
+        self.resets += run.resets
+        self.resets_saved += run.resets_saved
+        self.session_steps += run.steps
+
+    def record_equivalence_query(self, seconds: float) -> None:
+        self.equivalence_queries += 1
+        self.equivalence_latency.record(seconds)
+
+    def start(self) -> None:
+        """Mark the start of a run; wall_time is measured from here."""
+        self._started = perf_counter()
+
+    def start_iteration(self, iteration: int) -> None:
+        """Close the previous iteration's record and open a new one."""
+        now = perf_counter()
+        if self._started is None:
+            self._started = now
+        self._close_iteration(now)
+        self._current = {'iteration': iteration, 'start': now, 'membership_queries': 0,
+                         'phases': {}}
+
+    def finish(self) -> None:
+        """Close the last iteration at the end of a run."""
+        now = perf_counter()
+        self._close_iteration(now)
+        if self._started is not None:
+            self.wall_time = now - self._started
+
+    def _close_iteration(self, now: float) -> None:
+        record, self._current = self._current, None
+        if record is None:
+            return
+        record['time'] = now - record.pop('start')
+        self.iterations.append(record)
+        for callback in self._callbacks:
+            callback(record)
+
+    def to_dict(self) -> dict:
+        lookups = self.store_hits + self.membership_queries
+        return {
+            'wall_time': self.wall_time,
+            'membership_queries': self.membership_queries,
+            'membership_batches': self.membership_batches,
+            'oracle_calls': self.oracle_calls,
+            'store_hits': self.store_hits,
+            'store_hit_rate': self.store_hits / lookups if lookups else 0.0,
+            'prefix_answers': self.prefix_answers,
+            'inferred_answers': self.inferred_answers,
+            'resets': self.resets,
+            'resets_saved': self.resets_saved,
+            'session_steps': self.session_steps,
+            'equivalence_queries': self.equivalence_queries,
+            'phase_times': dict(self.phase_times),
+            'membership_latency': self.membership_latency.to_dict(),
+            'equivalence_latency': self.equivalence_latency.to_dict(),
+            'iterations': list(self.iterations),
+            **self.extra,
+        }
+
+    def dump(self, path) -> None:
+        """Write the profile as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
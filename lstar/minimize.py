@@ -0,0 +1,181 @@
+"""
+DFA minimization, canonical numbering and equivalence checking.
+
+All functions accept a CompiledDFA or a DFA in the dict format. Two DFAs
+are only comparable over the same alphabet; dict DFAs are compiled over
+the union of their symbols, so a symbol missing from one of them leads to
+its rejecting sink.
+"""
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .dfa import CompiledDFA
+from .utils import Word
+
+
+def _compile_pair(a, b) -> Tuple[CompiledDFA, CompiledDFA]:
+    if not isinstance(a, CompiledDFA) or not isinstance(b, CompiledDFA):
+        symbols = set()
+        for dfa in (a, b):
+            if isinstance(dfa, CompiledDFA):
+                symbols.update(dfa.symbols)
+            else:
+                symbols.update(symbol for _, symbol in dfa['transitions'])
+        a = CompiledDFA.from_dict(a, symbols) if not isinstance(a, CompiledDFA) else a
+        b = CompiledDFA.from_dict(b, symbols) if not isinstance(b, CompiledDFA) else b
+    if a.symbols != b.symbols:
+        raise ValueError(f"DFAs have different alphabets: {a.symbols} vs {b.symbols}")
+    return a, b
+
+
+def reachable_states(dfa: CompiledDFA) -> List[int]:
+    """States reachable from the initial state, in BFS order over symbols."""
+    order = [dfa.initial]
+    seen = {dfa.initial}
+    table = dfa.delta.tolist()
+    for state in order:
+        for target in table[state]:
+            if target not in seen:
+                seen.add(target)
+                order.append(target)
+    return order
+
+
+def canonicalize(dfa) -> CompiledDFA:
+    """
+    Renumber states in BFS order from the initial state, symbols in sorted
+    order, dropping unreachable states. Isomorphic DFAs get identical
+    delta and accepting arrays, and the initial state is always 0.
+    """
+    dfa = CompiledDFA.from_dict(dfa)
+    order = reachable_states(dfa)
+    renumber = np.full(len(dfa.delta), -1, dtype=np.int64)
+    renumber[order] = np.arange(len(order))
+    delta = renumber[dfa.delta[order]]
+    return CompiledDFA(dfa.symbols, delta, dfa.accepting_mask[order], 0)
+
+
+def minimize(dfa) -> CompiledDFA:
+    """
+    Minimal, canonically numbered DFA for the same language (Hopcroft).
+
+    Partition refinement over the reachable states in O(n k log n): the
+    splitter worklist only keeps the smaller half of every split block.
+    """
+    dfa = canonicalize(dfa)
+    n_states, n_symbols = dfa.delta.shape
+    predecessors = [[[] for _ in range(n_states)] for _ in range(n_symbols)]
+    for q, row in enumerate(dfa.delta.tolist()):
+        for a, target in enumerate(row):
+            predecessors[a][target].append(q)
+
+    accepting = set(np.flatnonzero(dfa.accepting_mask).tolist())
+    rejecting = set(range(n_states)) - accepting
+    blocks = [block for block in (accepting, rejecting) if block]
+    block_of = [0] * n_states
+    for i, block in enumerate(blocks):
+        for q in block:
+            block_of[q] = i
+
+    worklist = deque((min(range(len(blocks)), key=lambda i: len(blocks[i])), a)
+                     for a in range(n_symbols)) if len(blocks) == 2 else deque()
+    while worklist:
+        splitter, a = worklist.popleft()
+        # States with an a-transition into the splitter, grouped by their block
+        touched = {}
+        for target in list(blocks[splitter]):
+            for q in predecessors[a][target]:
+                touched.setdefault(block_of[q], set()).add(q)
+        for i, inside in touched.items():
+            block = blocks[i]
+            if len(inside) == len(block):
+                continue
+            outside = block - inside
+            small, large = (inside, outside) if len(inside) <= len(outside) else (outside, inside)
+            blocks[i] = large
+            new = len(blocks)
+            blocks.append(small)
+            for q in small:
+                block_of[q] = new
+            for b in range(n_symbols):
+                worklist.append((new, b))
+
+    block_of = np.asarray(block_of, dtype=np.int64)
+    representatives = np.asarray([min(block) for block in blocks], dtype=np.int64)
+    delta = block_of[dfa.delta[representatives]]
+    quotient = CompiledDFA(dfa.symbols, delta, dfa.accepting_mask[representatives],
+                           int(block_of[dfa.initial]))
+    return canonicalize(quotient)
+
+
+def canonical_key(dfa) -> Tuple:
+    """
+    Hashable key of the minimal DFA: two DFAs over the same alphabet have
+    equal keys iff they accept the same language.
+    """
+    minimal = minimize(dfa)
+    return (tuple(minimal.symbols), minimal.delta.tobytes(), minimal.accepting_mask.tobytes())
+
+
+def distinguishing_word(a, b) -> Optional[Word]:
+    """
+    Shortest encoded word accepted by exactly one of a and b, or None if
+    they are equivalent.
+
+    Hopcroft–Karp: states of both DFAs live in one union-find structure and
+    pairs reached by the same word are merged, breadth first, so a pair is
+    only expanded if its states were not already known to be equivalent.
+    This takes near-linear time; since pairs are explored in order of the
+    word reaching them, the first pair with different acceptance gives a
+    shortest distinguishing word.
+    """
+    a, b = _compile_pair(a, b)
+    offset = len(a.delta)
+    table_a, table_b = a.delta.tolist(), b.delta.tolist()
+    accept_a, accept_b = a.accepting_mask.tolist(), b.accepting_mask.tolist()
+    parent = list(range(offset + len(b.delta)))
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    # Queue entries are (state of a, state of b, node); node points into
+    # `trail`, whose (parent node, symbol) entries spell the word reaching them
+    trail: List[Tuple[int, int]] = [(-1, -1)]
+    queue = deque([(a.initial, b.initial, 0)])
+    parent[find(a.initial)] = find(b.initial + offset)
+    while queue:
+        p, q, node = queue.popleft()
+        if accept_a[p] != accept_b[q]:
+            symbols = []
+            while node > 0:
+                node, symbol = trail[node]
+                symbols.append(symbol)
+            return tuple(reversed(symbols))
+        row_a, row_b = table_a[p], table_b[q]
+        for symbol in range(len(row_a)):
+            p2, q2 = row_a[symbol], row_b[symbol]
+            root_p, root_q = find(p2), find(q2 + offset)
+            if root_p != root_q:
+                parent[root_p] = root_q
+                trail.append((node, symbol))
+                queue.append((p2, q2, len(trail) - 1))
+    return None
+
+
+def equivalent(a, b) -> bool:
+    """Whether two DFAs accept the same language."""
+    return distinguishing_word(a, b) is None
+
+
+def distinguishing_string(a, b) -> Optional[str]:
+    """Shortest space-separated string accepted by exactly one of a and b, or None."""
+    a, b = _compile_pair(a, b)
+    word = distinguishing_word(a, b)
+    return None if word is None else ' '.join(a.symbols[symbol] for symbol in word)
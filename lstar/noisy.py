@@ -0,0 +1,183 @@
+import logging
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .oracle import Oracle
+from .utils import run_dfa
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NoisyStats:
+    """Counters for a NoisyOracle."""
+    words: int = 0
+    queries: int = 0
+    hits: int = 0
+    undecided: int = 0
+    spurious_counterexamples: int = 0
+
+    @property
+    def queries_per_word(self) -> float:
+        if not self.words:
+            return 0.0
+        return self.queries / self.words
+
+
+class NoisyOracle(Oracle):
+    """
+    Adaptive repeated membership queries for a noisy or flaky system.
+
+    Every answer of the wrapped oracle is a vote, and each word's votes
+    give the log-likelihood ratio of "accepted" against "rejected" under
+    the given false accept and false reject rates. A word is decided once
+    that ratio puts the posterior of its answer at `confidence` or above
+    (Wald's sequential probability ratio test with a flat prior), so a
+    word answered the same way every time costs a couple of queries and
+    only words whose answers conflict are asked again, up to
+    `max_repeats` times. A one-sided error rate of 0 makes a single vote
+    the other way conclusive.
+
+    A batch is asked in rounds: every undecided word once per round, as
+    one batch of the wrapped oracle. Votes are kept, so a decided word is
+    never asked again. Words still undecided after max_repeats votes take
+    the side their votes lean to, rejection on a tie, and are counted in
+    stats.undecided.
+
+    Equivalence queries are forwarded, and a counterexample is checked
+    with a decided membership query before it is returned; one the
+    hypothesis gets right after all is dropped and the wrapped oracle is
+    asked again, at most `max_equivalence_retries` times.
+
+    Wrap the system itself: a CachedOracle around the system would freeze
+    its first answers (put the cache around the NoisyOracle instead).
+    """
+
+    def __init__(self, oracle: Oracle, error_rate: float = 0.1, confidence: float = 0.99,
+                 max_repeats: int = 15, false_accept_rate: Optional[float] = None,
+                 false_reject_rate: Optional[float] = None, max_equivalence_retries: int = 3):
+        """
+        Args:
+            oracle: The noisy system.
+            error_rate: Chance that an answer is wrong, either way.
+            confidence: Posterior probability a word's answer must reach.
+            max_repeats: Most votes asked for one word.
+            false_accept_rate: Chance that a rejected word is answered as
+                accepted; defaults to error_rate.
+            false_reject_rate: Chance that an accepted word is answered as
+                rejected; defaults to error_rate.
+            max_equivalence_retries: Equivalence queries asked again after
+                a spurious counterexample before the hypothesis is accepted.
+        """
+        false_accept_rate = error_rate if false_accept_rate is None else false_accept_rate
+        false_reject_rate = error_rate if false_reject_rate is None else false_reject_rate
+        for name, rate in (('false_accept_rate', false_accept_rate),
+                           ('false_reject_rate', false_reject_rate)):
+            if not 0 <= rate < 0.5:
+                raise ValueError(f"{name} must be in [0, 0.5)")
+        if not 0.5 < confidence < 1:
+            raise ValueError("confidence must be in (0.5, 1)")
+        if max_repeats < 1:
+            raise ValueError("max_repeats must be at least 1")
+        self.oracle = oracle
+        self.confidence = confidence
+        self.max_repeats = max_repeats
+        self.max_equivalence_retries = max_equivalence_retries
+        self.stats = NoisyStats()
+        # Evidence for "accepted" of one accept vote, and for "rejected" of one reject vote
+        self._accept_weight = math.log((1 - false_reject_rate) / false_accept_rate) \
+            if false_accept_rate else math.inf
+        self._reject_weight = math.log((1 - false_accept_rate) / false_reject_rate) \
+            if false_reject_rate else math.inf
+        self._threshold = math.log(confidence / (1 - confidence))
+        self._votes: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def _key(string: str) -> str:
+        """Normalize a word to its token sequence."""
+        return ' '.join(string.split())
+
+    def _log_odds(self, votes: List[int]) -> float:
+        """Log-likelihood ratio of accepted against rejected; nan on conclusive votes both ways."""
+        accepts, rejects = votes
+        log_odds = 0.0
+        if accepts:
+            log_odds += accepts * self._accept_weight
+        if rejects:
+            log_odds -= rejects * self._reject_weight
+        return log_odds
+
+    def _confident(self, votes: List[int]) -> bool:
+        log_odds = self._log_odds(votes)
+        return not math.isnan(log_odds) and abs(log_odds) >= self._threshold
+
+    def _decided(self, votes: List[int]) -> bool:
+        return self._confident(votes) or sum(votes) >= self.max_repeats
+
+    def votes(self, string: str) -> Tuple[int, int]:
+        """Accept and reject votes a word has had so far."""
+        accepts, rejects = self._votes.get(self._key(string), (0, 0))
+        return accepts, rejects
+
+    def confidence_of(self, string: str) -> float:
+        """Posterior probability of the word's current answer; 0.5 if it was never asked."""
+        log_odds = self._log_odds(list(self.votes(string)))
+        if math.isnan(log_odds):
+            return 0.5
+        return 1 / (1 + math.exp(-abs(log_odds)))
+
+    def uncertain_words(self) -> List[str]:
+        """Words answered without reaching the target confidence."""
+        return [key for key, votes in self._votes.items()
+                if sum(votes) and not self._confident(votes)]
+
+    def _answer(self, votes: List[int]) -> bool:
+        return self._log_odds(votes) > 0
+
+    def membership_query(self, string):
+        return self.membership_queries([string])[0]
+
+    def membership_queries(self, strings):
+        """Answer a batch, asking its undecided words in rounds until each is decided."""
+        keys = [self._key(string) for string in strings]
+        pending = []
+        for key in dict.fromkeys(keys):
+            votes = self._votes.get(key)
+            if votes is None:
+                self._votes[key] = [0, 0]
+                self.stats.words += 1
+                pending.append(key)
+            elif self._decided(votes):
+                self.stats.hits += 1
+            else:
+                pending.append(key)
+
+        while pending:
+            self.stats.queries += len(pending)
+            for key, accepted in zip(pending, self.oracle.membership_queries(pending)):
+                self._votes[key][0 if accepted else 1] += 1
+            undecided = []
+            for key in pending:
+                votes = self._votes[key]
+                if self._confident(votes):
+                    continue
+                if sum(votes) < self.max_repeats:
+                    undecided.append(key)
+                else:
+                    self.stats.undecided += 1
+                    logger.warning(f"{key!r} still uncertain after {sum(votes)} votes "
+                                   f"(confidence {self.confidence_of(key):.3f})")
+            pending = undecided
+        return [self._answer(self._votes[key]) for key in keys]
+
+    def equivalence_query(self, dfa):
+        for _ in range(self.max_equivalence_retries + 1):
+            counterexample = self.oracle.equivalence_query(dfa)
+            if counterexample is None:
+                return None
+            if self.membership_query(counterexample) != run_dfa(dfa, counterexample):
+                return counterexample
+            self.stats.spurious_counterexamples += 1
+            logger.info(f"Dropping spurious counterexample {counterexample!r}")
+        return None
@@ -1,7 +1,94 @@
+from typing import List, Sequence
+
 
 class Oracle:
     def membership_query(self, string):
         raise NotImplementedError("Oracle must implement membership_query()")
+
+    def membership_queries(self, strings: Sequence[str]) -> List[bool]:
+        """
+        Answer a batch of membership queries, in order.
+
+        The default asks membership_query() once per word; oracles that can
+        amortize per-call overhead should override it.
+        """
+        return [self.membership_query(string) for string in strings]
+    
+    def prefix_query(self, string) -> List[bool]:
+        """
+        Optional: acceptance of every prefix of a word, from the empty word
+        up to the word itself (len + 1 answers).
+
+        Oracles that run a word symbol by symbol know these for free; when
+        one implements this, learners fill every table cell whose word is a
+        prefix of a query from that single query (see supports_prefix_queries).
+        """
+        raise NotImplementedError("Oracle does not implement prefix_query()")
+
+    def prefix_queries(self, strings: Sequence[str]) -> List[List[bool]]:
+        """Answer a batch of prefix queries, in order."""
+        return [self.prefix_query(string) for string in strings]
+
+    def reset(self) -> bool:
+        """
+        Optional session API: put the system back in its initial state and
+        return whether the empty word is accepted.
+
+        Together with step() this lets learners run a batch of queries as
+        a few sessions along a prefix tree (see supports_sessions).
+        """
+        raise NotImplementedError("Oracle does not implement reset()")
+
+    def step(self, symbol: str) -> bool:
+        """Optional session API: feed one symbol and return whether the word so far is accepted."""
+        raise NotImplementedError("Oracle does not implement step()")
     
     def equivalence_query(self, dfa):
         raise NotImplementedError("Oracle must implement equivalence_query()")
+
+
+class AsyncOracle:
+    """Oracle contract for natively asynchronous systems, used by AsyncLStarLearner."""
+
+    async def membership_query(self, string):
+        raise NotImplementedError("AsyncOracle must implement membership_query()")
+
+    async def equivalence_query(self, dfa):
+        raise NotImplementedError("AsyncOracle must implement equivalence_query()")
+
+
+class MealyOracle:
+    """Oracle contract for systems with one output per input, used by MealyLearner."""
+
+    def output_query(self, string) -> Sequence:
+        """The outputs the system produces for a word, one per input."""
+        raise NotImplementedError("MealyOracle must implement output_query()")
+
+    def output_queries(self, strings: Sequence[str]) -> List[Sequence]:
+        """Answer a batch of output queries, in order."""
+        return [self.output_query(string) for string in strings]
+
+    def equivalence_query(self, mealy):
+        """An input word on which the hypothesis' outputs are wrong, or None."""
+        raise NotImplementedError("MealyOracle must implement equivalence_query()")
+
+
+def _forwarding(oracle) -> bool:
+    """True for wrappers whose optional query methods forward to their `oracle`."""
+    return getattr(type(oracle), 'forwards_optional_queries', False)
+
+
+def supports_prefix_queries(oracle) -> bool:
+    """True if the oracle overrides Oracle.prefix_query (or forwards it to one that does)."""
+    if _forwarding(oracle):
+        return supports_prefix_queries(oracle.oracle)
+    method = getattr(type(oracle), 'prefix_query', None)
+    return method is not None and method is not Oracle.prefix_query
+
+
+def supports_sessions(oracle) -> bool:
+    """True if the oracle overrides both Oracle.reset and Oracle.step (or forwards them)."""
+    if _forwarding(oracle):
+        return supports_sessions(oracle.oracle)
+    return all(getattr(type(oracle), name, None) not in (None, getattr(Oracle, name))
+               for name in ('reset', 'step'))
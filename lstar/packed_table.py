@@ -0,0 +1,133 @@
+from typing import Sequence
+
+import numpy as np
+
+_ONE = np.uint64(1)
+
+
+class PackedTable:
+    """
+    Bit-packed boolean matrix holding the observation table cells.
+
+    Row r is a run of uint64 words; column c lives in bit c % 64 of word
+    c // 64. Rows and columns are appended by growing a capacity that
+    doubles, so adding one row or one column is amortized O(1) words per
+    row instead of a full reallocation. Unused bits are always zero, which
+    makes the packed words of a row a canonical signature of its cells.
+
+    A 100k x 1k table takes 100k * 16 * 8 bytes = 12.8 MB. The words behind
+    the cells live in the learner's QueryStore, at 14 to 30 bytes each.
+    """
+
+    def __init__(self, n_rows: int = 0, n_cols: int = 0):
+        self.n_rows = 0
+        self.n_cols = 0
+        self.words = np.zeros((0, 0), dtype=np.uint64)
+        self.grow(n_rows, n_cols)
+
+    @staticmethod
+    def n_words(n_cols: int) -> int:
+        return (n_cols + 63) >> 6
+
+    @property
+    def shape(self):
+        return self.n_rows, self.n_cols
+
+    def grow(self, n_rows: int, n_cols: int) -> None:
+        """Make room for at least n_rows x n_cols cells; new cells are False."""
+        row_capacity, word_capacity = self.words.shape
+        need_words = self.n_words(n_cols)
+        if n_rows > row_capacity or need_words > word_capacity:
+            if n_rows > row_capacity:
+                row_capacity = max(n_rows, 2 * row_capacity, 16)
+            if need_words > word_capacity:
+                word_capacity = max(need_words, 2 * word_capacity, 1)
+            grown = np.zeros((row_capacity, word_capacity), dtype=np.uint64)
+            old_rows, old_words = self.words.shape
+            grown[:old_rows, :old_words] = self.words
+            self.words = grown
+        self.n_rows = max(self.n_rows, n_rows)
+        self.n_cols = max(self.n_cols, n_cols)
+
+    def set_cells(self, rows: Sequence[int], cols: Sequence[int], values: Sequence[bool]) -> None:
+        """Set a batch of cells."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=bool)
+        word = cols >> 6
+        bit = _ONE << (cols & 63).astype(np.uint64)
+        np.bitwise_or.at(self.words, (rows[values], word[values]), bit[values])
+        clear = ~values
+        if clear.any():
+            np.bitwise_and.at(self.words, (rows[clear], word[clear]), ~bit[clear])
+
+    def get(self, row: int, col: int) -> bool:
+        return bool((int(self.words[row, col >> 6]) >> (col & 63)) & 1)
+
+    def column(self, rows: Sequence[int], col: int) -> np.ndarray:
+        """Values of one column for the given rows."""
+        words = self.words[np.asarray(rows, dtype=np.int64), col >> 6]
+        return ((words >> np.uint64(col & 63)) & _ONE).astype(bool)
+
+    def row(self, row: int, start: int = 0, stop: int = None) -> np.ndarray:
+        """Cells of a row as a bool array, from column start to stop."""
+        stop = self.n_cols if stop is None else stop
+        return self.unpack([row], stop)[0, start:stop]
+
+    def unpack(self, rows: Sequence[int] = None, n_cols: int = None) -> np.ndarray:
+        """Unpack rows (all by default) to a bool matrix of n_cols columns."""
+        n_cols = self.n_cols if n_cols is None else n_cols
+        words = self.words[:self.n_rows] if rows is None else self.words[np.asarray(rows, dtype=np.int64)]
+        words = np.ascontiguousarray(words[:, :self.n_words(n_cols)]).astype('<u8')
+        bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder='little')
+        return bits[:, :n_cols].astype(bool)
+
+    def signatures(self, n_rows: int = None) -> np.ndarray:
+        """One hashable, comparable packed-bytes key per row (numpy void scalars)."""
+        n_rows = self.n_rows if n_rows is None else n_rows
+        packed = np.ascontiguousarray(self.words[:n_rows, :self.n_words(self.n_cols)])
+        return packed.view(np.dtype((np.void, packed.shape[1] * 8))).ravel()
+
+    def signature(self, row: int) -> bytes:
+        """Packed-bytes signature of one row."""
+        return self.words[row, :self.n_words(self.n_cols)].tobytes()
+
+    def first_difference(self, r1: int, r2: int, mask: "PackedTable" = None) -> int:
+        """
+        Lowest column where two rows differ, or -1 if they are equal.
+
+        With a mask only columns set in both rows of the mask count.
+        """
+        n_words = self.n_words(self.n_cols)
+        diff = self.words[r1, :n_words] ^ self.words[r2, :n_words]
+        if mask is not None:
+            diff &= mask.words[r1, :n_words] & mask.words[r2, :n_words]
+        nonzero = np.flatnonzero(diff)
+        if not len(nonzero):
+            return -1
+        i = int(nonzero[0])
+        x = int(diff[i])
+        return i * 64 + (x & -x).bit_length() - 1
+
+    def packed_rows(self) -> np.ndarray:
+        """The used words, n_rows x ceil(n_cols / 64), e.g. for serialization."""
+        return self.words[:self.n_rows, :self.n_words(self.n_cols)]
+
+    @classmethod
+    def from_packed(cls, words: np.ndarray, n_cols: int) -> "PackedTable":
+        table = cls(len(words), n_cols)
+        table.words[:len(words), :words.shape[1]] = words
+        return table
+
+    @classmethod
+    def full(cls, n_rows: int, n_cols: int) -> "PackedTable":
+        """Table with every cell True."""
+        table = cls(n_rows, n_cols)
+        table.words[:n_rows, :n_cols >> 6] = ~np.uint64(0)
+        if n_cols & 63:
+            table.words[:n_rows, n_cols >> 6] = np.uint64((1 << (n_cols & 63)) - 1)
+        return table
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
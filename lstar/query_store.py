@@ -0,0 +1,310 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .utils import Word
+
+UNKNOWN, REJECTED, ACCEPTED = 0, 1, 2
+
+
+# Fibonacci hashing of edge keys; slots hold child ids and 0 marks a free slot
+_HASH = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def _index_dtype(capacity: int):
+    return np.int32 if capacity < 2 ** 31 else np.int64
+
+
+def _symbol_dtype(n_symbols: int):
+    if n_symbols <= 2 ** 8:
+        return np.uint8
+    return np.uint16 if n_symbols <= 2 ** 16 else np.int32
+
+
+class QueryStore:
+    """
+    Prefix tree of encoded words holding one membership answer per node.
+
+    Every word s·e of the observation table is a node, so a word is stored
+    (and queried) once no matter how it is split into prefix and suffix,
+    and words with common prefixes share their path. Node 0 is the empty
+    word.
+
+    Nodes are numpy arrays indexed by node id: parent (int32), edge
+    symbol (uint8 for up to 256 symbols) and answer (uint8). Edges are an
+    open-addressed hash table of child ids with linear probing, kept at
+    most half full; the key (parent, symbol) of a slot is read back from
+    the child's own arrays, so a slot is a single int32. All arrays grow
+    by doubling. That is 6 bytes per node plus 8 to 16 bytes of slots,
+    and up to twice that while an array has just doubled: about 14 to 30
+    bytes per word (see nbytes), against ~130 for a dict of edges and
+    Python lists. A 1e8-cell table whose words are all distinct needs
+    1.4 to 3 GB for its store; the bit-packed cells add 12.5 MB.
+
+    Single lookups go through memoryviews of the arrays; children(),
+    walk_many(), words() and answer_codes() handle whole batches as array
+    operations.
+    """
+
+    def __init__(self, n_symbols: int, capacity: int = 64):
+        self.n_symbols = n_symbols
+        self._size = 1
+        self._allocate(max(capacity, 2))
+        n_slots = 1 << (2 * len(self._parent) - 1).bit_length()
+        self._set_slots(np.zeros(n_slots, dtype=self._parent.dtype))
+
+    def _allocate(self, capacity: int, size: int = 0) -> None:
+        """(Re)allocate the node arrays with room for capacity nodes, keeping the first size."""
+        parent = np.full(capacity, -1, dtype=_index_dtype(capacity))
+        symbol = np.zeros(capacity, dtype=_symbol_dtype(self.n_symbols))
+        answers = np.zeros(capacity, dtype=np.uint8)
+        if size:
+            parent[:size] = self._parent[:size]
+            symbol[:size] = self._symbol[:size]
+            answers[:size] = self._answers[:size]
+        self._parent, self._symbol, self._answers = parent, symbol, answers
+        self._parent_mv = memoryview(parent)
+        self._symbol_mv = memoryview(symbol)
+        self._answers_mv = memoryview(answers)
+
+    def _set_slots(self, slots: np.ndarray) -> None:
+        self._slots = slots
+        self._slots_mv = memoryview(slots)
+        self._slot_mask = len(slots) - 1
+        self._shift = 64 - (len(slots).bit_length() - 1)
+
+    def _reserve(self, n_new: int) -> None:
+        """Make room for n_new more nodes, rehashing when the slots would pass half full."""
+        need = self._size + n_new
+        if need > len(self._parent):
+            self._allocate(max(need, 2 * len(self._parent)), self._size)
+        if 2 * need > len(self._slots):
+            n_slots = len(self._slots)
+            while 2 * need > n_slots:
+                n_slots *= 2
+            self._set_slots(np.zeros(n_slots, dtype=self._parent.dtype))
+            self._insert(np.arange(1, self._size, dtype=np.int64))
+
+    def _home(self, keys: np.ndarray) -> np.ndarray:
+        """Home slot of each edge key."""
+        hashed = keys.astype(np.uint64) * np.uint64(_HASH)
+        return (hashed >> np.uint64(self._shift)).astype(np.int64)
+
+    def _insert(self, ids: np.ndarray) -> None:
+        """Put nodes into the hash table; their parent and symbol are already set."""
+        keys = self._parent[ids].astype(np.int64) * self.n_symbols + self._symbol[ids]
+        slot = self._home(keys)
+        while len(ids):
+            free = self._slots[slot] == 0
+            # Of several nodes probing the same free slot, the first takes it
+            _, first = np.unique(slot[free], return_index=True)
+            placed = np.zeros(len(ids), dtype=bool)
+            placed[np.flatnonzero(free)[first]] = True
+            self._slots[slot[placed]] = ids[placed]
+            ids, slot = ids[~placed], slot[~placed]
+            slot = (slot + ~free[~placed]) & self._slot_mask
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the node arrays and hash slots, capacity included."""
+        return self._parent.nbytes + self._symbol.nbytes + self._answers.nbytes + self._slots.nbytes
+
+    def child(self, node: int, symbol: int, create: bool = True) -> Optional[int]:
+        """Return the child of node along symbol, creating it if asked."""
+        slot = (((node * self.n_symbols + symbol) * _HASH) & _MASK64) >> self._shift
+        slots, parent, symbols = self._slots_mv, self._parent_mv, self._symbol_mv
+        mask = self._slot_mask
+        while True:
+            child = slots[slot]
+            if not child:
+                break
+            if parent[child] == node and symbols[child] == symbol:
+                return child
+            slot = (slot + 1) & mask
+        if not create:
+            return None
+        if 2 * (self._size + 1) > len(self._slots) or self._size == len(self._parent):
+            self._reserve(1)
+            return self.child(node, symbol)
+        child = self._size
+        self._size += 1
+        self._parent_mv[child] = node
+        self._symbol_mv[child] = symbol
+        slots[slot] = child
+        return child
+
+    def children(self, nodes, symbols, create: bool = True) -> np.ndarray:
+        """
+        Vectorized child(): the child of every node along the matching
+        symbol (or one symbol for all). Missing children are -1, or created
+        in order of first appearance if create is set.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        symbols = np.broadcast_to(np.asarray(symbols, dtype=np.int64), nodes.shape)
+        keys = nodes * self.n_symbols + symbols
+        result = np.full(len(nodes), -1, dtype=np.int64)
+        pending = np.arange(len(nodes))
+        slot = self._home(keys)
+        while len(pending):
+            child = self._slots[slot].astype(np.int64)
+            occupied = child != 0
+            found = occupied & (self._parent[child] == nodes[pending]) \
+                & (self._symbol[child] == symbols[pending])
+            result[pending[found]] = child[found]
+            probe = occupied & ~found
+            pending, slot = pending[probe], (slot[probe] + 1) & self._slot_mask
+
+        missing = np.flatnonzero(result < 0)
+        if create and len(missing):
+            new_keys, first, inverse = np.unique(keys[missing], return_index=True,
+                                                 return_inverse=True)
+            # Number new nodes in the order their first request appears
+            order = np.argsort(first, kind='stable')
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            self._reserve(len(new_keys))
+            ids = self._size + np.arange(len(new_keys), dtype=np.int64)
+            origin = missing[first[order]]
+            self._parent[ids] = nodes[origin]
+            self._symbol[ids] = symbols[origin]
+            self._size += len(ids)
+            self._insert(ids)
+            result[missing] = ids[rank[inverse.ravel()]]
+        return result
+
+    def walk(self, node: int, word: Word, create: bool = True) -> Optional[int]:
+        """Follow word from node; None if the path does not exist and create is False."""
+        for symbol in word:
+            node = self.child(node, symbol, create)
+            if node is None:
+                return None
+        return node
+
+    def walk_many(self, nodes, word: Word, create: bool = True) -> np.ndarray:
+        """Vectorized walk() of one word from many nodes; -1 where a path is missing."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        for symbol in word:
+            if not create:
+                live = nodes >= 0
+                step = np.full(len(nodes), -1, dtype=np.int64)
+                step[live] = self.children(nodes[live], symbol, create=False)
+                nodes = step
+            else:
+                nodes = self.children(nodes, symbol)
+        return nodes
+
+    def node(self, word: Word) -> int:
+        """Node of a word, created if needed."""
+        return self.walk(0, word)
+
+    def word(self, node: int) -> Word:
+        """Reconstruct the word of a node from its parent pointers."""
+        symbols = []
+        parent, symbol = self._parent_mv, self._symbol_mv
+        while node > 0:
+            symbols.append(symbol[node])
+            node = parent[node]
+        return tuple(reversed(symbols))
+
+    def words(self, nodes) -> List[Word]:
+        """Vectorized word(): the words of many nodes, climbing all their paths at once."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        columns = []
+        depths = np.zeros(len(nodes), dtype=np.int64)
+        current = nodes
+        while (current > 0).any():
+            live = current > 0
+            depths += live
+            columns.append(self._symbol[np.maximum(current, 0)])
+            current = np.where(live, self._parent[np.maximum(current, 0)], 0)
+        if not columns:
+            return [()] * len(nodes)
+        # Row i holds the word of nodes[i] backwards, padded after its first depths[i] symbols
+        paths = np.stack(columns, axis=1)[:, ::-1].tolist()
+        width = len(columns)
+        return [tuple(path[width - depth:]) for path, depth in zip(paths, depths.tolist())]
+
+    def parent(self, node: int) -> int:
+        """Parent of a node; -1 for the root."""
+        return self._parent_mv[node]
+
+    def answer(self, node: int) -> Optional[bool]:
+        value = self._answers_mv[node]
+        return None if value == UNKNOWN else value == ACCEPTED
+
+    def answer_codes(self, nodes) -> np.ndarray:
+        """UNKNOWN, REJECTED or ACCEPTED for every node."""
+        return self._answers[np.asarray(nodes, dtype=np.int64)]
+
+    def set_answer(self, node: int, accepted: bool) -> None:
+        self._answers_mv[node] = ACCEPTED if accepted else REJECTED
+
+    def set_answers(self, nodes: Iterable[int], answers: Iterable[bool]) -> None:
+        nodes = np.fromiter(nodes, dtype=np.int64)
+        answers = np.fromiter(answers, dtype=bool, count=len(nodes))
+        self._answers[nodes] = np.where(answers, ACCEPTED, REJECTED)
+
+    def get(self, word: Word) -> Optional[bool]:
+        """Answer for a word, or None if it was never answered."""
+        node = self.walk(0, word, create=False)
+        return None if node is None else self.answer(node)
+
+    @property
+    def answered(self) -> int:
+        """Number of words with a known answer."""
+        return int(np.count_nonzero(self._answers[:self._size]))
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Parent pointers, edge symbols and answers of all nodes, for serialization."""
+        size = self._size
+        return self._parent[:size], self._symbol[:size], self._answers[:size]
+
+    @classmethod
+    def from_arrays(cls, n_symbols: int, parent, symbol, answers) -> "QueryStore":
+        """Rebuild a store from to_arrays() output; node ids are preserved."""
+        size = len(parent)
+        store = cls(n_symbols, capacity=size)
+        store._parent[:size] = parent
+        store._symbol[1:size] = np.asarray(symbol[1:])
+        store._answers[:size] = np.frombuffer(bytes(answers), dtype=np.uint8) \
+            if isinstance(answers, (bytes, bytearray)) else answers
+        store._size = size
+        store._insert(np.arange(1, size, dtype=np.int64))
+        return store
+
+
+class TableView(Mapping):
+    """
+    Read-only (row, suffix) -> answer view of an observation table.
+
+    Cells are not stored separately: each lookup resolves the word row·suffix
+    in the QueryStore. Only cells of current rows and columns are visible.
+    """
+
+    def __init__(self, store: QueryStore, rows: Dict[Word, int], cols: Dict[Word, int]):
+        self._store = store
+        self._rows = rows
+        self._cols = cols
+
+    def __getitem__(self, cell):
+        row, e = cell
+        if row not in self._rows or e not in self._cols:
+            raise KeyError(cell)
+        answer = self._store.get(row + e)
+        if answer is None:
+            raise KeyError(cell)
+        return answer
+
+    def __iter__(self):
+        for row in self._rows:
+            for e in self._cols:
+                if self._store.get(row + e) is not None:
+                    yield row, e
+
+    def __len__(self):
+        return sum(1 for _ in self)
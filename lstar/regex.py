@@ -0,0 +1,178 @@
+"""
+Regular expressions over tokens, compiled to minimal DFAs.
+
+Patterns use the learner's token alphabet rather than characters: a symbol
+is a run of characters other than whitespace and the operators ( ) | * + ? .
+and symbols are concatenated by juxtaposition, so '(a | b)* a b' and
+'HELLO (AUTH DATA*)?' are patterns over {a, b} and {HELLO, AUTH, DATA}.
+'.' matches any symbol of the alphabet and '()' matches the empty word.
+"""
+import re
+from typing import Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .dfa import CompiledDFA
+from .minimize import minimize
+
+_TOKEN = re.compile(r"\s*(?:([()|*+?.])|([^\s()|*+?.]+))")
+
+ANY = '.'
+
+
+def _tokenize(pattern: str) -> List[Tuple[str, str]]:
+    """Split a pattern into ('op', char) and ('sym', symbol) tokens."""
+    tokens = []
+    position = 0
+    pattern = pattern.rstrip()
+    while position < len(pattern):
+        match = _TOKEN.match(pattern, position)
+        if match is None:
+            raise ValueError(f"Invalid regex {pattern!r} at position {position}")
+        op, symbol = match.groups()
+        tokens.append(('op', op) if op else ('sym', symbol))
+        position = match.end()
+    return tokens
+
+
+class _NFA:
+    """Thompson NFA: epsilon edges and labelled edges per state."""
+
+    def __init__(self):
+        self.epsilon: List[List[int]] = []
+        self.edges: List[List[Tuple[str, int]]] = []
+
+    def state(self) -> int:
+        self.epsilon.append([])
+        self.edges.append([])
+        return len(self.epsilon) - 1
+
+
+class _Parser:
+    """
+    Recursive descent parser emitting Thompson fragments (start, end).
+
+        alt    := concat ('|' concat)*
+        concat := repeat*
+        repeat := atom ('*' | '+' | '?')*
+        atom   := symbol | '.' | '(' alt ')'
+    """
+
+    def __init__(self, pattern: str, nfa: _NFA):
+        self.pattern = pattern
+        self.tokens = _tokenize(pattern)
+        self.position = 0
+        self.nfa = nfa
+        self.symbols: Set[str] = set()
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse(self) -> Tuple[int, int]:
+        fragment = self.alt()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected {self.peek()[1]!r} in regex {self.pattern!r}")
+        return fragment
+
+    def alt(self) -> Tuple[int, int]:
+        branches = [self.concat()]
+        while self.peek() == ('op', '|'):
+            self.position += 1
+            branches.append(self.concat())
+        if len(branches) == 1:
+            return branches[0]
+        start, end = self.nfa.state(), self.nfa.state()
+        for branch_start, branch_end in branches:
+            self.nfa.epsilon[start].append(branch_start)
+            self.nfa.epsilon[branch_end].append(end)
+        return start, end
+
+    def concat(self) -> Tuple[int, int]:
+        start = end = self.nfa.state()
+        while self.peek() is not None and self.peek() not in (('op', '|'), ('op', ')')):
+            part_start, part_end = self.repeat()
+            self.nfa.epsilon[end].append(part_start)
+            end = part_end
+        return start, end
+
+    def repeat(self) -> Tuple[int, int]:
+        start, end = self.atom()
+        while self.peek() in (('op', '*'), ('op', '+'), ('op', '?')):
+            op = self.peek()[1]
+            self.position += 1
+            new_start, new_end = self.nfa.state(), self.nfa.state()
+            self.nfa.epsilon[new_start].append(start)
+            self.nfa.epsilon[end].append(new_end)
+            if op in '*+':
+                self.nfa.epsilon[end].append(start)
+            if op in '*?':
+                self.nfa.epsilon[new_start].append(new_end)
+            start, end = new_start, new_end
+        return start, end
+
+    def atom(self) -> Tuple[int, int]:
+        token = self.peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of regex {self.pattern!r}")
+        self.position += 1
+        kind, value = token
+        if kind == 'sym' or value == ANY:
+            start, end = self.nfa.state(), self.nfa.state()
+            self.nfa.edges[start].append((value, end))
+            if kind == 'sym':
+                self.symbols.add(value)
+            return start, end
+        if value == '(':
+            fragment = self.alt()
+            if self.peek() != ('op', ')'):
+                raise ValueError(f"Missing ')' in regex {self.pattern!r}")
+            self.position += 1
+            return fragment
+        raise ValueError(f"Unexpected {value!r} in regex {self.pattern!r}")
+
+
+def compile_regex(pattern: str, alphabet: Optional[Iterable[str]] = None) -> CompiledDFA:
+    """
+    Compile a token regex to a minimal, canonically numbered CompiledDFA.
+
+    The alphabet defaults to the symbols used in the pattern; it must be
+    given for '.' to match anything else, and must contain every symbol
+    the pattern uses.
+    """
+    nfa = _NFA()
+    parser = _Parser(pattern, nfa)
+    start, end = parser.parse()
+    symbols = sorted(parser.symbols if alphabet is None else set(alphabet))
+    unknown = parser.symbols - set(symbols)
+    if unknown:
+        raise ValueError(f"Regex uses symbols outside the alphabet: {sorted(unknown)}")
+
+    def closure(states):
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            for target in nfa.epsilon[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+    # Subset construction; the empty set becomes the rejecting sink
+    initial = closure([start])
+    subsets = {initial: 0}
+    order = [initial]
+    delta = []
+    for subset in order:
+        row = []
+        for symbol in symbols:
+            targets = closure([t for q in subset for label, t in nfa.edges[q]
+                               if label == symbol or label == ANY])
+            if targets not in subsets:
+                subsets[targets] = len(order)
+                order.append(targets)
+            row.append(subsets[targets])
+        delta.append(row)
+    accepting = [end in subset for subset in order]
+    dfa = CompiledDFA(symbols, np.asarray(delta, dtype=np.int64).reshape(len(order), len(symbols)),
+                      accepting, 0)
+    return minimize(dfa)
@@ -0,0 +1,63 @@
+"""
+Reset-minimizing execution of a batch of membership queries.
+
+Session oracles (see Oracle.reset/Oracle.step) drive a system under test
+symbol by symbol, and a reset is usually the expensive part. The
+scheduler takes a round's pending query store nodes, keeps only the
+leaves of the sub-trie they span (every other pending word is a prefix of
+a leaf and is answered on the way down), and visits the leaves in DFS
+order. Each leaf costs one reset and its depth in steps, and the answer
+after every step is recorded for the node reached.
+"""
+from dataclasses import dataclass
+from typing import Sequence
+
+from .query_store import QueryStore
+
+
+@dataclass
+class SessionRun:
+    """Cost of one scheduled batch."""
+    words: int = 0
+    resets: int = 0
+    steps: int = 0
+
+    @property
+    def resets_saved(self) -> int:
+        """Resets avoided compared with one session per word."""
+        return self.words - self.resets
+
+
+def prefix_tree_leaves(store: QueryStore, nodes: Sequence[int]) -> list:
+    """The nodes that are not a proper prefix of another node of the batch."""
+    covered = set()
+    for node in nodes:
+        parent = store.parent(node)
+        while parent >= 0 and parent not in covered:
+            covered.add(parent)
+            parent = store.parent(parent)
+    return [n for n in dict.fromkeys(nodes) if n not in covered]
+
+
+def run_sessions(oracle, store: QueryStore, nodes: Sequence[int], symbols: Sequence[str]) -> SessionRun:
+    """
+    Answer the words of nodes with reset()/step() sessions, in DFS order.
+
+    Answers already in the store are kept; every other node passed on the
+    way gets the oracle's answer.
+    """
+    run = SessionRun(words=len(set(nodes)))
+    words = sorted(store.words(prefix_tree_leaves(store, nodes)))
+    for word in words:
+        node = 0
+        accepted = oracle.reset()
+        run.resets += 1
+        if store.answer(node) is None:
+            store.set_answer(node, accepted)
+        for symbol in word:
+            accepted = oracle.step(symbols[symbol])
+            run.steps += 1
+            node = store.child(node, symbol)
+            if store.answer(node) is None:
+                store.set_answer(node, accepted)
+    return run
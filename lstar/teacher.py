@@ -0,0 +1,64 @@
+from typing import Iterable, List, Optional, Sequence
+
+from .dfa import CompiledDFA
+from .mealy import MealyMachine, distinguishing_inputs
+from .minimize import distinguishing_string
+from .oracle import MealyOracle, Oracle
+from .regex import compile_regex
+
+
+class DFATeacher(Oracle):
+    """
+    Exact teacher for a known target language.
+
+    Membership queries run the reference DFA. Equivalence queries are
+    answered exactly by a breadth-first search over the product of the
+    reference and the hypothesis, so the counterexample returned is always
+    a shortest one, and None means the hypothesis is correct.
+
+    `reference` is a CompiledDFA or dict DFA; `alphabet` defaults to the
+    reference's symbols and should match the learner's alphabet.
+    """
+
+    def __init__(self, reference, alphabet: Optional[Iterable[str]] = None):
+        if isinstance(reference, CompiledDFA):
+            if alphabet is not None and sorted(alphabet) != reference.symbols:
+                reference = CompiledDFA.from_dict(reference.to_dict(), alphabet)
+        else:
+            reference = CompiledDFA.from_dict(reference, alphabet)
+        self.reference = reference
+
+    @classmethod
+    def from_regex(cls, pattern: str, alphabet: Optional[Iterable[str]] = None) -> "DFATeacher":
+        """Teacher for the language of a token regex (see lstar.regex)."""
+        return cls(compile_regex(pattern, alphabet))
+
+    def membership_query(self, string):
+        return self.reference.run(string)
+
+    def membership_queries(self, strings: Sequence[str]) -> List[bool]:
+        return self.reference.run_batch(strings).tolist()
+
+    def equivalence_query(self, dfa):
+        if not isinstance(dfa, CompiledDFA):
+            dfa = CompiledDFA.from_dict(dfa, self.reference.symbols)
+        return distinguishing_string(self.reference, dfa)
+
+
+class MealyTeacher(MealyOracle):
+    """
+    Exact teacher for a known Mealy machine: output queries run the
+    reference, equivalence queries return a shortest input word on which
+    the hypothesis' outputs differ (see distinguishing_inputs), or None.
+    """
+
+    def __init__(self, reference, inputs: Optional[Iterable[str]] = None):
+        self.reference = MealyMachine.from_dict(reference, None if inputs is None else sorted(inputs))
+
+    def output_query(self, string):
+        return self.reference.run(string)
+
+    def equivalence_query(self, mealy):
+        if not isinstance(mealy, MealyMachine):
+            mealy = MealyMachine.from_dict(mealy, self.reference.inputs)
+        return distinguishing_inputs(self.reference, mealy)
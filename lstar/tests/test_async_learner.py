@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from lstar.async_learner import AsyncLStarLearner
+from lstar.counterexample import CounterexampleStrategy
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import LearnerStats
+from lstar.oracle import AsyncOracle
+from lstar.tests.test_learner import NoThreeAsOracle
+
+
+class AsyncNoThreeAsOracle(AsyncOracle):
+    """Async stand-in for a network service; tracks how many queries overlap."""
+    def __init__(self):
+        self.oracle = NoThreeAsOracle()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def membership_query(self, string):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return self.oracle.membership_query(string)
+
+    async def equivalence_query(self, dfa):
+        return self.oracle.equivalence_query(dfa)
+
+
+EXAMPLES = {'positive': {'a a', 'b a b'}, 'negative': {'a a a'}}
+
+
+@pytest.mark.parametrize("limit", [1, 4, 64])
+def test_async_learning_matches_sync(limit):
+    sync_learner = LStarLearner()
+    sync_learner.initialize({'a', 'b'}, EXAMPLES, NoThreeAsOracle())
+    expected = sync_learner.learn()
+
+    oracle = AsyncNoThreeAsOracle()
+    learner = AsyncLStarLearner(max_concurrency=limit)
+    learner.initialize({'a', 'b'}, EXAMPLES, oracle)
+    dfa = asyncio.run(learner.learn())
+
+    assert dfa == expected
+    assert learner.T == sync_learner.T
+    assert oracle.max_in_flight <= limit
+    if limit > 1:
+        assert oracle.max_in_flight > 1
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        AsyncLStarLearner(max_concurrency=0)
+
+
+@pytest.mark.parametrize("strategy", [
+    CounterexampleStrategy.BINARY_SEARCH,
+    CounterexampleStrategy.SUFFIX1BY1,
+    CounterexampleStrategy.SUFFIXES,
+])
+def test_async_strategies_match_sync(strategy):
+    sync_stats = LearnerStats()
+    sync_learner = LStarLearner(strategy=strategy, stats=sync_stats)
+    sync_learner.initialize({'a', 'b'}, EXAMPLES, NoThreeAsOracle())
+    expected = sync_learner.learn()
+
+    stats = LearnerStats()
+    learner = AsyncLStarLearner(strategy=strategy, stats=stats)
+    learner.initialize({'a', 'b'}, EXAMPLES, AsyncNoThreeAsOracle())
+    dfa = asyncio.run(learner.learn())
+
+    assert dfa == expected
+    assert learner.E == sync_learner.E
+    assert stats.membership_queries == sync_stats.membership_queries
+    assert stats.equivalence_queries == sync_stats.equivalence_queries
+    # Equivalence queries are timed under 'verification', as in the sync learner
+    assert stats.phase_times['verification'] >= stats.equivalence_latency.total > 0
+    assert {p for p, t in stats.phase_times.items() if t} == \
+        {p for p, t in sync_stats.phase_times.items() if t}
+
+
+def test_custom_strategy_is_rejected():
+    with pytest.raises(ValueError, match="CounterexampleStrategy"):
+        AsyncLStarLearner(strategy=lambda learner, word: None)
+
+
+def test_sync_queries_are_rejected():
+    learner = AsyncLStarLearner()
+    learner.initialize({'a', 'b'}, EXAMPLES, AsyncNoThreeAsOracle())
+    with pytest.raises(TypeError):
+        learner._membership(learner._encode('a b'))
@@ -64,6 +64,21 @@ def test_invalid_sequences(oracle, sequence):
     assert oracle.membership_query(sequence) == False
 
 
+@pytest.mark.parametrize("sequence", ["", "HELLO AUTH DATA CLOSE HELLO", "HELLO DATA AUTH"])
+def test_prefix_query_matches_membership(oracle, sequence):
+    actions = sequence.split()
+    expected = [oracle.membership_query(' '.join(actions[:i])) for i in range(len(actions) + 1)]
+    assert oracle.prefix_query(sequence) == expected
+
+
+@pytest.mark.parametrize("sequence", ["", "HELLO AUTH DATA CLOSE HELLO", "HELLO DATA AUTH"])
+def test_session_matches_membership(oracle, sequence):
+    accepted = oracle.reset()
+    for action in sequence.split():
+        accepted = oracle.step(action)
+    assert accepted == oracle.membership_query(sequence)
+
+
 def test_auth_retry_limit_exact(oracle):
     """
     Test that authentication is locked exactly after 3 failed attempts:
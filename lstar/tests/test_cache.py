@@ -0,0 +1,122 @@
+import pytest
+from lstar.cache import CachedOracle
+from lstar.executor import ParallelExecutor
+from lstar.lstar_learner import LStarLearner
+from lstar.oracle import supports_prefix_queries, supports_sessions
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import CountingOracle, EvenAsOracle
+from lstar.tests.test_prefix_queries import PROTOCOL, PrefixSessions
+from lstar.tests.test_scheduler import EVEN_AS, Device
+
+
+@pytest.fixture
+def counting():
+    return CountingOracle(EvenAsOracle())
+
+
+def test_repeated_queries_hit_cache(counting):
+    cache = CachedOracle(counting)
+    assert cache.membership_query("a a") is True
+    assert cache.membership_query("a  a ") is True   # same token sequence
+    assert counting.queries == ["a a"]
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_lru_eviction(counting):
+    cache = CachedOracle(counting, maxsize=2)
+    cache.membership_query("a")
+    cache.membership_query("b")
+    cache.membership_query("a")        # refresh 'a'
+    cache.membership_query("a b")      # evicts 'b'
+    assert len(cache) == 2
+    cache.membership_query("b")
+    assert counting.queries == ["a", "b", "a b", "b"]
+
+
+def test_invalid_maxsize(counting):
+    with pytest.raises(ValueError):
+        CachedOracle(counting, maxsize=0)
+
+
+def test_warm_cache_reused_between_runs(tmp_path, counting):
+    path = str(tmp_path / "queries.sqlite")
+    examples = {'positive': {'a a'}, 'negative': {'a'}}
+
+    with CachedOracle(counting, path=path) as cache:
+        learner = LStarLearner()
+        learner.initialize({'a', 'b'}, examples, cache)
+        first = learner.learn()
+    asked = len(counting.queries)
+
+    with CachedOracle(counting, path=path) as cache:
+        learner = LStarLearner()
+        learner.initialize({'a', 'b'}, examples, cache)
+        second = learner.learn()
+        assert cache.stats.disk_hits > 0
+
+    assert len(counting.queries) == asked
+    assert first['states'] == second['states']
+
+
+def test_batch_forwards_only_distinct_misses(counting):
+    cache = CachedOracle(counting)
+    cache.membership_query("a")
+    assert cache.membership_queries(["a", "b", "a a", "b"]) == [False, True, True, True]
+    assert counting.queries == ["a", "b", "a a"]
+
+
+def test_forwards_prefix_queries_and_sessions(counting):
+    assert not supports_prefix_queries(CachedOracle(counting))
+    assert not supports_sessions(CachedOracle(counting))
+    assert supports_prefix_queries(CachedOracle(PrefixSessions(None)))
+    assert supports_sessions(CachedOracle(Device(EVEN_AS)))
+
+
+def test_prefix_queries_are_cached():
+    oracle = PrefixSessions(DFATeacher.from_regex(PROTOCOL))
+    cache = CachedOracle(oracle)
+    assert cache.prefix_query('h a d') == [True, True, True, True]
+    assert cache.prefix_queries(['h a', 'h a d', 'h d']) == [[True] * 3, [True] * 4, [True, True, False]]
+    assert oracle.resets == 2
+    assert cache.membership_query('h a') is True
+    assert oracle.resets == 2
+
+
+def test_sessions_replay_from_the_first_miss():
+    device = Device(EVEN_AS)
+    cache = CachedOracle(device)
+    assert cache.reset() is True
+    assert [cache.step(s) for s in 'ab'] == [False, False]
+    assert device.log == ['reset', 'a', 'b']
+
+    device.log.clear()
+    assert cache.reset() is True
+    assert [cache.step(s) for s in 'aba'] == [False, False, True]
+    # Answered from the cache up to 'a b', then replayed
+    assert device.log == ['reset', 'a', 'b', 'a']
+
+
+def test_learner_keeps_prefix_mode_through_the_cache():
+    class PrefixOnly(PrefixSessions):
+        def membership_query(self, string):
+            raise AssertionError(f"membership query for {string!r}")
+
+    oracle = PrefixOnly(DFATeacher.from_regex(PROTOCOL))
+    learner = LStarLearner()
+    learner.initialize(set('hadc'), {'positive': {''}, 'negative': set()}, CachedOracle(oracle))
+    learner.learn()
+    assert oracle.resets > 0
+
+
+def test_shared_between_threads(tmp_path):
+    path = str(tmp_path / "queries.sqlite")
+    words = [' '.join('ab'[(i >> k) & 1] for k in range(8)) for i in range(256)]
+    with CachedOracle(EvenAsOracle(), maxsize=64, path=path, commit_every=16) as cache, \
+            ParallelExecutor(max_workers=8, chunk_size=4) as executor:
+        for _ in range(3):
+            assert executor.membership_queries(cache, words) == \
+                [w.count('a') % 2 == 0 for w in words]
+        assert cache.stats.lookups == 3 * len(words)
+        assert cache.stats.misses == len(words)
@@ -0,0 +1,128 @@
+import os
+import time
+
+import numpy as np
+import pytest
+from lstar.checkpoint import load_checkpoint
+from lstar.counterexample import CounterexampleStrategy
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import LearnerStats
+from lstar.minimize import equivalent
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import CountingOracle, NoThreeAsOracle
+
+PATTERN = '(a | b)* a (a | b) (a | b)'
+EXAMPLES = {'positive': {'a a a'}, 'negative': {'b'}}
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'table.ckpt'
+    learner = LStarLearner(strategy=CounterexampleStrategy.BINARY_SEARCH)
+    learner.initialize({'a', 'b'}, EXAMPLES, DFATeacher.from_regex(PATTERN))
+    learner.S.add((0,))
+    learner.E.add((1, 0))
+    learner._update_observation_table()
+    learner.checkpoint(path)
+
+    resumed = LStarLearner.resume(path, learner.teacher)
+    assert resumed.strategy is CounterexampleStrategy.BINARY_SEARCH
+    assert resumed.S == learner.S and resumed.E == learner.E
+    assert resumed._rows == learner._rows and resumed._cols == learner._cols
+    assert list(resumed._s_rows.items()) == list(learner._s_rows.items())
+    n_rows, n_cols = len(learner._rows), len(learner._cols)
+    assert resumed._table.shape == learner._table.shape == (n_rows, n_cols)
+    assert (resumed._table.unpack() == learner._table.unpack()).all()
+    assert (resumed._succ[resumed._s_indices()] == learner._succ[learner._s_indices()]).all()
+    assert resumed.store.answered == learner.store.answered
+    assert resumed.positive_examples == EXAMPLES['positive']
+    assert dict(resumed.T) == dict(learner.T)
+
+
+def test_sections_are_memory_mapped(tmp_path):
+    path = tmp_path / 'table.ckpt'
+    learner = LStarLearner()
+    learner.initialize({'a', 'b'}, EXAMPLES, NoThreeAsOracle())
+    learner.checkpoint(path)
+    header, sections = load_checkpoint(path)
+    assert isinstance(sections['matrix'], np.memmap)
+    assert header['shape'] == [3, 1]
+    assert sections['matrix'].shape == (3, 1)       # one packed word per row
+
+
+def test_write_is_synced_before_and_after_rename(tmp_path, monkeypatch):
+    path = tmp_path / 'run.ckpt'
+    calls = []
+    monkeypatch.setattr('os.fsync', lambda fd: calls.append('fsync'))
+    real_replace = os.replace
+    monkeypatch.setattr('os.replace', lambda *args: calls.append('replace') or real_replace(*args))
+    learner = LStarLearner()
+    learner.initialize({'a', 'b'}, EXAMPLES, NoThreeAsOracle())
+    learner.checkpoint(path)
+    assert calls == ['fsync', 'replace', 'fsync']
+    assert not (tmp_path / 'run.ckpt.tmp').exists()
+
+
+def test_resume_reuses_answers(tmp_path):
+    path = tmp_path / 'run.ckpt'
+    teacher = CountingOracle(DFATeacher.from_regex(PATTERN))
+    learner = LStarLearner(max_iterations=3, checkpoint_path=path, checkpoint_every=1)
+    learner.initialize({'a', 'b'}, EXAMPLES, teacher)
+    with pytest.raises(Exception, match="did not converge"):
+        learner.learn()
+
+    fresh_teacher = CountingOracle(teacher.inner)
+    fresh = LStarLearner()
+    fresh.initialize({'a', 'b'}, EXAMPLES, fresh_teacher)
+    fresh.learn()
+
+    teacher.queries = []
+    resumed = LStarLearner.resume(path, teacher, max_iterations=100)
+    dfa = resumed.learn()
+    assert equivalent(dfa, teacher.inner.reference)
+    assert 0 < len(teacher.queries) < len(fresh_teacher.queries)
+
+
+@pytest.mark.parametrize("every", [None, 1, 3])
+def test_checkpoints_are_spaced_out(tmp_path, monkeypatch, every):
+    writes = []
+
+    def slow_checkpoint(learner, path):
+        writes.append(len(learner.S))
+        time.sleep(0.02)
+
+    monkeypatch.setattr('lstar.lstar_learner.save_checkpoint', slow_checkpoint)
+    stats = LearnerStats()
+    learner = LStarLearner(checkpoint_path=tmp_path / 'run.ckpt', checkpoint_every=every,
+                           stats=stats)
+    learner.initialize({'a', 'b'}, EXAMPLES, DFATeacher.from_regex(PATTERN))
+    learner.learn()
+    iterations = len(stats.iterations)
+    if every is None:
+        # The first iteration writes; the next write waits for 380 ms of learning,
+        # longer than this whole run
+        assert writes == [1]
+        assert iterations > 1
+    else:
+        assert len(writes) == iterations // every
+
+
+def test_counterexamples_survive_resume(tmp_path):
+    path = tmp_path / 'run.ckpt'
+    teacher = DFATeacher.from_regex(PATTERN)
+    learner = LStarLearner()
+    learner.initialize({'a', 'b'}, {'positive': set(), 'negative': {''}}, teacher)
+    learner.learn()
+    assert len(learner.examples) > 1
+    learner.checkpoint(path)
+
+    resumed = LStarLearner.resume(path, teacher)
+    assert resumed.examples.strings == learner.examples.strings
+    assert all(resumed.examples.label(w) == learner.examples.label(w)
+               for w in learner.examples.strings)
+
+
+def test_not_a_checkpoint(tmp_path):
+    path = tmp_path / 'junk'
+    path.write_bytes(b'0' * 64)
+    with pytest.raises(ValueError):
+        LStarLearner.resume(path, NoThreeAsOracle())
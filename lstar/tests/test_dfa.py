@@ -0,0 +1,45 @@
+from itertools import product
+import numpy as np
+import pytest
+from lstar.dfa import CompiledDFA
+from lstar.utils import run_dfa
+
+
+# Accepts words over {a, b} with an even number of a's; 'c' has no transitions
+EVEN_AS = {
+    'states': 2,
+    'initial': 0,
+    'accepting': {0},
+    'transitions': {(0, 'a'): 1, (1, 'a'): 0, (0, 'b'): 0, (1, 'b'): 1},
+}
+
+WORDS = [' '.join(w) for n in range(5) for w in product('abc', repeat=n)]
+
+
+@pytest.fixture
+def compiled():
+    return CompiledDFA.from_dict(EVEN_AS, symbols={'a', 'b', 'c'})
+
+
+def test_missing_transitions_go_to_sink(compiled):
+    assert compiled.delta.shape == (3, 3)       # two states plus sink
+    assert compiled['states'] == 2
+    assert compiled.run('a c a') is False
+
+
+def test_run_matches_run_dfa(compiled):
+    for word in WORDS:
+        assert compiled.run(word) == run_dfa(EVEN_AS, word) == run_dfa(compiled, word)
+
+
+def test_run_batch_matches_run(compiled):
+    verdicts = compiled.run_batch(WORDS + ['a x a'])
+    assert isinstance(verdicts, np.ndarray)
+    assert verdicts.tolist() == [compiled.run(w) for w in WORDS] + [False]
+    assert compiled.run_batch([]).shape == (0,)
+
+
+def test_dict_view_round_trips(compiled):
+    assert compiled.to_dict() == EVEN_AS
+    assert dict(compiled) == EVEN_AS
+    assert CompiledDFA.from_dict(compiled.to_dict()).delta.shape == (2, 2)
@@ -0,0 +1,103 @@
+from itertools import product
+import pytest
+from lstar.dfa import CompiledDFA
+from lstar.equivalence import (RandomWalkOracle, WMethodOracle, WpMethodOracle,
+                               characterizing_set, separating_words, state_cover,
+                               transition_cover)
+from lstar.lstar_learner import LStarLearner
+from lstar.oracle import Oracle
+from lstar.tests.test_learner import NoThreeAsOracle
+from lstar.utils import run_dfa
+
+
+class MembershipOnly(Oracle):
+    """The system under learning: answers membership only, counts queries."""
+    def __init__(self, inner):
+        self.inner = inner
+        self.asked = 0
+
+    def membership_query(self, string):
+        self.asked += 1
+        return self.inner.membership_query(string)
+
+
+# Hypothesis that wrongly accepts 'a a a': counts a's up to two, then stays
+TOO_LENIENT = CompiledDFA.from_dict({
+    'states': 3,
+    'initial': 0,
+    'accepting': {0, 1, 2},
+    'transitions': {(0, 'a'): 1, (1, 'a'): 2, (2, 'a'): 2,
+                    (0, 'b'): 0, (1, 'b'): 0, (2, 'b'): 0},
+})
+
+
+def test_state_cover_and_separating_words():
+    dfa = CompiledDFA.from_dict({
+        'states': 3, 'initial': 0, 'accepting': {2},
+        'transitions': {(0, 'a'): 1, (1, 'a'): 2, (2, 'a'): 2},
+    })
+    assert state_cover(dfa) == [(), (0,), (0, 0)]
+    assert separating_words(dfa) == {(0, 2): (), (1, 2): (), (0, 1): (0,)}
+    assert characterizing_set(dfa) == [(), (0,)]
+
+
+@pytest.mark.parametrize("oracle_class", [WMethodOracle, WpMethodOracle])
+def test_test_cases_predict_the_hypothesis(oracle_class):
+    cases = list(oracle_class(None, extra_states=2).test_cases(TOO_LENIENT))
+    assert all(TOO_LENIENT.run_encoded(word) == predicted for word, predicted in cases)
+    if oracle_class is WMethodOracle:
+        middles = [()] + [(a,) for a in range(2)] + list(product(range(2), repeat=2))
+        assert [word for word, _ in cases] == [
+            p + m + s for m in middles for p in transition_cover(TOO_LENIENT)
+            for s in characterizing_set(TOO_LENIENT)]
+
+
+@pytest.mark.parametrize("oracle_class", [WMethodOracle, WpMethodOracle])
+def test_conformance_oracle_finds_counterexample(oracle_class):
+    teacher = oracle_class(MembershipOnly(NoThreeAsOracle()), extra_states=1)
+    counterexample = teacher.equivalence_query(TOO_LENIENT)
+    assert counterexample is not None
+    assert TOO_LENIENT.run(counterexample) != NoThreeAsOracle().membership_query(counterexample)
+
+
+def test_random_walk_finds_counterexample():
+    teacher = RandomWalkOracle(MembershipOnly(NoThreeAsOracle()), max_tests=500, seed=1)
+    counterexample = teacher.equivalence_query(TOO_LENIENT)
+    assert counterexample is not None
+    assert 'a a a' in counterexample
+
+
+class AcceptAll(Oracle):
+    def membership_query(self, string):
+        return True
+
+
+def test_budget_is_respected():
+    system = MembershipOnly(AcceptAll())
+    teacher = WMethodOracle(system, extra_states=3, batch_size=4, max_tests=10)
+    correct = {'states': 1, 'initial': 0, 'accepting': {0},
+               'transitions': {(0, 'a'): 0, (0, 'b'): 0}}
+    assert teacher.equivalence_query(correct) is None
+    assert teacher.tests_run == system.asked == 10
+
+
+@pytest.mark.parametrize("make_teacher", [
+    lambda system: WMethodOracle(system, extra_states=1),
+    lambda system: WpMethodOracle(system, extra_states=1),
+    lambda system: RandomWalkOracle(system, max_tests=2000, seed=0),
+])
+def test_learning_with_conformance_oracle(make_teacher):
+    teacher = make_teacher(MembershipOnly(NoThreeAsOracle()))
+    learner = LStarLearner()
+    learner.initialize({'a', 'b'}, {'positive': {'a a'}, 'negative': {'a a a'}}, teacher)
+    dfa = learner.learn()
+    assert dfa['states'] == 4
+    for length in range(7):
+        for combo in product('ab', repeat=length):
+            word = ' '.join(combo)
+            assert run_dfa(dfa, word) == NoThreeAsOracle().membership_query(word)
+
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        WMethodOracle(NoThreeAsOracle(), batch_size=0)
@@ -0,0 +1,107 @@
+import random
+from lstar.dfa import CompiledDFA
+from lstar.examples import ExampleStore
+from lstar.kv_learner import KVLearner
+from lstar.lstar_learner import LStarLearner
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import EvenAsOracle
+
+INDEX = {'a': 0, 'b': 1}
+# Accepts words with an even number of a's
+EVEN_AS = CompiledDFA('ab', [[1, 0], [0, 1]], [True, False], 0)
+
+
+def random_strings(n, rng, max_length=12):
+    return [' '.join(rng.choice('ab') for _ in range(rng.randrange(max_length))) for _ in range(n)]
+
+
+def test_check_matches_run():
+    rng = random.Random(0)
+    strings = random_strings(200, rng)
+    store = ExampleStore(INDEX)
+    for s in strings:
+        store.add(s, EVEN_AS.run(s))
+    assert store.check(EVEN_AS) is None
+    flipped = CompiledDFA('ab', [[1, 0], [0, 1]], [False, True], 0)
+    assert store.check(flipped) == strings[0]
+
+
+def test_duplicates_and_unknown_symbols():
+    store = ExampleStore(INDEX)
+    assert store.add('a a', True)
+    assert not store.add('a a', False)
+    assert store.label('a a') is True
+    store.add('a c', False)
+    assert len(store) == 2 and 'a c' in store
+    assert store.check(EVEN_AS) is None
+    store.add('c', True)
+    assert store.check(EVEN_AS) == 'c'
+
+
+def test_only_words_through_changed_states_are_rerun():
+    rng = random.Random(1)
+    store = ExampleStore(INDEX)
+    # 'b'-only words stay in state 0, words with an 'a' reach state 1
+    strings = random_strings(100, rng) + ['', 'b', 'b b']
+    for s in strings:
+        store.add(s, EVEN_AS.run(s))
+    keys = [10, 11]
+    store.check(EVEN_AS, keys)
+    assert store.runs == len(store)
+
+    # Same hypothesis under renumbered states: nothing to rerun
+    swapped = CompiledDFA('ab', [[1, 0], [0, 1]], [False, True], 1)
+    assert store.check(swapped, keys[::-1]) is None
+    assert store.runs == len(store)
+
+    # Change what happens after an 'a': only words containing one rerun
+    odd_sink = CompiledDFA('ab', [[1, 0], [1, 1]], [True, False], 0)
+    before = store.runs
+    wrong = store.check(odd_sink, keys)
+    rerun = store.runs - before
+    with_a = sum('a' in s for s in store.strings)
+    assert rerun == with_a < len(store)
+    expected = [s for s in store.strings if odd_sink.run(s) != EVEN_AS.run(s)]
+    assert wrong == (expected[0] if expected else None)
+
+    # Verdicts still agree with a full rerun
+    fresh = ExampleStore(INDEX)
+    for s in store.strings:
+        fresh.add(s, store.label(s))
+    assert fresh.check(odd_sink) == wrong
+
+
+def test_new_words_are_checked_against_cached_hypothesis():
+    store = ExampleStore(INDEX)
+    store.add('a a', True)
+    store.check(EVEN_AS, [0, 1])
+    store.add('a', True)
+    assert store.check(EVEN_AS, [0, 1]) == 'a'
+    assert store.runs == 2
+
+
+def test_learner_replays_past_counterexamples():
+    teacher = DFATeacher.from_regex('(a | b)* a (a | b) (a | b)')
+    for learner in (LStarLearner(), KVLearner()):
+        learner.initialize({'a', 'b'}, {'positive': set(), 'negative': {''}}, teacher)
+        dfa = learner.learn()
+        n_examples = len(learner.examples)
+        assert n_examples > 1
+        # Every counterexample is stored with its true label
+        for word in learner.examples.strings:
+            assert learner.examples.label(word) == teacher.membership_query(word)
+        assert learner.examples.check(dfa) is None
+
+
+def test_examples_checked_before_equivalence_query():
+    class NoEquivalence(EvenAsOracle):
+        def equivalence_query(self, dfa):
+            raise AssertionError("examples should have caught this hypothesis")
+
+    learner = LStarLearner()
+    learner.initialize({'a', 'b'}, {'positive': {'a a'}, 'negative': {'a'}}, NoEquivalence())
+    # A stored word the hypothesis gets "wrong" is returned without asking the teacher
+    learner.examples.add('b a', True)
+    while learner._check_table_properties():
+        pass
+    assert learner._verify_hypothesis(learner._construct_dfa()) == 'b a'
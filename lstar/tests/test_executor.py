@@ -0,0 +1,107 @@
+import functools
+import pytest
+from examples.black_box_sim import ProtocolOracle
+from lstar.executor import ParallelExecutor, SerialExecutor
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import LearnerStats
+from lstar.oracle import Oracle
+from lstar.tests.test_learner import NoThreeAsOracle
+
+
+ALPHABET = {'HELLO', 'AUTH', 'DATA', 'CLOSE'}
+EXAMPLES = {'positive': {'HELLO AUTH'}, 'negative': {'AUTH'}}
+protocol_factory = functools.partial(ProtocolOracle, test_mode=True)
+
+
+class MembershipOnly(Oracle):
+    """The protocol without its session and prefix query API."""
+
+    def __init__(self):
+        self.protocol = ProtocolOracle(test_mode=True)
+
+    def membership_query(self, string):
+        return self.protocol.membership_query(string)
+
+    def equivalence_query(self, dfa):
+        return self.protocol.equivalence_query(dfa)
+
+
+class CountingExecutor(ParallelExecutor):
+    """ParallelExecutor counting the batches it runs on its pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = 0
+
+    def _map(self, teacher, words, method):
+        self.batches += 1
+        return super()._map(teacher, words, method)
+
+
+def learn(executor, oracle_factory=MembershipOnly, **kwargs):
+    learner = LStarLearner(executor=executor, **kwargs)
+    learner.initialize(ALPHABET, EXAMPLES, oracle_factory())
+    dfa = learner.learn()
+    executor.close()
+    return dfa, learner.T
+
+
+def test_batch_order_is_preserved():
+    words = ['a' * n for n in range(50)]
+    words = [' '.join(w) for w in words]
+    oracle = NoThreeAsOracle()
+    with ParallelExecutor(max_workers=4, chunk_size=3) as executor:
+        assert executor.membership_queries(oracle, words) == oracle.membership_queries(words)
+
+
+def test_prefix_batch_order_is_preserved():
+    words = ['HELLO AUTH DATA', 'HELLO', 'AUTH HELLO', '', 'HELLO AUTH CLOSE HELLO']
+    with ParallelExecutor(max_workers=2, chunk_size=2, oracle_factory=protocol_factory) as executor:
+        assert executor.prefix_queries(None, words) == protocol_factory().prefix_queries(words)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 8])
+def test_threaded_learning_is_deterministic(workers):
+    expected = learn(SerialExecutor())
+    executor = CountingExecutor(max_workers=workers, oracle_factory=MembershipOnly)
+    assert learn(executor) == expected
+    assert executor.batches > 0
+
+
+def test_process_pool_learning():
+    expected = learn(SerialExecutor())
+    executor = CountingExecutor(max_workers=2, oracle_factory=MembershipOnly, use_processes=True)
+    assert learn(executor) == expected
+    assert executor.batches > 0
+
+
+def test_session_oracle_uses_parallel_executor():
+    stats = LearnerStats()
+    executor = CountingExecutor(max_workers=2, oracle_factory=protocol_factory)
+    dfa, _ = learn(executor, protocol_factory, stats=stats)
+    assert executor.batches > 0
+    assert stats.resets == 0
+    assert dfa == learn(SerialExecutor(), protocol_factory)[0]
+
+
+def test_sessions_bypassing_executor_warn():
+    executor = CountingExecutor(max_workers=2, oracle_factory=protocol_factory)
+    with pytest.warns(UserWarning, match="CountingExecutor"):
+        learn(executor, protocol_factory, sessions=True)
+    assert executor.batches == 0
+
+
+def test_serial_executor_runs_sessions():
+    stats = LearnerStats()
+    learn(SerialExecutor(), protocol_factory, stats=stats)
+    assert stats.resets > 0
+    stats = LearnerStats()
+    learn(SerialExecutor(), protocol_factory, stats=stats, sessions=False)
+    assert stats.resets == 0
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        ParallelExecutor(max_workers=0)
+    with pytest.raises(ValueError):
+        ParallelExecutor(use_processes=True)
@@ -0,0 +1,61 @@
+from itertools import product
+import pytest
+from examples.black_box_sim import ProtocolOracle
+from lstar.kv_learner import KVLearner
+from lstar.lstar_learner import LStarLearner
+from lstar.utils import run_dfa
+from lstar.tests.test_learner import (CountingOracle, EndsInABOracle, EvenAsOracle,
+                                      NoThreeAsOracle)
+
+
+def words(alphabet, max_length):
+    for length in range(max_length + 1):
+        for combo in product(sorted(alphabet), repeat=length):
+            yield ' '.join(combo)
+
+
+def classified(oracle, word):
+    """Example dict holding one word labelled by the oracle."""
+    examples = {'positive': set(), 'negative': set()}
+    examples['positive' if oracle.membership_query(word) else 'negative'].add(word)
+    return examples
+
+
+@pytest.mark.parametrize("oracle_class,states", [
+    (EvenAsOracle, 2),
+    (EndsInABOracle, 3),
+    (NoThreeAsOracle, 4),
+])
+def test_kv_learns_same_language(oracle_class, states):
+    oracle = oracle_class()
+    learner = KVLearner()
+    learner.initialize({'a', 'b'}, classified(oracle, 'a b a a a'), oracle)
+    dfa = learner.learn()
+    assert dfa['states'] == states
+    for word in words({'a', 'b'}, 6):
+        assert run_dfa(dfa, word) == oracle.membership_query(word), word
+
+
+def test_kv_learns_protocol():
+    oracle = ProtocolOracle(test_mode=True)
+    learner = KVLearner()
+    learner.initialize({'HELLO', 'AUTH', 'DATA', 'CLOSE'}, oracle.generate_training_data(), oracle)
+    dfa = learner.learn()
+    assert dfa['states'] == 4
+    for word in words({'HELLO', 'AUTH', 'DATA', 'CLOSE'}, 4):
+        assert run_dfa(dfa, word) == oracle.membership_query(word), word
+
+
+def test_kv_asks_fewer_queries_than_table():
+    examples = {'positive': set(), 'negative': {'a b a a a'}}
+    kv_oracle = CountingOracle(NoThreeAsOracle())
+    kv = KVLearner()
+    kv.initialize({'a', 'b'}, examples, kv_oracle)
+    kv.learn()
+
+    table_oracle = CountingOracle(NoThreeAsOracle())
+    table = LStarLearner()
+    table.initialize({'a', 'b'}, examples, table_oracle)
+    table.learn()
+
+    assert len(kv_oracle.queries) < len(table_oracle.queries)
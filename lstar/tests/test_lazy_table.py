@@ -0,0 +1,107 @@
+import random
+import pytest
+from lstar.counterexample import CounterexampleStrategy
+from lstar.dfa import CompiledDFA
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import LearnerStats
+from lstar.minimize import equivalent, minimize
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import EvenAsOracle
+
+PATTERNS = [
+    '(a | b)* a (a | b) (a | b)',
+    '(a | b | c)* a b c',
+    '((a | b) (a | b | c))* c?',
+]
+SYMBOLS = 'abcdefgh'
+
+
+def empty_word_example(teacher):
+    label = 'positive' if teacher.membership_query('') else 'negative'
+    examples = {'positive': set(), 'negative': set()}
+    examples[label].add('')
+    return examples
+
+
+def learn(teacher, alphabet, **kwargs):
+    stats = LearnerStats()
+    learner = LStarLearner(stats=stats, max_iterations=1000, **kwargs)
+    learner.initialize(set(alphabet), empty_word_example(teacher), teacher)
+    return learner, learner.learn(), stats
+
+
+def random_target(n_states, seed):
+    rng = random.Random(seed)
+    delta = [[rng.randrange(n_states) for _ in SYMBOLS] for _ in range(n_states)]
+    accepting = [rng.random() < 0.5 for _ in range(n_states)]
+    return minimize(CompiledDFA(SYMBOLS, delta, accepting, 0))
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+@pytest.mark.parametrize("strategy", list(CounterexampleStrategy))
+def test_lazy_learns_same_language(pattern, strategy):
+    teacher = DFATeacher.from_regex(pattern, alphabet='abc')
+    _, eager_dfa, _ = learn(teacher, 'abc', strategy=strategy)
+    _, lazy_dfa, _ = learn(teacher, 'abc', strategy=strategy, lazy=True)
+    assert equivalent(lazy_dfa, eager_dfa)
+    assert lazy_dfa.n_states == eager_dfa.n_states
+
+
+@pytest.mark.parametrize("strategy", list(CounterexampleStrategy))
+def test_lazy_saves_queries_on_large_alphabet(strategy):
+    target = random_target(30, seed=7)
+    teacher = DFATeacher(target)
+    _, eager_dfa, eager = learn(teacher, SYMBOLS, strategy=strategy)
+    learner, lazy_dfa, lazy = learn(teacher, SYMBOLS, strategy=strategy, lazy=True)
+    assert equivalent(lazy_dfa, target)
+    assert lazy_dfa.n_states == eager_dfa.n_states == target.n_states
+    assert lazy.membership_queries < eager.membership_queries
+    # The savings are cells that were never resolved
+    n_rows, n_cols = learner._table.shape
+    assert learner._known.unpack().sum() < n_rows * n_cols
+
+
+def test_lazy_mode_defers_queries():
+    learner = LStarLearner(lazy=True)
+    learner.initialize({'a', 'b'}, {'positive': {'a a'}, 'negative': {'a'}}, EvenAsOracle())
+    # Nothing is asked until the table is inspected
+    assert learner.store.answered == 0
+    learner._is_closed()
+    assert learner.store.answered > 0
+
+
+def test_assumed_cell_is_repaired_from_counterexample():
+    teacher = DFATeacher(random_target(10, seed=3))
+    learner = LStarLearner(lazy=True, strategy=CounterexampleStrategy.BINARY_SEARCH)
+    learner.initialize(set(SYMBOLS), empty_word_example(teacher), teacher)
+    repaired = []
+    for _ in range(100):
+        while learner._check_table_properties():
+            pass
+        hypothesis = learner._construct_dfa()
+        counterexample = teacher.equivalence_query(hypothesis)
+        if counterexample is None:
+            break
+        known = learner._known.unpack().sum()
+        n_cols = len(learner._cols)
+        learner._add_counterexample_info(counterexample)
+        if len(learner._cols) == n_cols:
+            # No new column: exactly one assumed cell was resolved
+            assert learner._known.unpack().sum() == known + 1
+            repaired.append(counterexample)
+    assert repaired
+
+
+def test_lazy_checkpoint_round_trip(tmp_path):
+    path = tmp_path / 'lazy.ckpt'
+    teacher = DFATeacher(random_target(20, seed=5))
+    learner = LStarLearner(lazy=True, max_iterations=3, checkpoint_path=path, checkpoint_every=1)
+    learner.initialize(set(SYMBOLS), empty_word_example(teacher), teacher)
+    with pytest.raises(Exception):
+        learner.learn()
+    resumed = LStarLearner.resume(path, teacher, max_iterations=1000)
+    assert resumed.lazy
+    # Unresolved cells stay unresolved instead of being read as False
+    known = resumed._known.unpack()
+    assert 0 < known.sum() < known.size
+    assert equivalent(resumed.learn(), teacher.reference)
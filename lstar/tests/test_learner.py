@@ -3,6 +3,7 @@ from lstar.utils import run_dfa
 from itertools import product
 from lstar.oracle import Oracle
 from lstar.lstar_learner import LStarLearner
+from lstar.counterexample import CounterexampleStrategy, find_breakpoint
 
 
 
@@ -192,6 +193,147 @@ def test_oracle_consistency(even_as_oracle, ends_in_ab_oracle, no_three_as_oracl
             result2 = oracle.membership_query(test_string)
             assert result1 == result2, f"{name} inconsistent for '{test_string}'"
 
+# Incremental table maintenance
+class CountingOracle(Oracle):
+    """Wraps another oracle and records every membership query."""
+    def __init__(self, inner):
+        self.inner = inner
+        self.queries = []
+
+    def membership_query(self, string):
+        self.queries.append(string)
+        return self.inner.membership_query(string)
+
+    def equivalence_query(self, dfa):
+        return self.inner.equivalence_query(dfa)
+
+def test_table_fill_never_repeats_a_cell(learner):
+    oracle = CountingOracle(NoThreeAsOracle())
+    learner.initialize({'a', 'b'}, {'positive': {'a a'}, 'negative': {'a a a'}}, oracle)
+    while learner._check_table_properties():
+        pass
+    learner._add_counterexample_info('b a a a')
+    while learner._check_table_properties():
+        pass
+
+    # No word is asked twice, no matter how many times the table was updated
+    assert len(oracle.queries) == len(set(oracle.queries)) == learner.store.answered
+    assert len(learner.T) == len(learner._row_to_idx) * len(learner._e_to_idx)
+
+def test_new_suffix_only_queries_new_column(learner):
+    oracle = CountingOracle(EvenAsOracle())
+    learner.initialize({'a', 'b'}, {'positive': {'a a'}, 'negative': {'a'}}, oracle)
+    before = len(oracle.queries)
+    a = learner._encode('a')
+    new_words = {row + a for row in learner._row_to_idx if learner.store.get(row + a) is None}
+    learner.E.add(a)
+    learner._update_observation_table()
+    assert len(oracle.queries) - before == len(new_words)
+    cells = {row: (learner.T[(row, ())], learner.T[(row, a)]) for row in learner._row_to_idx}
+    for r1 in cells:
+        for r2 in cells:
+            same_signature = learner._get_row_signature(r1) == learner._get_row_signature(r2)
+            assert same_signature == (cells[r1] == cells[r2])
+
+class BatchRecordingOracle(EvenAsOracle):
+    """Records the size of every membership batch it receives."""
+    def __init__(self):
+        self.batches = []
+
+    def membership_queries(self, strings):
+        self.batches.append(len(strings))
+        return super().membership_queries(strings)
+
+def test_table_update_is_one_batch(learner):
+    oracle = BatchRecordingOracle()
+    learner.initialize({'a', 'b'}, {'positive': {'a a'}, 'negative': {'a'}}, oracle)
+    assert oracle.batches == [learner.store.answered]
+    learner._add_counterexample_info('a b a')
+    assert len(oracle.batches) == 2
+    assert sum(oracle.batches) == learner.store.answered
+
+def test_shared_words_are_queried_once(learner):
+    oracle = CountingOracle(EvenAsOracle())
+    learner.initialize({'a', 'b'}, {'positive': {'a a'}, 'negative': {'a'}}, oracle)
+    learner._add_counterexample_info('a b a')
+
+    # 'a'·'b a' and 'a b'·'a' are the same word
+    a, ba, ab = learner._encode('a'), learner._encode('b a'), learner._encode('a b')
+    assert learner.T[(a, ba)] == learner.T[(ab, a)] is True
+    assert oracle.queries.count('a b a') == 1
+    assert len(oracle.queries) < len(learner.T)
+
+def test_inconsistency_is_detected(learner, ends_in_ab_oracle):
+    learner.initialize({'a', 'b'}, {'positive': {'a b'}, 'negative': {'a'}}, ends_in_ab_oracle)
+    learner.S.add(learner._encode('a'))
+    learner._update_observation_table()
+
+    # ε and 'a' look alike, but ε·b and a·b differ on the empty suffix
+    s1, s2, a, e = learner._is_consistent()
+    assert {s1, s2} == {(), (0,)}
+    assert (a, e) == (1, ())
+
+def test_words_are_interned(learner, even_as_oracle):
+    learner.initialize({'b', 'a'}, {'positive': {'a a'}, 'negative': {'a'}}, even_as_oracle)
+    assert learner._encode('a b a') == (0, 1, 0)
+    assert learner._decode((1, 0)) == 'b a'
+    assert all(isinstance(s, tuple) for s in learner.S | learner.E)
+    with pytest.raises(ValueError):
+        learner._encode('a c')
+
+# Counterexample strategies
+@pytest.mark.parametrize("strategy", list(CounterexampleStrategy))
+@pytest.mark.parametrize("oracle_class,states", [
+    (EvenAsOracle, 2),
+    (EndsInABOracle, 3),
+    (NoThreeAsOracle, 4),
+])
+def test_strategies_learn_same_language(strategy, oracle_class, states):
+    oracle = oracle_class()
+    long_word = 'b a b a b a b a a a'
+    label = 'positive' if oracle.membership_query(long_word) else 'negative'
+    examples = {'positive': set(), 'negative': set()}
+    examples[label].add(long_word)
+
+    learner = LStarLearner(strategy=strategy)
+    learner.initialize({'a', 'b'}, examples, oracle)
+    dfa = learner.learn()
+    assert dfa['states'] == states
+    for length in range(6):
+        for combo in product(['a', 'b'], repeat=length):
+            word = ' '.join(combo)
+            assert run_dfa(dfa, word) == oracle.membership_query(word), word
+
+def test_rivest_schapire_adds_one_suffix(learner, no_three_as_oracle):
+    learner = LStarLearner(strategy=CounterexampleStrategy.BINARY_SEARCH)
+    learner.initialize({'a', 'b'}, {'positive': {'a'}, 'negative': {'a a a'}}, no_three_as_oracle)
+    while learner._check_table_properties():
+        pass
+    learner._construct_dfa()
+    rows, cols = len(learner.S), len(learner.E)
+    learner._add_counterexample_info('b a b a a a')
+    assert len(learner.S) == rows
+    assert len(learner.E) == cols + 1
+
+def test_custom_strategy_callable(even_as_oracle):
+    seen = []
+    learner = LStarLearner(strategy=lambda learner, word: seen.append(word))
+    learner.initialize({'a', 'b'}, {'positive': {'a a'}, 'negative': {'a'}}, even_as_oracle)
+    learner._add_counterexample_info('a b')
+    assert seen == [(0, 1)]
+
+@pytest.mark.parametrize("flip", range(1, 17))
+def test_find_breakpoint(flip):
+    # alpha is True up to flip - 1 and False from flip on
+    asked = []
+
+    def alpha(i):
+        asked.append(i)
+        return i < flip
+
+    assert find_breakpoint(None, tuple(range(16)), alpha) == flip
+    assert asked[0] == 0 and len(asked) <= 5
+
 # Error cases
 def test_invalid_alphabet(learner, even_as_oracle):
     with pytest.raises(ValueError):
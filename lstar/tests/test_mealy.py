@@ -0,0 +1,133 @@
+import itertools
+import random
+import pytest
+from examples.black_box_sim import ProtocolMealyOracle, learn_protocol_mealy
+from lstar.executor import ParallelExecutor
+from lstar.mealy import MealyMachine, distinguishing_inputs
+from lstar.mealy_learner import MealyLearner
+from lstar.metrics import LearnerStats
+from lstar.oracle import MealyOracle
+from lstar.teacher import MealyTeacher
+from lstar.utils import run_mealy
+
+# Outputs the parity of a's read so far, ignoring b's
+PARITY = MealyMachine('ab', [[1, 0], [0, 1]], [['odd', 'even'], ['even', 'odd']])
+
+
+def random_mealy(n_states, inputs, n_outputs, rng):
+    delta = [[rng.randrange(n_states) for _ in inputs] for _ in range(n_states)]
+    outputs = [[rng.randrange(n_outputs) for _ in inputs] for _ in range(n_states)]
+    return MealyMachine(inputs, delta, outputs)
+
+
+def brute_force_distinguishing(a, b, max_length=6):
+    for length in range(1, max_length + 1):
+        for word in itertools.product(a.inputs, repeat=length):
+            if a.run(word) != b.run(word):
+                return length
+    return None
+
+
+class CountingTeacher(MealyTeacher):
+    def __init__(self, reference):
+        super().__init__(reference)
+        self.queries = []
+
+    def output_query(self, string):
+        self.queries.append(string)
+        return super().output_query(string)
+
+
+def test_run_and_dict_view():
+    assert PARITY.run('a b a a') == ('odd', 'odd', 'even', 'odd')
+    assert PARITY.run('') == ()
+    assert PARITY['outputs'][(0, 'a')] == 'odd'
+    assert MealyMachine.from_dict(PARITY.to_dict()).run('b a b') == PARITY.run('b a b')
+    assert run_mealy(PARITY, 'a a') == run_mealy(PARITY.to_dict(), 'a a') == ('odd', 'even')
+    with pytest.raises(ValueError):
+        PARITY.run('c')
+
+
+def test_run_mealy_on_partial_dict():
+    partial = {'states': 1, 'initial': 0, 'transitions': {(0, 'a'): 0}, 'outputs': {(0, 'a'): 1}}
+    assert run_mealy(partial, 'a b a') == (1, None, None)
+
+
+def test_distinguishing_inputs_are_shortest():
+    rng = random.Random(0)
+    for _ in range(100):
+        a = random_mealy(rng.randint(1, 4), 'ab', 2, rng)
+        b = random_mealy(rng.randint(1, 4), 'ab', 2, rng)
+        word = distinguishing_inputs(a, b)
+        expected = brute_force_distinguishing(a, b)
+        if word is None:
+            assert expected is None
+        else:
+            assert a.run(word) != b.run(word)
+            assert len(word.split()) == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_learns_random_machines(seed):
+    rng = random.Random(seed)
+    reference = random_mealy(rng.randint(2, 15), 'abc', 3, rng)
+    teacher = MealyTeacher(reference)
+    learner = MealyLearner()
+    learner.initialize({'a', 'b', 'c'}, None, teacher)
+    mealy = learner.learn()
+    assert distinguishing_inputs(reference, mealy) is None
+    assert mealy.n_states <= reference.n_states
+
+
+def test_one_query_answers_every_prefix():
+    teacher = CountingTeacher(PARITY)
+    stats = LearnerStats()
+    learner = MealyLearner(stats=stats)
+    learner.initialize({'a', 'b'}, None, teacher)
+    mealy = learner.learn()
+    assert mealy.n_states == 2
+    n_cells = len(learner._rows) * len(learner._cols)
+    assert len(teacher.queries) < n_cells
+    # A prefix of a word asked earlier is never asked again
+    asked = [tuple(q.split()) for q in teacher.queries]
+    assert not any(later == earlier[:len(later)]
+                   for i, earlier in enumerate(asked) for later in asked[i + 1:])
+    assert stats.oracle_calls == len(teacher.queries) < stats.membership_queries
+
+
+def test_examples_are_checked_first():
+    class NoEquivalence(MealyTeacher):
+        def equivalence_query(self, mealy):
+            raise AssertionError("the example should have been enough")
+
+    learner = MealyLearner()
+    learner.initialize({'a', 'b'}, {'a b a': ('odd', 'odd', 'x')}, NoEquivalence(PARITY))
+    while not learner._close():
+        pass
+    assert learner._verify_hypothesis(learner._construct_hypothesis()) == 'a b a'
+
+
+def test_parallel_executor():
+    reference = random_mealy(8, 'abc', 3, random.Random(3))
+    learner = MealyLearner(executor=ParallelExecutor(max_workers=3))
+    learner.initialize({'a', 'b', 'c'}, None, MealyTeacher(reference))
+    assert distinguishing_inputs(reference, learner.learn()) is None
+
+
+def test_wrong_output_length_is_rejected():
+    class Broken(MealyOracle):
+        def output_query(self, string):
+            return ('x',)
+
+    learner = MealyLearner()
+    with pytest.raises(ValueError, match="output_query"):
+        learner.initialize({'a', 'b'}, None, Broken())
+
+
+def test_protocol_responses():
+    mealy = learn_protocol_mealy()
+    assert mealy.n_states == 3
+    oracle = ProtocolMealyOracle(test_mode=True)
+    for sequence in ['HELLO AUTH DATA CLOSE HELLO', 'AUTH HELLO HELLO AUTH AUTH DATA']:
+        assert mealy.run(sequence) == oracle.output_query(sequence)
+    assert mealy.run('HELLO HELLO AUTH') == ('OK', 'ERROR', 'OK')
@@ -0,0 +1,75 @@
+import json
+import pytest
+from lstar.cache import CachedOracle
+from lstar.kv_learner import KVLearner
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import PHASES, LatencyHistogram, LearnerStats
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import CountingOracle
+
+PATTERN = '(a | b)* a (a | b)'
+EXAMPLES = {'positive': {'a a'}, 'negative': {'b'}}
+
+
+def learn(learner_class, teacher, **kwargs):
+    learner = learner_class(**kwargs)
+    learner.initialize({'a', 'b'}, EXAMPLES, teacher)
+    learner.learn()
+    return learner
+
+
+def test_histogram_buckets():
+    histogram = LatencyHistogram()
+    for seconds in [0.5e-6, 3e-6, 3e-6, 100e-6, 0.01]:
+        histogram.record(seconds)
+    assert histogram.count == 5
+    assert histogram.buckets[0] == 1 and histogram.buckets[2] == 2
+    assert histogram.percentile(50) == 4e-6
+    assert histogram.percentile(100) == 0.01
+    assert histogram.to_dict()['p99'] == 0.01
+
+
+@pytest.mark.parametrize("learner_class", [LStarLearner, KVLearner])
+def test_counts_match_teacher(learner_class):
+    teacher = CountingOracle(DFATeacher.from_regex(PATTERN))
+    stats = LearnerStats()
+    learn(learner_class, teacher, stats=stats)
+    # Counterexample checks go through the store as well
+    assert stats.membership_queries == stats.oracle_calls == len(teacher.queries)
+    assert stats.membership_latency.count == stats.membership_batches
+    assert stats.equivalence_latency.count == stats.equivalence_queries >= 1
+    assert stats.store_hits > 0
+    # Iterations exclude the table fill done by initialize()
+    assert 0 < sum(r['membership_queries'] for r in stats.iterations) < stats.membership_queries
+
+
+def test_phases_and_profile_dump(tmp_path):
+    stats = LearnerStats()
+    seen = []
+    stats.on_iteration(seen.append)
+    learn(LStarLearner, DFATeacher.from_regex(PATTERN), stats=stats)
+
+    assert seen == stats.iterations
+    assert [r['iteration'] for r in seen] == list(range(1, len(seen) + 1))
+    assert set(stats.phase_times) >= set(PHASES)
+    for phase in ('table_fill', 'closedness', 'consistency', 'hypothesis', 'verification'):
+        assert stats.phase_times[phase] > 0
+    # Phase times are exclusive, so together they fit in the run
+    assert sum(stats.phase_times.values()) <= stats.wall_time
+
+    path = tmp_path / 'profile.json'
+    stats.dump(path)
+    profile = json.loads(path.read_text())
+    assert profile['membership_queries'] == stats.membership_queries
+    assert profile['iterations'][-1]['iteration'] == len(seen)
+
+
+def test_oracle_cache_counters_are_included():
+    stats = LearnerStats()
+    learn(LStarLearner, CachedOracle(DFATeacher.from_regex(PATTERN)), stats=stats)
+    assert stats.to_dict()['oracle_cache']['misses'] == stats.membership_queries
+
+
+def test_disabled_by_default():
+    learner = learn(LStarLearner, DFATeacher.from_regex(PATTERN))
+    assert learner.stats is None
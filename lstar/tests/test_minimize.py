@@ -0,0 +1,103 @@
+from collections import deque
+import random
+import pytest
+from lstar.dfa import CompiledDFA
+from lstar.minimize import (canonical_key, canonicalize, distinguishing_string,
+                            distinguishing_word, equivalent, minimize)
+
+
+# Even number of a's, with each class split into two redundant states and
+# an unreachable state
+REDUNDANT_EVEN_AS = {
+    'states': 5,
+    'initial': 0,
+    'accepting': {0, 2},
+    'transitions': {(0, 'a'): 1, (1, 'a'): 2, (2, 'a'): 3, (3, 'a'): 0,
+                    (0, 'b'): 2, (1, 'b'): 3, (2, 'b'): 0, (3, 'b'): 1,
+                    (4, 'a'): 4, (4, 'b'): 4},
+}
+
+EVEN_AS = {
+    'states': 2,
+    'initial': 0,
+    'accepting': {0},
+    'transitions': {(0, 'a'): 1, (1, 'a'): 0, (0, 'b'): 0, (1, 'b'): 1},
+}
+
+
+def random_compiled(n_states, n_symbols, rng):
+    delta = [[rng.randrange(n_states) for _ in range(n_symbols)] for _ in range(n_states)]
+    accepting = [rng.random() < 0.5 for _ in range(n_states)]
+    return CompiledDFA('abc'[:n_symbols], delta, accepting, 0)
+
+
+def shortest_by_product_bfs(a, b):
+    seen = {(a.initial, b.initial): ()}
+    queue = deque(seen)
+    while queue:
+        p, q = queue.popleft()
+        if a.accepting_mask[p] != b.accepting_mask[q]:
+            return seen[(p, q)]
+        for symbol in range(len(a.symbols)):
+            pair = (int(a.delta[p, symbol]), int(b.delta[q, symbol]))
+            if pair not in seen:
+                seen[pair] = seen[(p, q)] + (symbol,)
+                queue.append(pair)
+    return None
+
+
+def test_minimize_merges_and_drops_states():
+    minimal = minimize(REDUNDANT_EVEN_AS)
+    assert minimal.n_states == 2
+    assert minimal.delta.tolist() == [[1, 0], [0, 1]]
+    assert minimal.accepting_mask.tolist() == [True, False]
+    assert equivalent(minimal, REDUNDANT_EVEN_AS)
+
+
+def test_canonicalize_is_invariant_under_renumbering():
+    swapped = {
+        'states': 2,
+        'initial': 1,
+        'accepting': {1},
+        'transitions': {(1, 'a'): 0, (0, 'a'): 1, (1, 'b'): 1, (0, 'b'): 0},
+    }
+    assert canonicalize(swapped).delta.tolist() == canonicalize(EVEN_AS).delta.tolist()
+    assert canonical_key(swapped) == canonical_key(REDUNDANT_EVEN_AS) == canonical_key(EVEN_AS)
+
+
+def test_minimize_single_class():
+    everything = {'states': 3, 'initial': 0, 'accepting': {0, 1, 2},
+                  'transitions': {(0, 'a'): 1, (1, 'a'): 2, (2, 'a'): 0}}
+    assert minimize(everything).n_states == 1
+
+
+def test_distinguishing_word_on_dicts():
+    odd_as = dict(EVEN_AS, accepting={1})
+    assert distinguishing_word(EVEN_AS, odd_as) == ()
+    assert distinguishing_string(EVEN_AS, REDUNDANT_EVEN_AS) is None
+    only_bs = {'states': 1, 'initial': 0, 'accepting': {0}, 'transitions': {(0, 'b'): 0}}
+    # 'a' leads only_bs to its sink, which rejects
+    assert distinguishing_string(only_bs, EVEN_AS) == 'a a'
+
+
+def test_different_alphabets_rejected():
+    with pytest.raises(ValueError):
+        equivalent(CompiledDFA('ab', [[0, 0]], [True], 0), CompiledDFA('a', [[0]], [True], 0))
+
+
+def test_random_dfas_against_product_bfs():
+    rng = random.Random(0)
+    for _ in range(300):
+        n_symbols = rng.randint(1, 3)
+        a = random_compiled(rng.randint(1, 8), n_symbols, rng)
+        b = random_compiled(rng.randint(1, 8), n_symbols, rng)
+        expected = shortest_by_product_bfs(a, b)
+        word = distinguishing_word(a, b)
+        if expected is None:
+            assert word is None
+        else:
+            assert len(word) == len(expected)
+            assert a.run_encoded(word) != b.run_encoded(word)
+        assert equivalent(minimize(a), a)
+        assert (canonical_key(a) == canonical_key(b)) == (expected is None)
+        assert minimize(minimize(a)).delta.tolist() == minimize(a).delta.tolist()
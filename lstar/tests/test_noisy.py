@@ -0,0 +1,139 @@
+import random
+
+import pytest
+from examples.black_box_sim import FlakyProtocolOracle, ProtocolOracle, learn_protocol, learn_protocol_noisy
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import LearnerStats
+from lstar.minimize import equivalent
+from lstar.noisy import NoisyOracle
+from lstar.oracle import Oracle
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import CountingOracle, EvenAsOracle
+from lstar.tests.test_prefix_queries import PROTOCOL
+
+
+class Scripted(Oracle):
+    """Answers each word from a list of answers, in turn; records every batch."""
+
+    def __init__(self, answers, counterexamples=()):
+        self.answers = {word: list(votes) for word, votes in answers.items()}
+        self.batches = []
+        self.counterexamples = list(counterexamples)
+
+    def membership_queries(self, strings):
+        self.batches.append(list(strings))
+        return [self.answers[string].pop(0) for string in strings]
+
+    def equivalence_query(self, dfa):
+        return self.counterexamples.pop(0) if self.counterexamples else None
+
+
+class Flipping(Oracle):
+    """A teacher whose answers are flipped with probability p."""
+
+    def __init__(self, teacher, p, seed):
+        self.teacher = teacher
+        self.p = p
+        self.random = random.Random(seed)
+
+    def membership_query(self, string):
+        accepted = self.teacher.membership_query(string)
+        return accepted != (self.random.random() < self.p)
+
+    def equivalence_query(self, dfa):
+        return self.teacher.equivalence_query(dfa)
+
+
+def test_agreeing_votes_stop_early():
+    counting = CountingOracle(EvenAsOracle())
+    oracle = NoisyOracle(counting, error_rate=0.1, confidence=0.99)
+    assert oracle.membership_query("a a") is True
+    assert oracle.membership_query("a") is False
+    # log 9 per vote against a threshold of log 99: three votes each
+    assert counting.queries == ["a a"] * 3 + ["a"] * 3
+    assert oracle.confidence_of("a a") >= 0.99
+
+    assert oracle.membership_queries(["a  a", "a"]) == [True, False]
+    assert len(counting.queries) == 6
+    assert oracle.stats.hits == 2
+    assert oracle.stats.queries_per_word == 3
+
+
+def test_only_uncertain_words_are_asked_again():
+    script = Scripted({'x': [True, True, True], 'y': [True, False, True, True, True]})
+    oracle = NoisyOracle(script, error_rate=0.1, confidence=0.99)
+    assert oracle.membership_queries(['x', 'y', 'x']) == [True, True, True]
+    assert script.batches == [['x', 'y']] * 3 + [['y']] * 2
+    assert oracle.votes('y') == (4, 1)
+    assert oracle.uncertain_words() == []
+
+
+def test_one_sided_noise():
+    script = Scripted({'x': [False, True], 'y': [False, False, False]})
+    oracle = NoisyOracle(script, false_accept_rate=0, false_reject_rate=0.2)
+    assert oracle.membership_queries(['x', 'y']) == [True, False]
+    assert oracle.votes('x') == (1, 1)
+    assert oracle.confidence_of('x') == 1
+
+
+def test_undecided_after_max_repeats():
+    script = Scripted({'x': [True, False] * 3})
+    oracle = NoisyOracle(script, max_repeats=6)
+    assert oracle.membership_query('x') is False   # a tie rejects
+    assert oracle.uncertain_words() == ['x']
+    assert oracle.confidence_of('x') == 0.5
+    assert oracle.membership_query('x') is False
+    assert oracle.stats.undecided == 1
+    assert oracle.stats.queries == 6
+
+
+def test_spurious_counterexamples_are_dropped():
+    # 'x' is rejected and so is the hypothesis' answer for it
+    script = Scripted({'x': [False] * 3, 'y': [True] * 3}, counterexamples=['x', 'y'])
+    oracle = NoisyOracle(script)
+    hypothesis = {'states': {0}, 'initial': 0, 'accepting': set(), 'transitions': {}}
+    assert oracle.equivalence_query(hypothesis) == 'y'
+    assert oracle.stats.spurious_counterexamples == 1
+
+    script.counterexamples = ['x'] * 5
+    oracle.max_equivalence_retries = 2
+    assert oracle.equivalence_query(hypothesis) is None
+    assert script.counterexamples == ['x', 'x']
+
+
+@pytest.mark.parametrize("kwargs", [
+    {'error_rate': 0.5}, {'false_reject_rate': -0.1}, {'confidence': 1}, {'max_repeats': 0},
+])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        NoisyOracle(EvenAsOracle(), **kwargs)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_learns_through_flipped_answers(seed):
+    teacher = DFATeacher.from_regex(PROTOCOL)
+    oracle = NoisyOracle(Flipping(teacher, 0.1, seed), error_rate=0.1, confidence=0.999)
+    stats = LearnerStats()
+    learner = LStarLearner(stats=stats)
+    learner.initialize(set('hadc'), {'positive': {''}, 'negative': set()}, oracle)
+    assert equivalent(learner.learn(), teacher.reference)
+    # A fixed majority vote at this confidence takes 9 answers per word
+    assert oracle.stats.queries_per_word < 9
+    assert stats.extra['noisy_oracle']['words'] == oracle.stats.words
+
+
+def test_flaky_protocol():
+    reference = learn_protocol()
+    for seed in range(3):
+        assert equivalent(learn_protocol_noisy(seed=seed), reference)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {'sessions': False}, {'prefix_closed': True}])
+def test_flaky_protocol_glitches_every_query_path(kwargs):
+    # Sessions, prefix queries and plain membership queries all go through the flaky link
+    learner = LStarLearner(**kwargs)
+    learner.initialize({'HELLO', 'AUTH', 'DATA', 'CLOSE'}, {'positive': {''}, 'negative': set()},
+                       FlakyProtocolOracle(glitch_rate=1))
+    assert ProtocolOracle(test_mode=True).membership_query('HELLO AUTH DATA')
+    assert learner._membership(learner._encode('HELLO AUTH DATA')) is False
+    assert not any(learner.store.get(row) for row in learner.S)
@@ -0,0 +1,67 @@
+import numpy as np
+from lstar.packed_table import PackedTable
+
+
+def random_table(rng, n_rows, n_cols):
+    cells = rng.random((n_rows, n_cols)) < 0.5
+    table = PackedTable(n_rows, n_cols)
+    rows, cols = np.nonzero(np.ones_like(cells))
+    table.set_cells(rows, cols, cells[rows, cols])
+    return table, cells
+
+
+def test_set_get_and_unpack():
+    rng = np.random.default_rng(0)
+    table, cells = random_table(rng, 7, 150)
+    assert table.shape == (7, 150)
+    assert (table.unpack() == cells).all()
+    assert table.get(3, 129) == cells[3, 129]
+    assert (table.column([0, 2, 6], 64) == cells[[0, 2, 6], 64]).all()
+    assert (table.row(5, 60, 70) == cells[5, 60:70]).all()
+    table.set_cells([3], [129], [not cells[3, 129]])
+    assert table.get(3, 129) != cells[3, 129]
+
+
+def test_growth_keeps_cells_and_is_amortized():
+    table = PackedTable()
+    capacities = set()
+    for n in range(1, 300):
+        table.grow(n, n)
+        table.set_cells([n - 1], [n - 1], [True])
+        capacities.add(table.words.shape)
+    assert len(capacities) < 15
+    assert (table.unpack() == np.eye(299, dtype=bool)).all()
+    assert table.packed_rows().shape == (299, 5)
+
+
+def test_signatures_and_first_difference():
+    table = PackedTable(3, 130)
+    table.set_cells([0, 1, 0, 1, 2], [5, 5, 129, 129, 129], [True] * 5)
+    keys = table.signatures()
+    assert keys[0] == keys[1] != keys[2]
+    assert table.signature(0) == table.signature(1) != table.signature(2)
+    assert table.first_difference(0, 1) == -1
+    assert table.first_difference(0, 2) == 5
+    table.set_cells([1], [70], [True])
+    assert table.first_difference(0, 1) == 70
+
+
+def test_round_trip_through_packed_rows():
+    rng = np.random.default_rng(1)
+    table, cells = random_table(rng, 20, 70)
+    copy = PackedTable.from_packed(table.packed_rows(), 70)
+    assert (copy.unpack() == cells).all()
+
+
+def test_wide_table_size():
+    table = PackedTable(100_000, 1000)
+    assert table.words.nbytes <= 100_000 * 16 * 8
+    table.set_cells([99_999], [999], [True])
+    assert table.get(99_999, 999)
+    assert len(np.unique(table.signatures())) == 2
+
+
+def test_full():
+    table = PackedTable.full(3, 70)
+    assert table.unpack().all()
+    assert table.words[0, 1] == 2 ** 6 - 1
@@ -0,0 +1,97 @@
+import pytest
+from lstar.kv_learner import KVLearner
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import LearnerStats
+from lstar.minimize import equivalent
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import NoThreeAsOracle
+from lstar.tests.test_prefix_queries import PROTOCOL, PrefixSessions, Sessions
+
+
+class Counting(Sessions):
+    """Sessions that also remembers the words asked."""
+
+    def __init__(self, teacher):
+        super().__init__(teacher)
+        self.asked = []
+
+    def membership_query(self, string):
+        self.asked.append(string)
+        return super().membership_query(string)
+
+
+def learn(learner_class, oracle, alphabet, prefix_closed):
+    stats = LearnerStats()
+    learner = learner_class(stats=stats, prefix_closed=prefix_closed)
+    learner.initialize(alphabet, {'positive': {''}, 'negative': set()}, oracle)
+    return learner, learner.learn(), stats
+
+
+@pytest.mark.parametrize("learner_class", [LStarLearner, KVLearner])
+@pytest.mark.parametrize("target, alphabet", [
+    (lambda: Sessions(DFATeacher.from_regex(PROTOCOL)), set('hadc')),
+    (NoThreeAsOracle, {'a', 'b'}),
+])
+def test_same_result_with_fewer_queries(learner_class, target, alphabet):
+    _, plain_dfa, plain = learn(learner_class, target(), alphabet, False)
+    _, dfa, stats = learn(learner_class, target(), alphabet, True)
+    assert equivalent(dfa, plain_dfa)
+    assert dfa.n_states == plain_dfa.n_states
+    assert stats.membership_queries <= plain.membership_queries
+    assert stats.inferred_answers > 0
+    if learner_class is LStarLearner:
+        assert stats.membership_queries < plain.membership_queries
+
+
+def test_sink_rows_cost_nothing():
+    # A session cannot start with 'c': every word below it is in the sink
+    _, _, plain = learn(LStarLearner, Sessions(DFATeacher.from_regex(PROTOCOL)), set('hadc'), False)
+    learner, _, stats = learn(LStarLearner, Counting(DFATeacher.from_regex(PROTOCOL)),
+                              set('hadc'), True)
+    assert 2 * stats.membership_queries < plain.membership_queries
+    assert 'c' in learner.teacher.asked
+    assert not [w for w in learner.teacher.asked if w.startswith('c ')]
+
+
+def test_nothing_below_a_rejected_word_is_asked():
+    oracle = Counting(DFATeacher.from_regex(PROTOCOL))
+    learner = LStarLearner(prefix_closed=True)
+    learner.initialize(set('hadc'), {'positive': {''}, 'negative': set()}, oracle)
+    h, a, d = (learner.symbols.index[s] for s in 'had')
+    oracle.asked.clear()
+
+    # One batch: 'h d' is asked first and its extensions are then inferred
+    answers = learner._memberships([(h, d, h), (h, d), (h, d, h, h), (h, a, d)])
+    assert answers == [False, False, False, True]
+    assert sorted(oracle.asked) == ['h a d', 'h d']
+    assert learner._membership((h, d, d, d)) is False
+    assert sorted(oracle.asked) == ['h a d', 'h d']
+
+
+def test_accepted_word_accepts_its_prefixes():
+    oracle = Counting(DFATeacher.from_regex(PROTOCOL))
+    learner = LStarLearner(prefix_closed=True)
+    learner.initialize(set('hadc'), {'positive': {''}, 'negative': set()}, oracle)
+    word = learner._encode('h a d d c')
+    oracle.asked.clear()
+    assert learner._membership(word)
+    assert all(learner.store.get(word[:i]) for i in range(len(word)))
+    assert oracle.asked == ['h a d d c']
+
+
+def test_prefix_oracles_get_one_round():
+    plain_learner, plain_dfa, _ = learn(LStarLearner, PrefixSessions(DFATeacher.from_regex(PROTOCOL)),
+                                        set('hadc'), False)
+    learner, dfa, _ = learn(LStarLearner, PrefixSessions(DFATeacher.from_regex(PROTOCOL)),
+                                set('hadc'), True)
+    assert equivalent(dfa, plain_dfa)
+    assert learner.teacher.resets < plain_learner.teacher.resets
+
+
+def test_resume_keeps_prefix_closed(tmp_path):
+    path = tmp_path / 'run.ckpt'
+    learner = LStarLearner(prefix_closed=True)
+    learner.initialize({'a', 'b'}, {'positive': {''}, 'negative': set()}, NoThreeAsOracle())
+    learner.checkpoint(path)
+    assert LStarLearner.resume(path, NoThreeAsOracle()).prefix_closed
+    assert not LStarLearner.resume(path, NoThreeAsOracle(), prefix_closed=False).prefix_closed
@@ -0,0 +1,88 @@
+import pytest
+from lstar.kv_learner import KVLearner
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import LearnerStats
+from lstar.minimize import equivalent
+from lstar.oracle import Oracle, supports_prefix_queries
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import EvenAsOracle
+
+# Prefix-closed: a session of HELLO, AUTH, then DATA*, CLOSE back to the start
+PROTOCOL = '(h a d* c)* (h (a d*)?)?'
+
+
+class Sessions(Oracle):
+    """Counts sessions (system resets) against a DFA teacher."""
+
+    def __init__(self, teacher):
+        self.teacher = teacher
+        self.resets = 0
+
+    def membership_query(self, string):
+        self.resets += 1
+        return self.teacher.membership_query(string)
+
+    def equivalence_query(self, dfa):
+        return self.teacher.equivalence_query(dfa)
+
+
+class PrefixSessions(Sessions):
+    def prefix_query(self, string):
+        self.resets += 1
+        dfa = self.teacher.reference
+        state = dfa.initial
+        answers = [bool(dfa.accepting_mask[state])]
+        for a in dfa.encode(string):
+            state = dfa.delta[state, a]
+            answers.append(bool(dfa.accepting_mask[state]))
+        return answers
+
+
+def learn(learner_class, oracle_class):
+    oracle = oracle_class(DFATeacher.from_regex(PROTOCOL))
+    stats = LearnerStats()
+    learner = learner_class(stats=stats)
+    learner.initialize(set('hadc'), {'positive': {''}, 'negative': set()}, oracle)
+    return learner, learner.learn(), oracle, stats
+
+
+def test_supports_prefix_queries():
+    assert not supports_prefix_queries(EvenAsOracle())
+    assert not supports_prefix_queries(object())
+    assert supports_prefix_queries(PrefixSessions(None))
+
+
+@pytest.mark.parametrize("learner_class", [LStarLearner, KVLearner])
+def test_prefix_queries_cut_resets(learner_class):
+    _, plain_dfa, plain, plain_stats = learn(learner_class, Sessions)
+    _, dfa, prefix, stats = learn(learner_class, PrefixSessions)
+    assert equivalent(dfa, plain_dfa)
+    assert dfa.n_states == plain_dfa.n_states
+    assert prefix.resets <= plain.resets
+    assert stats.oracle_calls == prefix.resets and plain_stats.oracle_calls == plain.resets
+    assert stats.membership_queries <= plain_stats.membership_queries
+    if learner_class is LStarLearner:
+        # KV sifts one word at a time; L* fills whole batches
+        assert prefix.resets < plain.resets
+        assert stats.prefix_answers > 0
+
+
+def test_prefix_of_batch_word_is_not_asked():
+    learner, _, oracle, _ = learn(LStarLearner, PrefixSessions)
+    asked = []
+    oracle.prefix_query = lambda string: asked.append(string) or PrefixSessions.prefix_query(oracle, string)
+    learner._memberships([(0,), (0, 1), (0, 1, 2, 3), (1, 1, 1, 1, 1)])
+    assert len(asked) <= 2
+    assert learner.store.get((1, 1, 1, 1)) is not None
+
+
+def test_wrong_vector_length_is_rejected():
+    class Broken(PrefixSessions):
+        def prefix_query(self, string):
+            return [True]
+
+    learner = LStarLearner()
+    with pytest.raises(ValueError, match="prefix_query"):
+        learner.initialize(set('hadc'), {'positive': {''}, 'negative': set()},
+                           Broken(DFATeacher.from_regex(PROTOCOL)))
+        learner.learn()
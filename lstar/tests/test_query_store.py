@@ -0,0 +1,54 @@
+import numpy as np
+
+from lstar.query_store import QueryStore, TableView
+
+
+def test_words_share_prefix_nodes():
+    store = QueryStore(2)
+    abb = store.node((0, 1, 1))
+    aba = store.node((0, 1, 0))
+    assert len(store) == 5          # ε, a, a b, a b b, a b a
+    assert store.walk(store.node((0,)), (1, 1)) == abb
+    assert store.word(aba) == (0, 1, 0)
+    assert store.walk(0, (1,), create=False) is None
+
+
+def test_answers_are_stored_per_word():
+    store = QueryStore(2)
+    store.set_answers([store.node(()), store.node((1, 0))], [True, False])
+    assert store.get(()) is True
+    assert store.get((1, 0)) is False
+    assert store.get((1,)) is None
+    assert store.answered == 2
+
+
+def test_table_view_resolves_cells_through_store():
+    store = QueryStore(2)
+    store.set_answer(store.node((0, 1)), True)
+    view = TableView(store, {(): 0, (0,): 1}, {(0, 1): 0, (1,): 1})
+    assert view[((), (0, 1))] is True
+    assert view[((0,), (1,))] is True
+    assert ((1,), (1,)) not in view
+    assert len(view) == 2
+
+
+def test_vectorized_walks_match_scalar_ones():
+    store = QueryStore(3)
+    nodes = store.walk_many(np.array([0, 0, store.node((2,))]), (1, 0))
+    assert nodes.tolist() == [store.node((1, 0)), store.node((1, 0)), store.node((2, 1, 0))]
+    assert store.words(nodes) == [(1, 0), (1, 0), (2, 1, 0)]
+    assert store.words([0]) == [()]
+
+
+def test_bytes_per_word_at_scale():
+    # Every word of length <= 12 over two symbols and 100k random longer ones
+    store = QueryStore(2)
+    level = np.zeros(1, dtype=np.int64)
+    for _ in range(12):
+        level = store.children(np.repeat(level, 2), np.tile([0, 1], len(level)))
+    rng = np.random.default_rng(0)
+    nodes = rng.choice(level, 100_000)
+    for _ in range(8):
+        nodes = store.children(nodes, rng.integers(0, 2, len(nodes)))
+    assert len(store) > 100_000
+    assert store.nbytes / len(store) <= 32
@@ -0,0 +1,107 @@
+import pytest
+from lstar.dfa import CompiledDFA
+from lstar.kv_learner import KVLearner
+from lstar.lstar_learner import LStarLearner
+from lstar.metrics import LearnerStats
+from lstar.minimize import equivalent
+from lstar.oracle import Oracle, supports_sessions
+from lstar.query_store import QueryStore
+from lstar.scheduler import prefix_tree_leaves, run_sessions
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import EvenAsOracle
+
+# Accepts words with an even number of a's
+EVEN_AS = CompiledDFA('ab', [[1, 0], [0, 1]], [True, False], 0)
+PROTOCOL = '(h a d* c)* (h (a d*)?)?'
+
+
+class Device(Oracle):
+    """Session oracle over a DFA that logs every reset and step."""
+
+    def __init__(self, dfa):
+        self.dfa = dfa
+        self.log = []
+        self.queries = 0
+
+    def reset(self):
+        self.log.append('reset')
+        self.state = self.dfa.initial
+        return bool(self.dfa.accepting_mask[self.state])
+
+    def step(self, symbol):
+        self.log.append(symbol)
+        self.state = self.dfa.delta[self.state, self.dfa.symbol_index[symbol]]
+        return bool(self.dfa.accepting_mask[self.state])
+
+    def membership_query(self, string):
+        self.queries += 1
+        return self.dfa.run(string)
+
+    def equivalence_query(self, dfa):
+        return DFATeacher(self.dfa).equivalence_query(dfa)
+
+
+class PlainDevice(Device):
+    """The same device without the session API: one reset per query."""
+    reset = Oracle.reset
+    step = Oracle.step
+
+
+def test_supports_sessions():
+    assert supports_sessions(Device(EVEN_AS))
+    assert not supports_sessions(PlainDevice(EVEN_AS))
+    assert not supports_sessions(EvenAsOracle())
+
+    class ResetOnly(Oracle):
+        def reset(self):
+            return True
+    assert not supports_sessions(ResetOnly())
+
+
+def test_prefix_tree_leaves():
+    store = QueryStore(2)
+    nodes = [store.node(w) for w in [(), (0,), (0, 1), (1,), (0, 1), (1, 1, 0)]]
+    assert sorted(store.word(n) for n in prefix_tree_leaves(store, nodes)) == [(0, 1), (1, 1, 0)]
+
+
+def test_sessions_run_leaves_in_dfs_order():
+    store = QueryStore(2)
+    words = [(1,), (0, 1, 1), (0,), (0, 0), (), (0, 1)]
+    nodes = [store.node(w) for w in words]
+    device = Device(EVEN_AS)
+    run = run_sessions(device, store, nodes, ['a', 'b'])
+
+    assert device.log == ['reset', 'a', 'a', 'reset', 'a', 'b', 'b', 'reset', 'b']
+    assert (run.words, run.resets, run.steps) == (6, 3, 6)
+    assert run.resets_saved == 3
+    for word in words:
+        assert store.get(word) == EVEN_AS.run_encoded(word)
+    # Nodes passed on the way are answered too, known answers are kept
+    store.set_answer(store.node((1, 1)), False)
+    run_sessions(device, store, [store.node((1, 1, 1))], ['a', 'b'])
+    assert store.get((1, 1)) is False
+
+
+@pytest.mark.parametrize("learner_class", [LStarLearner, KVLearner])
+def test_session_learning_saves_resets(learner_class):
+    target = DFATeacher.from_regex(PROTOCOL).reference
+    results = {}
+    for oracle_class in (PlainDevice, Device):
+        oracle = oracle_class(target)
+        stats = LearnerStats()
+        learner = learner_class(stats=stats)
+        learner.initialize(set('hadc'), {'positive': {''}, 'negative': set()}, oracle)
+        results[oracle_class] = learner.learn(), oracle, stats
+
+    plain_dfa, plain, plain_stats = results[PlainDevice]
+    dfa, device, stats = results[Device]
+    assert equivalent(dfa, plain_dfa)
+    assert stats.resets == device.log.count('reset') == stats.oracle_calls
+    assert stats.session_steps == len(device.log) - stats.resets
+    # Only hypothesis validation still goes through membership_query
+    assert device.queries < plain.queries
+    assert stats.resets <= plain_stats.membership_queries
+    if learner_class is LStarLearner:
+        assert stats.resets_saved > 0
+        assert stats.resets < plain_stats.membership_queries
+    assert stats.to_dict()['resets'] == stats.resets
@@ -0,0 +1,66 @@
+from itertools import product
+import pytest
+from lstar.dfa import CompiledDFA
+from lstar.kv_learner import KVLearner
+from lstar.lstar_learner import LStarLearner
+from lstar.minimize import equivalent
+from lstar.regex import compile_regex
+from lstar.teacher import DFATeacher
+from lstar.tests.test_learner import EndsInABOracle, NoThreeAsOracle
+
+
+def words(alphabet, max_length):
+    return [' '.join(w) for n in range(max_length + 1) for w in product(alphabet, repeat=n)]
+
+
+@pytest.mark.parametrize("pattern, oracle", [
+    ('(a | b)* a b', EndsInABOracle()),
+    ('(b | a b | a a b)* (() | a | a a)', NoThreeAsOracle()),
+])
+def test_compile_regex_matches_oracle(pattern, oracle):
+    dfa = compile_regex(pattern)
+    for word in words('ab', 7):
+        assert dfa.run(word) == oracle.membership_query(word)
+
+
+def test_compile_regex_operators():
+    protocol = compile_regex('HELLO (AUTH DATA*)?')
+    assert protocol.symbols == ['AUTH', 'DATA', 'HELLO']
+    assert protocol.run('HELLO') and protocol.run('HELLO AUTH DATA DATA')
+    assert not protocol.run('') and not protocol.run('HELLO DATA')
+    assert compile_regex('a+').run('a a') and not compile_regex('a+').run('')
+    assert compile_regex('.', alphabet='ab').run('b')
+    assert compile_regex('()').run('')
+    assert equivalent(compile_regex('(a b)*'), compile_regex('() | a (b a)* b'))
+    # Minimal: the sink is the only extra state
+    assert compile_regex('a b').n_states == 4
+
+
+@pytest.mark.parametrize("pattern", ['(a', 'a )', '*', 'a | b c )', 'a | *'])
+def test_compile_regex_errors(pattern):
+    with pytest.raises(ValueError):
+        compile_regex(pattern)
+
+
+def test_compile_regex_unknown_symbol():
+    with pytest.raises(ValueError):
+        compile_regex('a c', alphabet='ab')
+
+
+def test_shortest_counterexample():
+    teacher = DFATeacher.from_regex('(a | b)* a b')
+    accept_nothing = {'states': 1, 'initial': 0, 'accepting': set(),
+                      'transitions': {(0, 'a'): 0, (0, 'b'): 0}}
+    assert teacher.equivalence_query(accept_nothing) == 'a b'
+    assert teacher.equivalence_query(teacher.reference) is None
+    assert teacher.membership_queries(['a b', 'b a', '']) == [True, False, False]
+
+
+@pytest.mark.parametrize("learner_class", [LStarLearner, KVLearner])
+def test_learns_exact_language(learner_class):
+    teacher = DFATeacher.from_regex('(a | b)* a (a | b) (a | b)')
+    learner = learner_class()
+    learner.initialize({'a', 'b'}, {'positive': {'a a a'}, 'negative': {'b'}}, teacher)
+    dfa = learner.learn()
+    assert dfa['states'] == teacher.reference.n_states == 8
+    assert equivalent(dfa, teacher.reference)
@@ -1,5 +1,44 @@
+from typing import Dict, Iterable, List, Tuple
+
+from .dfa import CompiledDFA
+from .mealy import MealyMachine
+
+# A word encoded as a tuple of symbol indices
+Word = Tuple[int, ...]
+
+
+class SymbolTable:
+    """Interns alphabet symbols to small ints and converts words to and from strings."""
+
+    def __init__(self, symbols: Iterable[str]):
+        self.symbols: List[str] = sorted(set(symbols))
+        self.index: Dict[str, int] = {a: i for i, a in enumerate(self.symbols)}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def encode(self, string: str) -> Word:
+        """Encode a space-separated string of symbols."""
+        try:
+            return tuple(self.index[token] for token in string.split())
+        except KeyError as err:
+            raise ValueError(f"Symbol {err.args[0]!r} in {string!r} is not in the alphabet") from None
+
+    def decode(self, word: Word) -> str:
+        """Decode a word back to a space-separated string."""
+        return ' '.join(self.symbols[i] for i in word)
+
+
 def run_dfa(dfa, input_string):
-    """Run DFA on input treating it as a sequence of tokens."""
+    """Run DFA on input treating it as a sequence of tokens.
+
+    The input may be a space-separated string or an already tokenized
+    sequence of symbols, which avoids re-splitting in tight loops. A
+    CompiledDFA is run on its dense transition table.
+    """
+    if isinstance(dfa, CompiledDFA):
+        return dfa.run(input_string)
+
     # Start at initial state
     current_state = dfa['initial']
     
@@ -8,7 +47,10 @@ def run_dfa(dfa, input_string):
         return current_state in dfa['accepting']
         
     # Split input into tokens if it contains spaces
-    tokens = input_string.split() if ' ' in input_string else [input_string]
+    if not isinstance(input_string, str):
+        tokens = input_string
+    else:
+        tokens = input_string.split() if ' ' in input_string else [input_string]
     
     # Process each token
     for token in tokens:
@@ -16,4 +58,28 @@ def run_dfa(dfa, input_string):
             return False
         current_state = dfa['transitions'][(current_state, token)]
         
-    return current_state in dfa['accepting']
\ No newline at end of file
+    return current_state in dfa['accepting']
+
+
+def run_mealy(mealy, input_string) -> tuple:
+    """Run a Mealy machine on input treating it as a sequence of tokens.
+
+    Like run_dfa, the input may be a space-separated string or a token
+    sequence and the machine a MealyMachine or the dict format. Returns
+    one output per input; a missing transition yields None for that
+    input and every later one.
+    """
+    if isinstance(mealy, MealyMachine):
+        return mealy.run(input_string)
+
+    tokens = input_string.split() if isinstance(input_string, str) else input_string
+    state = mealy['initial']
+    outputs = []
+    for token in tokens:
+        if state is None or (state, token) not in mealy['transitions']:
+            state = None
+            outputs.append(None)
+            continue
+        outputs.append(mealy['outputs'][(state, token)])
+        state = mealy['transitions'][(state, token)]
+    return tuple(outputs)
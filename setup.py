@@ -26,6 +26,7 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[
+        "numpy>=1.20",
         "pytest>=7.0.0",
     ],
     extras_require={